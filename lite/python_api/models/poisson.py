@@ -1,8 +1,22 @@
 """
 Modelo de predição usando distribuição de Poisson
 """
-import math
-from typing import Dict, List
+import os
+import sys
+from typing import Dict
+
+# Núcleo numérico compartilhado com as edições pro e raiz (poisson_core/ na raiz do repositório)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from poisson_core import (
+    DEFAULT_TAIL_EPSILON,
+    MarketLadder,
+    btts_no_probability,
+    most_likely_score,
+    poisson_over_under,
+    poisson_tables,
+    score_matrix,
+)
 
 
 class PoissonModel:
@@ -20,9 +34,16 @@ class PoissonModel:
     - e é a constante de Euler
     """
 
-    def __init__(self):
-        """Inicializa o modelo de Poisson"""
-        self.max_goals = 10  # Máximo de gols a considerar nas probabilidades
+    def __init__(self, tail_epsilon: float = DEFAULT_TAIL_EPSILON, max_goals: int = None):
+        """
+        Inicializa o modelo de Poisson
+
+        Args:
+            tail_epsilon: Massa máxima de probabilidade ignorada na cauda
+            max_goals: Grade fixa de gols (None = truncagem adaptativa)
+        """
+        self.tail_epsilon = tail_epsilon
+        self.max_goals = max_goals
 
     def poisson_probability(self, k: int, lambda_param: float) -> float:
         """
@@ -38,7 +59,8 @@ class PoissonModel:
         if lambda_param <= 0:
             return 0.0
 
-        return (lambda_param ** k) * math.exp(-lambda_param) / math.factorial(k)
+        pmf, _ = poisson_tables(lambda_param, size=k + 1)
+        return float(pmf[k])
 
     def predict_match(
         self,
@@ -73,27 +95,30 @@ class PoissonModel:
         home_lambda = max(home_lambda, 0.5)
         away_lambda = max(away_lambda, 0.5)
 
-        # Calcula probabilidades de gols
-        home_probs = [self.poisson_probability(i, home_lambda) for i in range(self.max_goals)]
-        away_probs = [self.poisson_probability(i, away_lambda) for i in range(self.max_goals)]
+        # Matriz de placares (casa x fora) e escada de mercados, calculadas uma única vez
+        scores = score_matrix(home_lambda, away_lambda, self.tail_epsilon, self.max_goals)
+        ladder = MarketLadder(scores)
 
         # Predições de resultado (1X2)
-        result_probs = self._calculate_result_probabilities(home_probs, away_probs)
+        result_probs = self._calculate_result_probabilities(ladder)
 
         # Predições de total de gols
-        goals_probs = self._calculate_goals_probabilities(home_probs, away_probs)
+        goals_probs = self._calculate_goals_probabilities(ladder)
 
         # Predições de ambos marcam
-        btts_probs = self._calculate_btts_probabilities(home_probs, away_probs)
-
-        # Predições de escanteios (estimativa baseada em gols)
-        corners_probs = self._calculate_corners_probabilities(home_lambda, away_lambda)
+        btts_no = float(btts_no_probability(scores))
+        btts_probs = {
+            "yes": round(1 - btts_no, 3),
+            "no": round(btts_no, 3)
+        }
 
-        # Predições de cartões (estimativa baseada em gols)
-        cards_probs = self._calculate_cards_probabilities(home_lambda, away_lambda)
+        # Predições de escanteios e cartões (estimativa baseada em gols)
+        # Correlação típica: ~10-11 escanteios e ~3-4 cartões por partida
+        corners_probs = self._over_under_probabilities((home_lambda + away_lambda) * 4.5, (7.5, 8.5, 9.5, 10.5))
+        cards_probs = self._over_under_probabilities((home_lambda + away_lambda) * 1.5, (2.5, 3.5, 4.5))
 
         # Placar mais provável
-        most_likely_score = self._calculate_most_likely_score(home_probs, away_probs)
+        home_goals, away_goals, max_prob = most_likely_score(scores)
 
         return {
             "model": "Poisson Distribution",
@@ -106,180 +131,40 @@ class PoissonModel:
             "both_teams_score": btts_probs,
             "corners": corners_probs,
             "cards": cards_probs,
-            "most_likely_score": most_likely_score
+            "most_likely_score": {
+                "score": f"{home_goals}-{away_goals}",
+                "probability": round(max_prob, 3)
+            }
         }
 
-    def _calculate_result_probabilities(
-        self,
-        home_probs: List[float],
-        away_probs: List[float]
-    ) -> Dict:
+    def _calculate_result_probabilities(self, ladder: MarketLadder) -> Dict:
         """Calcula probabilidades de resultado (1X2)"""
-        home_win = 0.0
-        draw = 0.0
-        away_win = 0.0
-
-        for home_goals in range(self.max_goals):
-            for away_goals in range(self.max_goals):
-                prob = home_probs[home_goals] * away_probs[away_goals]
-
-                if home_goals > away_goals:
-                    home_win += prob
-                elif home_goals == away_goals:
-                    draw += prob
-                else:
-                    away_win += prob
+        result = ladder.result()
+        total = sum(result.values())
 
         # Normaliza para somar 100%
-        total = home_win + draw + away_win
-        if total > 0:
-            home_win /= total
-            draw /= total
-            away_win /= total
+        return {market: round(prob / total, 3) for market, prob in result.items()}
 
-        return {
-            "home_win": round(home_win, 3),
-            "draw": round(draw, 3),
-            "away_win": round(away_win, 3)
-        }
-
-    def _calculate_goals_probabilities(
-        self,
-        home_probs: List[float],
-        away_probs: List[float]
-    ) -> Dict:
+    def _calculate_goals_probabilities(self, ladder: MarketLadder) -> Dict:
         """Calcula probabilidades de total de gols"""
-        over_05 = 0.0
-        over_15 = 0.0
-        over_25 = 0.0
-        over_35 = 0.0
-        over_45 = 0.0
-
-        for home_goals in range(self.max_goals):
-            for away_goals in range(self.max_goals):
-                prob = home_probs[home_goals] * away_probs[away_goals]
-                total_goals = home_goals + away_goals
-
-                if total_goals > 0.5:
-                    over_05 += prob
-                if total_goals > 1.5:
-                    over_15 += prob
-                if total_goals > 2.5:
-                    over_25 += prob
-                if total_goals > 3.5:
-                    over_35 += prob
-                if total_goals > 4.5:
-                    over_45 += prob
+        probs = {}
+        for line in (0.5, 1.5, 2.5, 3.5, 4.5):
+            over_prob = ladder.over_probability(line)
+            probs[f"over_{line}"] = round(over_prob, 3)
+            probs[f"under_{line}"] = round(1 - over_prob, 3)
 
-        return {
-            "over_0.5": round(over_05, 3),
-            "under_0.5": round(1 - over_05, 3),
-            "over_1.5": round(over_15, 3),
-            "under_1.5": round(1 - over_15, 3),
-            "over_2.5": round(over_25, 3),
-            "under_2.5": round(1 - over_25, 3),
-            "over_3.5": round(over_35, 3),
-            "under_3.5": round(1 - over_35, 3),
-            "over_4.5": round(over_45, 3),
-            "under_4.5": round(1 - over_45, 3),
-        }
+        return probs
 
-    def _calculate_btts_probabilities(
-        self,
-        home_probs: List[float],
-        away_probs: List[float]
-    ) -> Dict:
-        """Calcula probabilidades de ambos marcam"""
-        # P(Ambos marcam) = 1 - P(Casa não marca) - P(Fora não marca) + P(Ninguém marca)
-        home_no_goal = home_probs[0]
-        away_no_goal = away_probs[0]
-
-        btts_no = home_no_goal + away_no_goal - (home_no_goal * away_no_goal)
-        btts_yes = 1 - btts_no
+    def _over_under_probabilities(self, lambda_param: float, lines) -> Dict:
+        """Over/under de Poisson em forma fechada para cada linha"""
+        over, under = poisson_over_under(lambda_param, lines)
 
-        return {
-            "yes": round(btts_yes, 3),
-            "no": round(btts_no, 3)
-        }
+        probs = {}
+        for i, line in enumerate(lines):
+            probs[f"over_{line}"] = round(float(over[i]), 3)
+            probs[f"under_{line}"] = round(float(under[i]), 3)
 
-    def _calculate_corners_probabilities(
-        self,
-        home_lambda: float,
-        away_lambda: float
-    ) -> Dict:
-        """
-        Estima probabilidades de escanteios baseado em gols
-
-        Correlação típica: ~10-11 escanteios por partida
-        Times mais ofensivos geram mais escanteios
-        """
-        # Estima escanteios baseado em ataque (correlação aproximada)
-        corners_lambda = (home_lambda + away_lambda) * 4.5
-
-        over_75 = sum(self.poisson_probability(k, corners_lambda) for k in range(8, 20))
-        over_85 = sum(self.poisson_probability(k, corners_lambda) for k in range(9, 20))
-        over_95 = sum(self.poisson_probability(k, corners_lambda) for k in range(10, 20))
-        over_105 = sum(self.poisson_probability(k, corners_lambda) for k in range(11, 20))
-
-        return {
-            "over_7.5": round(over_75, 3),
-            "under_7.5": round(1 - over_75, 3),
-            "over_8.5": round(over_85, 3),
-            "under_8.5": round(1 - over_85, 3),
-            "over_9.5": round(over_95, 3),
-            "under_9.5": round(1 - over_95, 3),
-            "over_10.5": round(over_105, 3),
-            "under_10.5": round(1 - over_105, 3),
-        }
-
-    def _calculate_cards_probabilities(
-        self,
-        home_lambda: float,
-        away_lambda: float
-    ) -> Dict:
-        """
-        Estima probabilidades de cartões baseado em gols
-
-        Correlação típica: ~3-4 cartões por partida
-        Jogos mais intensos tendem a ter mais cartões
-        """
-        # Estima cartões baseado em intensidade do jogo
-        cards_lambda = (home_lambda + away_lambda) * 1.5
-
-        over_25 = sum(self.poisson_probability(k, cards_lambda) for k in range(3, 15))
-        over_35 = sum(self.poisson_probability(k, cards_lambda) for k in range(4, 15))
-        over_45 = sum(self.poisson_probability(k, cards_lambda) for k in range(5, 15))
-
-        return {
-            "over_2.5": round(over_25, 3),
-            "under_2.5": round(1 - over_25, 3),
-            "over_3.5": round(over_35, 3),
-            "under_3.5": round(1 - over_35, 3),
-            "over_4.5": round(over_45, 3),
-            "under_4.5": round(1 - over_45, 3),
-        }
-
-    def _calculate_most_likely_score(
-        self,
-        home_probs: List[float],
-        away_probs: List[float]
-    ) -> Dict:
-        """Calcula o placar mais provável"""
-        max_prob = 0.0
-        most_likely = {"home": 0, "away": 0}
-
-        for home_goals in range(self.max_goals):
-            for away_goals in range(self.max_goals):
-                prob = home_probs[home_goals] * away_probs[away_goals]
-
-                if prob > max_prob:
-                    max_prob = prob
-                    most_likely = {"home": home_goals, "away": away_goals}
-
-        return {
-            "score": f"{most_likely['home']}-{most_likely['away']}",
-            "probability": round(max_prob, 3)
-        }
+        return probs
 
 
 # Exemplo de uso
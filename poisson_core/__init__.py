@@ -0,0 +1,46 @@
+"""
+Núcleo numérico de Poisson compartilhado pelas edições lite, pro e raiz
+
+Cada edição mantém seu próprio PoissonModel (e contrato de predict_match),
+mas todas montam tabelas, matrizes de placares e mercados por aqui, então
+uma otimização ou cache novo chega às três de uma vez.
+"""
+from .tables import (
+    LAMBDA_QUANTUM,
+    PMF_CACHE_SIZE,
+    DEFAULT_TAIL_EPSILON,
+    log_factorials,
+    poisson_pmf,
+    poisson_table,
+    poisson_tables,
+    support,
+    poisson_over_under,
+    cache_info,
+)
+from .markets import (
+    MarketLadder,
+    score_matrix,
+    score_tensor,
+    low_score_correction,
+    btts_no_probability,
+    most_likely_score,
+)
+
+__all__ = [
+    'LAMBDA_QUANTUM',
+    'PMF_CACHE_SIZE',
+    'DEFAULT_TAIL_EPSILON',
+    'log_factorials',
+    'poisson_pmf',
+    'poisson_table',
+    'poisson_tables',
+    'support',
+    'poisson_over_under',
+    'cache_info',
+    'MarketLadder',
+    'score_matrix',
+    'score_tensor',
+    'low_score_correction',
+    'btts_no_probability',
+    'most_likely_score',
+]
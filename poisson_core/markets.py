@@ -0,0 +1,287 @@
+"""
+Matriz de placares e derivação de mercados compartilhadas entre as edições
+
+A partir dos gols esperados de casa e fora, monta a matriz (ou o tensor
+em lote) de placares com truncagem adaptativa e expõe a MarketLadder,
+que responde 1X2, over/under, handicap asiático e placar exato.
+"""
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .tables import DEFAULT_TAIL_EPSILON, poisson_tables, support
+
+
+def score_matrix(
+    home_lambda: float,
+    away_lambda: float,
+    tail_epsilon: float = DEFAULT_TAIL_EPSILON,
+    max_goals: int = None
+) -> np.ndarray:
+    """
+    Matriz conjunta de placares (produto externo das distribuições)
+
+    score_matrix[i, j] = P(casa marca i) * P(fora marca j)
+
+    Cada lado tem sua própria grade (matriz pode ser retangular), com
+    metade de tail_epsilon para cada um, salvo se max_goals for fixo.
+
+    Args:
+        home_lambda: Gols esperados do time da casa
+        away_lambda: Gols esperados do time visitante
+        tail_epsilon: Massa máxima ignorada na cauda
+        max_goals: Tamanho fixo da grade (None = truncagem adaptativa)
+    """
+    home_size = max_goals or support(home_lambda, tail_epsilon / 2, min_size=3)
+    away_size = max_goals or support(away_lambda, tail_epsilon / 2, min_size=3)
+
+    home_pmf, _ = poisson_tables(home_lambda, size=home_size)
+    away_pmf, _ = poisson_tables(away_lambda, size=away_size)
+
+    return np.outer(home_pmf, away_pmf)
+
+
+def low_score_correction(
+    scores: np.ndarray,
+    home_lambda: float,
+    away_lambda: float,
+    rho: float
+) -> np.ndarray:
+    """
+    Aplica a correção τ(λ, μ, ρ) de Dixon & Coles (1997) aos placares baixos
+
+        τ(0,0) = 1 - λμρ    τ(0,1) = 1 + λρ
+        τ(1,0) = 1 + μρ     τ(1,1) = 1 - ρ
+
+    Os demais placares ficam iguais. A matriz é renormalizada para manter a
+    massa da grade original (a massa fora dela continua sendo a cauda).
+
+    Args:
+        scores: Matriz de placares independentes (casa x fora), mínimo 2x2
+        home_lambda: Gols esperados do time da casa (λ)
+        away_lambda: Gols esperados do time visitante (μ)
+        rho: Parâmetro de dependência ρ (0 = sem correção)
+
+    Returns:
+        Nova matriz corrigida (mesmo shape)
+    """
+    if not rho:
+        return scores
+
+    tau = np.array([
+        [1 - home_lambda * away_lambda * rho, 1 + home_lambda * rho],
+        [1 + away_lambda * rho, 1 - rho]
+    ])
+
+    corrected = np.array(scores, dtype=float)
+    corrected[:2, :2] *= np.maximum(tau, 0.0)
+    corrected *= scores.sum() / corrected.sum()
+
+    return corrected
+
+
+def score_tensor(
+    home_lambda,
+    away_lambda,
+    tail_epsilon: float = DEFAULT_TAIL_EPSILON,
+    max_goals: int = None
+) -> np.ndarray:
+    """
+    Tensor de placares de N partidas: tensor[n, i, j] = P(casa i) * P(fora j)
+
+    A grade é comum ao lote: a maior exigida pelos lambdas das N partidas.
+
+    Args:
+        home_lambda: Array (N,) de gols esperados (casa)
+        away_lambda: Array (N,) de gols esperados (fora)
+        tail_epsilon: Massa máxima ignorada na cauda
+        max_goals: Tamanho fixo da grade (None = truncagem adaptativa)
+
+    Returns:
+        Array (N, G, G)
+    """
+    size = max_goals or max(
+        support(home_lambda, tail_epsilon / 2, min_size=3),
+        support(away_lambda, tail_epsilon / 2, min_size=3)
+    )
+    home_pmf, _ = poisson_tables(home_lambda, size=size)
+    away_pmf, _ = poisson_tables(away_lambda, size=size)
+
+    return home_pmf[:, :, None] * away_pmf[:, None, :]
+
+
+def btts_no_probability(scores: np.ndarray) -> np.ndarray:
+    """
+    P(pelo menos um time não marca) = linha 0 (casa) + coluna 0 (fora)
+
+    Aceita uma matriz (G, G) ou um tensor (N, G, G).
+    """
+    return scores[..., 0, :].sum(axis=-1) + scores[..., 1:, 0].sum(axis=-1)
+
+
+def most_likely_score(scores: np.ndarray) -> Tuple[int, int, float]:
+    """
+    Placar mais provável de uma matriz de placares
+
+    Returns:
+        Tupla (gols_casa, gols_fora, probabilidade)
+    """
+    home_goals, away_goals = np.unravel_index(np.argmax(scores), scores.shape)
+
+    return int(home_goals), int(away_goals), float(scores[home_goals, away_goals])
+
+
+class MarketLadder:
+    """
+    Escada de mercados de uma partida a partir da matriz de placares
+
+    Pré-calcula uma única vez as distribuições do total de gols e da
+    diferença de gols (casa - fora) e suas acumuladas. Qualquer linha de
+    over/under, handicap asiático (incluindo linhas de quarto, ex: -0.75)
+    ou placar exato é respondida em O(1) a partir desses arrays.
+
+    Liquidação (settlement) de linhas asiáticas:
+    - win / lose: aposta inteira ganha / perde
+    - half_win / half_lose: metade ganha (ou perde) e metade é devolvida
+    - push: aposta devolvida
+    """
+
+    def __init__(self, score_matrix: np.ndarray):
+        """
+        Args:
+            score_matrix: Matriz P(casa marca i, fora marca j)
+        """
+        self.score_matrix = score_matrix
+
+        home_goals = np.arange(score_matrix.shape[0])
+        away_goals = np.arange(score_matrix.shape[1])
+
+        # Total de gols: T = i + j, de 0 até (linhas + colunas - 2)
+        totals = np.add.outer(home_goals, away_goals).ravel()
+        self.totals_dist = np.bincount(totals, weights=score_matrix.ravel())
+        self.totals_cdf = np.cumsum(self.totals_dist)
+
+        # Diferença de gols: D = i - j, deslocada para índices >= 0
+        self.diff_offset = score_matrix.shape[1] - 1
+        diffs = np.subtract.outer(home_goals, away_goals).ravel() + self.diff_offset
+        self.diff_dist = np.bincount(diffs, weights=score_matrix.ravel())
+        self.diff_cdf = np.cumsum(self.diff_dist)
+
+    def exact_score(self, home_goals: int, away_goals: int) -> float:
+        """Probabilidade de um placar exato"""
+        if not (0 <= home_goals < self.score_matrix.shape[0] and 0 <= away_goals < self.score_matrix.shape[1]):
+            return 0.0
+
+        return float(self.score_matrix[home_goals, away_goals])
+
+    def result(self) -> Dict:
+        """Probabilidades de resultado (1X2) pela distribuição da diferença de gols"""
+        return {
+            "home_win": self._diff_above(0),
+            "draw": self._diff_equal(0),
+            "away_win": self._diff_at_most(-1)
+        }
+
+    def over_probability(self, line: float) -> float:
+        """P(total de gols > line)"""
+        return float(self.totals_cdf[-1] - self._totals_at_most(math.floor(line)))
+
+    def total_goals(self, line: float) -> Dict:
+        """
+        Liquidação de over/under para qualquer linha múltipla de 0.25
+
+        Args:
+            line: Linha de gols (ex: 2.5, 3.0, 2.25, 2.75)
+
+        Returns:
+            {"over": settlement, "under": settlement}
+        """
+        over = self._settle(line, self._totals_at_most, self._totals_equal)
+
+        return {"over": over, "under": self._mirror(over)}
+
+    def asian_handicap(self, line: float) -> Dict:
+        """
+        Liquidação de handicap asiático para qualquer linha múltipla de 0.25
+
+        Args:
+            line: Handicap do time da casa (ex: -0.5, -0.75, +1.0, +0.25).
+                O visitante recebe a linha oposta.
+
+        Returns:
+            {"home": settlement, "away": settlement}
+        """
+        # Casa ganha a aposta quando D + line > 0, ou seja, D > -line
+        home = self._settle(-line, self._diff_at_most, self._diff_equal)
+
+        return {"home": home, "away": self._mirror(home)}
+
+    def _settle(self, threshold: float, at_most, equal) -> Dict:
+        """
+        Liquida uma aposta que ganha quando X > threshold
+
+        Linhas de quarto são divididas em duas meias apostas com limiares
+        t1 = threshold - 0.25 e t2 = threshold + 0.25.
+        """
+        if (threshold * 4) % 1 != 0:
+            raise ValueError(f"Linha inválida: {threshold} (use múltiplos de 0.25)")
+
+        settlement = {"win": 0.0, "half_win": 0.0, "push": 0.0, "half_lose": 0.0, "lose": 0.0}
+        total_mass = float(self.score_matrix.sum())
+
+        if (threshold * 2) % 1 == 0:
+            # Linha inteira (com push) ou meia linha (sem push)
+            settlement["win"] = total_mass - at_most(math.floor(threshold))
+            settlement["lose"] = at_most(math.ceil(threshold) - 1)
+            if threshold % 1 == 0:
+                settlement["push"] = equal(int(threshold))
+        else:
+            # Linha de quarto: um dos limiares é inteiro e o outro é meia linha
+            t1, t2 = threshold - 0.25, threshold + 0.25
+            settlement["win"] = total_mass - at_most(math.floor(t2))
+            settlement["lose"] = at_most(math.ceil(t1) - 1)
+            if t2 % 1 == 0:
+                settlement["half_win"] = equal(int(t2))
+            if t1 % 1 == 0:
+                settlement["half_lose"] = equal(int(t1))
+
+        return settlement
+
+    def _mirror(self, settlement: Dict) -> Dict:
+        """Liquidação do lado oposto (under / visitante)"""
+        return {
+            "win": settlement["lose"],
+            "half_win": settlement["half_lose"],
+            "push": settlement["push"],
+            "half_lose": settlement["half_win"],
+            "lose": settlement["win"]
+        }
+
+    def _totals_at_most(self, k: int) -> float:
+        """P(T <= k)"""
+        if k < 0:
+            return 0.0
+
+        return float(self.totals_cdf[min(k, len(self.totals_cdf) - 1)])
+
+    def _totals_equal(self, k: int) -> float:
+        """P(T == k)"""
+        return float(self.totals_dist[k]) if 0 <= k < len(self.totals_dist) else 0.0
+
+    def _diff_at_most(self, d: int) -> float:
+        """P(D <= d)"""
+        index = d + self.diff_offset
+        if index < 0:
+            return 0.0
+
+        return float(self.diff_cdf[min(index, len(self.diff_cdf) - 1)])
+
+    def _diff_equal(self, d: int) -> float:
+        """P(D == d)"""
+        index = d + self.diff_offset
+        return float(self.diff_dist[index]) if 0 <= index < len(self.diff_dist) else 0.0
+
+    def _diff_above(self, d: int) -> float:
+        """P(D > d)"""
+        return float(self.diff_cdf[-1]) - self._diff_at_most(d)
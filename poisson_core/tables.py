@@ -0,0 +1,196 @@
+"""
+Tabelas numéricas de Poisson compartilhadas (log-fatoriais, PMF/CDF e caudas)
+
+Tudo aqui é indexado por lambda quantizado a LAMBDA_QUANTUM e mantido em
+caches LRU de processo, então qualquer edição (lite, pro ou raiz) que
+importe este módulo reaproveita as mesmas tabelas.
+"""
+import math
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+from scipy.special import gammainc, gammaincc
+
+
+# Resolução da quantização de lambda usada como chave do cache de tabelas
+LAMBDA_QUANTUM = 0.01
+
+# Número máximo de tabelas (lambda, tamanho) mantidas no cache LRU
+PMF_CACHE_SIZE = 4096
+
+# Massa de probabilidade máxima ignorada na cauda ao truncar uma distribuição
+DEFAULT_TAIL_EPSILON = 1e-6
+
+# Tamanho inicial da tabela de log-fatoriais (cresce sob demanda)
+LOG_FACTORIAL_SIZE = 128
+
+_log_factorials = np.cumsum(np.log(np.maximum(np.arange(LOG_FACTORIAL_SIZE), 1)))
+
+
+def log_factorials(size: int) -> np.ndarray:
+    """
+    log(k!) para k = 0..size-1
+
+    A tabela é calculada uma única vez e só é estendida quando alguém pede
+    mais valores do que os já calculados.
+    """
+    global _log_factorials
+
+    if size > len(_log_factorials):
+        new_size = max(size, 2 * len(_log_factorials))
+        _log_factorials = np.cumsum(np.log(np.maximum(np.arange(new_size), 1)))
+
+    return _log_factorials[:size]
+
+
+def poisson_pmf(lambda_param: float, size: int) -> np.ndarray:
+    """
+    P(X = k) para k = 0..size-1, em escala logarítmica: k*log(λ) - λ - log(k!)
+
+    λ <= 0 é uma massa pontual em k = 0 (o time não marca).
+    """
+    if lambda_param <= 0:
+        pmf = np.zeros(size)
+        pmf[:1] = 1.0
+        return pmf
+
+    goals = np.arange(size)
+
+    return np.exp(goals * math.log(lambda_param) - lambda_param - log_factorials(size))
+
+
+def lambda_key(lambda_param: float) -> int:
+    """
+    Quantiza um lambda em chave inteira do cache
+
+    λ <= 0 vira a chave 0 (massa pontual em zero gols); qualquer λ positivo
+    fica com chave mínima 1, para não virar massa pontual por arredondamento.
+    """
+    if lambda_param <= 0:
+        return 0
+
+    return max(int(round(lambda_param / LAMBDA_QUANTUM)), 1)
+
+
+def lambda_keys(lambda_params) -> np.ndarray:
+    """Versão vetorizada de lambda_key para arrays de lambdas"""
+    lambdas = np.asarray(lambda_params, dtype=float)
+
+    return np.where(lambdas <= 0, 0, np.maximum(np.rint(lambdas / LAMBDA_QUANTUM), 1))
+
+
+@lru_cache(maxsize=PMF_CACHE_SIZE)
+def poisson_table(key: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tabelas PMF e CDF de Poisson para lambda = key * LAMBDA_QUANTUM
+
+    Os arrays são somente leitura porque ficam no cache.
+
+    Returns:
+        Tupla (pmf, cdf) com P(X = k) e P(X <= k) para k = 0..size-1
+    """
+    pmf = poisson_pmf(key * LAMBDA_QUANTUM, size)
+    cdf = np.cumsum(pmf)
+
+    pmf.flags.writeable = False
+    cdf.flags.writeable = False
+
+    return pmf, cdf
+
+
+def poisson_tables(lambda_param, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Busca as tabelas PMF/CDF no cache, com lambda quantizado a LAMBDA_QUANTUM
+
+    Args:
+        lambda_param: Taxa média (escalar ou array de N lambdas)
+        size: Número de valores de k
+
+    Returns:
+        Tupla (pmf, cdf), cada uma com shape (size,) para lambda escalar
+        ou (N, size) para array
+    """
+    if np.ndim(lambda_param) == 0:
+        return poisson_table(lambda_key(lambda_param), size)
+
+    # Em lote: uma consulta ao cache por lambda distinto
+    unique_keys, inverse = np.unique(lambda_keys(lambda_param), return_inverse=True)
+    tables = [poisson_table(int(key), size) for key in unique_keys]
+    pmf = np.stack([table[0] for table in tables])[inverse]
+    cdf = np.stack([table[1] for table in tables])[inverse]
+
+    return pmf, cdf
+
+
+@lru_cache(maxsize=PMF_CACHE_SIZE)
+def support_size(key: int, epsilon: float) -> int:
+    """
+    Menor tamanho de grade n tal que P(X >= n) <= epsilon
+
+    Args:
+        key: Lambda quantizado (lambda / LAMBDA_QUANTUM)
+        epsilon: Massa máxima permitida na cauda ignorada
+
+    Returns:
+        Número de valores de k (0..n-1) a considerar
+    """
+    lambda_param = key * LAMBDA_QUANTUM
+
+    # Limite superior folgado (média + 12 desvios padrão) e busca na CDF
+    upper = int(math.ceil(lambda_param + 12 * math.sqrt(lambda_param))) + 12
+    cdf = np.cumsum(poisson_pmf(lambda_param, upper))
+
+    return min(int(np.searchsorted(cdf, 1 - epsilon)) + 1, upper)
+
+
+def support(lambda_param, epsilon: float = DEFAULT_TAIL_EPSILON, min_size: int = 1) -> int:
+    """
+    Tamanho de grade que mantém a cauda ignorada abaixo de epsilon
+
+    Para um array de lambdas, retorna o maior tamanho exigido no lote.
+
+    Args:
+        lambda_param: Taxa média (escalar ou array)
+        epsilon: Massa máxima permitida na cauda
+        min_size: Tamanho mínimo (ex: para cobrir a maior linha do mercado)
+    """
+    if np.ndim(lambda_param) == 0:
+        size = support_size(lambda_key(lambda_param), epsilon)
+    else:
+        keys = np.unique(lambda_keys(lambda_param))
+        size = max(support_size(int(key), epsilon) for key in keys)
+
+    return max(size, min_size)
+
+
+def poisson_over_under(lambda_param, lines) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    P(X > linha) e P(X < linha) de Poisson em forma fechada, sem truncagem
+
+    Usa a função gama incompleta regularizada:
+        P(X > L) = P(X >= floor(L) + 1) = gammainc(floor(L) + 1, λ)
+        P(X < L) = P(X <= ceil(L) - 1) = gammaincc(ceil(L), λ)
+
+    Para linhas inteiras, 1 - over - under é a probabilidade de push.
+
+    Args:
+        lambda_param: Taxa média (escalar ou array (N,))
+        lines: Linha ou sequência de M linhas (ex: 9.5, [7.5, 8.5, 9.5])
+
+    Returns:
+        Tupla (over, under) com shape (M,) para lambda escalar ou (N, M)
+    """
+    lambdas = np.asarray(lambda_param, dtype=float)[..., None]
+    lines = np.atleast_1d(np.asarray(lines, dtype=float))
+
+    over = gammainc(np.floor(lines) + 1, lambdas)
+    under_k = np.ceil(lines)
+    under = np.where(under_k > 0, gammaincc(np.maximum(under_k, 1), lambdas), 0.0)
+
+    return over, under
+
+
+def cache_info():
+    """Estatísticas do cache de tabelas PMF/CDF (hits, misses, tamanho)"""
+    return poisson_table.cache_info()
@@ -5,7 +5,7 @@ FastAPI com Ensemble (Poisson + XGBoost) e análise de valor
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import uvicorn
 
 from data.collector import FootballDataCollector
@@ -14,7 +14,9 @@ from data.database_v2 import Database as DatabaseV2
 from features.api_predictions_features import APIPredictionFeatures
 from models.poisson import PoissonModel
 from models.ensemble import EnsembleModel
-from models.xgboost_model import XGBoostModel
+from models.prediction_cache import PredictionCache, DEFAULT_CACHE_PATH
+from models.xgboost_model import find_latest_model
+from models.registry import ModelRegistry, RegisteredModel
 from analysis.value_analysis import ValueAnalyzer
 from config import config, validate_config
 
@@ -37,34 +39,42 @@ collector = FootballDataCollector(config.FOOTBALL_DATA_API_KEY)
 database = Database()
 
 # NOVO: Database V2 com suporte a predições da API
-database_v2 = DatabaseV2("database/betting_v2.db")
+# Somente leitura: a API nunca grava aqui, e em WAL as leituras não disputam
+# lock com coletores e pipeline gravando no mesmo arquivo
+database_v2 = DatabaseV2("database/betting_v2.db", read_only=True)
 feature_extractor = APIPredictionFeatures(database_v2)
 
 # NOVO: Ensemble com suporte a API-Football
-# Tenta carregar XGBoost se existir modelo treinado
+# XGBoost pela versão ativa do registro de modelos: uma nova versão ativada
+# (manage_models.py activate) é trocada a quente, sem reiniciar a API
+model_registry = ModelRegistry(database_v2)
 xgboost_model = None
 try:
-    import os
-    import glob
-    model_files = glob.glob("models/saved/xgboost_with_api_*.pkl")
-    if model_files:
-        latest_model = max(model_files, key=os.path.getctime)
-        xgboost_model = XGBoostModel(
-            model_path=latest_model,
-            feature_extractor=feature_extractor,
-            use_api_features=True
-        )
-        print(f"✓ XGBoost carregado: {latest_model}")
+    xgboost_model = RegisteredModel(
+        model_registry,
+        feature_extractor=feature_extractor,
+        use_api_features=True,
+        fallback_path=find_latest_model()
+    )
+    if xgboost_model.is_trained:
+        print(f"✓ XGBoost carregado (versão {xgboost_model.version or 'sem registro'})")
 except Exception as e:
     print(f"ℹ️  XGBoost não carregado: {e}")
 
 # Inicializa ensemble (com ou sem XGBoost)
+# Membros em paralelo com prazo: um membro lento (ex: consulta da API-Football)
+# é descartado em vez de segurar a requisição; o Poisson é obrigatório
 ensemble = EnsembleModel(
     database=database_v2,
-    include_api_predictions=True
+    include_api_predictions=True,
+    concurrent=True,
+    timeouts={"poisson": 0.5, "xgboost": 1.0, "api-football": 1.5},
+    required=["poisson"],
+    cache=PredictionCache(db_path=DEFAULT_CACHE_PATH)
 )
 
-if xgboost_model and xgboost_model.is_trained:
+if xgboost_model:
+    # Adicionado mesmo sem versão ativa: o ensemble pula o XGBoost até uma ser ativada
     ensemble.add_model("xgboost", xgboost_model, weight=0.3)
 
 value_analyzer = ValueAnalyzer()
@@ -77,6 +87,10 @@ class PredictRequest(BaseModel):
     use_ensemble: bool = True
 
 
+class PredictBatchRequest(BaseModel):
+    matches: List[PredictRequest]
+
+
 class ValueAnalysisRequest(BaseModel):
     home_team: str
     away_team: str
@@ -105,6 +119,7 @@ async def startup():
     print("  ✓ Kelly Criterion")
     print("\nEndpoints:")
     print("  /predict - Predição com ensemble")
+    print("  /predict-batch - Predição de várias partidas em lote")
     print("  /predict-detailed - Mostra cada modelo individualmente ⭐ NOVO")
     print("  /value-analysis - Análise de valor com odds")
     print("=" * 70 + "\n")
@@ -115,7 +130,7 @@ async def startup():
 async def root():
     models_active = ["Poisson", "API-Football Predictions", "Ensemble"]
     if xgboost_model and xgboost_model.is_trained:
-        models_active.append("XGBoost (com features da API)")
+        models_active.append(f"XGBoost (com features da API, versão {xgboost_model.version})")
 
     return {
         "name": "Sports Betting AI - PRO",
@@ -133,6 +148,7 @@ async def root():
         ],
         "endpoints": {
             "/predict": "Predição com ensemble",
+            "/predict-batch": "Predição com ensemble de várias partidas (uma chamada por modelo)",
             "/predict-detailed": "⭐ NOVO - Mostra cada modelo individualmente",
             "/value-analysis": "Análise de valor com odds",
             "/matches/{competition_code}": "Partidas agendadas",
@@ -243,45 +259,61 @@ def calculate_team_stats(team_id: int) -> Dict:
         }
 
 
+def resolve_match(request: PredictRequest):
+    """
+    Resolve os times de uma requisição, calcula as estatísticas e busca o match_id
+
+    Returns:
+        (home_team, away_team, comp_code, match_stats, match_id)
+
+    Raises:
+        HTTPException: 404 se algum time não for encontrado
+    """
+    comp_code = request.competition.upper()
+    teams = collector.get_teams(comp_code)
+
+    home_team, away_team = None, None
+
+    for team in teams:
+        name = team.get("name", "").lower()
+        short = team.get("shortName", "").lower()
+
+        if request.home_team.lower() in name or request.home_team.lower() in short:
+            home_team = team
+        if request.away_team.lower() in name or request.away_team.lower() in short:
+            away_team = team
+
+    if not home_team or not away_team:
+        raise HTTPException(404, "Time(s) não encontrado(s)")
+
+    # Estatísticas
+    home_stats = calculate_team_stats(home_team["id"])
+    away_stats = calculate_team_stats(away_team["id"])
+
+    match_stats = {"home": home_stats, "away": away_stats}
+
+    # Buscar match_id se a partida existir no banco v2 (para usar features da API)
+    match_id = None
+    try:
+        from data.database_v2 import Match
+        match = database_v2.session.query(Match).filter(
+            Match.home_team.like(f"%{home_team['name']}%"),
+            Match.away_team.like(f"%{away_team['name']}%"),
+            Match.competition == comp_code
+        ).first()
+        if match:
+            match_id = match.id
+    except:
+        pass
+
+    return home_team, away_team, comp_code, match_stats, match_id
+
+
 @app.post("/predict")
 async def predict(request: PredictRequest):
     try:
-        comp_code = request.competition.upper()
-        teams = collector.get_teams(comp_code)
-
-        home_team, away_team = None, None
-
-        for team in teams:
-            name = team.get("name", "").lower()
-            short = team.get("shortName", "").lower()
-
-            if request.home_team.lower() in name or request.home_team.lower() in short:
-                home_team = team
-            if request.away_team.lower() in name or request.away_team.lower() in short:
-                away_team = team
-
-        if not home_team or not away_team:
-            raise HTTPException(404, "Time(s) não encontrado(s)")
-
-        # Estatísticas
-        home_stats = calculate_team_stats(home_team["id"])
-        away_stats = calculate_team_stats(away_team["id"])
-
-        match_stats = {"home": home_stats, "away": away_stats}
-
-        # NOVO: Buscar match_id se a partida existir no banco v2
-        match_id = None
-        try:
-            from data.database_v2 import Match
-            match = database_v2.session.query(Match).filter(
-                Match.home_team.like(f"%{home_team['name']}%"),
-                Match.away_team.like(f"%{away_team['name']}%"),
-                Match.competition == comp_code
-            ).first()
-            if match:
-                match_id = match.id
-        except:
-            pass
+        home_team, away_team, comp_code, match_stats, match_id = resolve_match(request)
+        home_stats, away_stats = match_stats["home"], match_stats["away"]
 
         # Predição (agora com match_id para usar features da API!)
         if request.use_ensemble:
@@ -321,6 +353,61 @@ async def predict(request: PredictRequest):
         raise HTTPException(500, str(e))
 
 
+@app.post("/predict-batch")
+async def predict_batch(request: PredictBatchRequest):
+    """
+    Predição com ensemble de várias partidas (ex: uma rodada inteira)
+
+    Cada modelo do ensemble é chamado uma única vez para o lote. Partidas
+    com times não encontrados voltam com "error" em vez de derrubar o lote.
+    """
+    try:
+        resolved, responses = [], []
+
+        for match_request in request.matches:
+            try:
+                home_team, away_team, comp_code, match_stats, match_id = resolve_match(match_request)
+            except HTTPException as e:
+                responses.append({
+                    "match": {
+                        "home_team": match_request.home_team,
+                        "away_team": match_request.away_team,
+                        "competition": match_request.competition.upper()
+                    },
+                    "error": e.detail
+                })
+                continue
+
+            response = {
+                "match": {
+                    "home_team": home_team["name"],
+                    "away_team": away_team["name"],
+                    "competition": comp_code,
+                    "match_id": match_id
+                },
+                "statistics": match_stats
+            }
+            responses.append(response)
+            resolved.append((response, match_stats, match_id))
+
+        if resolved:
+            batch = ensemble.predict_batch(
+                [match_stats for _, match_stats, _ in resolved],
+                [match_id for _, _, match_id in resolved]
+            )
+            for (response, _, _), prediction in zip(resolved, ensemble.to_predictions(batch)):
+                response["predictions"] = prediction
+
+        return {
+            "total": len(request.matches),
+            "predicted": len(resolved),
+            "results": responses
+        }
+
+    except Exception as e:
+        raise HTTPException(500, str(e))
+
+
 @app.post("/predict-detailed")
 async def predict_detailed(request: PredictRequest):
     """
@@ -332,41 +419,8 @@ async def predict_detailed(request: PredictRequest):
     - Indicação de quais features da API foram usadas
     """
     try:
-        comp_code = request.competition.upper()
-        teams = collector.get_teams(comp_code)
-
-        home_team, away_team = None, None
-
-        for team in teams:
-            name = team.get("name", "").lower()
-            short = team.get("shortName", "").lower()
-
-            if request.home_team.lower() in name or request.home_team.lower() in short:
-                home_team = team
-            if request.away_team.lower() in name or request.away_team.lower() in short:
-                away_team = team
-
-        if not home_team or not away_team:
-            raise HTTPException(404, "Time(s) não encontrado(s)")
-
-        # Estatísticas
-        home_stats = calculate_team_stats(home_team["id"])
-        away_stats = calculate_team_stats(away_team["id"])
-        match_stats = {"home": home_stats, "away": away_stats}
-
-        # Buscar match_id
-        match_id = None
-        try:
-            from data.database_v2 import Match
-            match = database_v2.session.query(Match).filter(
-                Match.home_team.like(f"%{home_team['name']}%"),
-                Match.away_team.like(f"%{away_team['name']}%"),
-                Match.competition == comp_code
-            ).first()
-            if match:
-                match_id = match.id
-        except:
-            pass
+        home_team, away_team, comp_code, match_stats, match_id = resolve_match(request)
+        home_stats, away_stats = match_stats["home"], match_stats["away"]
 
         # Predições individuais de cada modelo
         individual_predictions = ensemble.get_model_predictions(match_stats, match_id=match_id)
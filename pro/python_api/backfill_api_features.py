@@ -0,0 +1,54 @@
+"""
+Materializa as features da API-Football das predições já salvas
+
+Predições novas têm as features gravadas na ingestão (pipeline e
+collect_predictions.py). Este script preenche a tabela
+api_prediction_features para predições antigas e refaz as linhas de uma
+versão de cálculo anterior (API_FEATURE_SCHEMA_VERSION).
+
+Uso:
+    python backfill_api_features.py
+    python backfill_api_features.py --force --batch-size 1000
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data.database_v2 import Database
+from features.api_predictions_features import (
+    APIPredictionFeatures,
+    API_FEATURE_SCHEMA_VERSION,
+    BACKFILL_BATCH_SIZE
+)
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Materializa features da API-Football")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="Predições por commit")
+    parser.add_argument("--force", action="store_true", help="Refaz todas as predições (não só as pendentes)")
+    parser.add_argument("--db", default="database/betting_v2.db", help="Caminho do banco")
+
+    args = parser.parse_args()
+
+    db = Database(args.db)
+
+    print(f"\n🧮 Materializando features da API-Football (versão {API_FEATURE_SCHEMA_VERSION})")
+    started = time.time()
+
+    try:
+        count = APIPredictionFeatures(db).backfill(batch_size=args.batch_size, force=args.force)
+    finally:
+        db.close()
+
+    if count:
+        print(f"\n✅ {count} predições materializadas em {time.time() - started:.1f}s")
+    else:
+        print("\nℹ️  Nenhuma predição pendente")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark de leitura/escrita concorrente nos perfis do SQLite
+
+Simula a ingestão (um processo escritor gravando predições, como o
+pipeline e os coletores) enquanto processos somente leitura consultam a
+predição mais recente de partidas aleatórias (como a API). Cada perfil
+roda num banco temporário próprio com os mesmos dados.
+
+Uso:
+    python benchmark_sqlite_profile.py
+    python benchmark_sqlite_profile.py --duration 10 --readers 8 --profiles legacy performance
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import argparse
+import multiprocessing
+from datetime import datetime
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.exc import OperationalError
+from data.database_v2 import Database
+from data.sqlite_profile import SQLITE_PROFILES
+
+
+def seed(db: Database, n_matches: int):
+    """Partidas e uma predição da API-Football por partida"""
+    ids = db.bulk_save_matches([
+        {
+            "match_id_apif": 100000 + n,
+            "competition": "Benchmark",
+            "season": 2024,
+            "home_team": f"Casa {n}",
+            "away_team": f"Fora {n}",
+            "match_date": datetime(2024, 8, 1),
+            "status": "NS"
+        }
+        for n in range(n_matches)
+    ])["match_id_apif"]
+
+    with db.batch(verbose=False):
+        for match_id in ids.values():
+            db.save_prediction(_prediction(match_id))
+
+    return list(ids.values())
+
+
+def _prediction(match_id: int) -> dict:
+    return {
+        "match_id": match_id,
+        "model_name": "api-football",
+        "home_win_prob": random.random(),
+        "draw_prob": random.random(),
+        "away_win_prob": random.random(),
+        "extra_predictions": {"comparison": {"form": {"home": "60%", "away": "40%"}}}
+    }
+
+
+def _writer(db_path: str, profile: str, match_ids: list, write_batch: int, start: float, deadline: float, queue):
+    """Processo escritor: grava predições em commits de write_batch linhas até o prazo"""
+    db = Database(db_path, profile=profile)
+    writes, errors = 0, 0
+    time.sleep(max(0.0, start - time.time()))
+
+    while time.time() < deadline:
+        try:
+            with db.batch(chunk_size=write_batch, verbose=False):
+                for _ in range(write_batch):
+                    db.save_prediction(_prediction(random.choice(match_ids)))
+            writes += write_batch
+        except OperationalError:
+            errors += 1
+
+    db.close()
+    queue.put({"writes": writes, "errors": errors, "latencies": []})
+
+
+def _reader(db_path: str, profile: str, match_ids: list, start: float, deadline: float, queue):
+    """Processo leitor (como a API): predição mais recente de partidas aleatórias até o prazo"""
+    db = Database(db_path, profile=profile, read_only=True)
+    latencies, errors = [], 0
+    time.sleep(max(0.0, start - time.time()))
+
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            db.get_latest_prediction(random.choice(match_ids))
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+        # Sem transação de leitura presa entre consultas
+        db.session.rollback()
+
+    db.close()
+    queue.put({"writes": 0, "errors": errors, "latencies": latencies})
+
+
+def run_profile(profile: str, args) -> dict:
+    """Roda 1 processo escritor + args.readers leitores por args.duration segundos num banco novo"""
+    directory = tempfile.mkdtemp(prefix=f"sqlite_{profile}_", dir=args.dir)
+    db_path = os.path.join(directory, "benchmark.db")
+
+    try:
+        db = Database(db_path, profile=profile)
+        match_ids = seed(db, args.matches)
+        db.close()
+        db.engine.dispose()
+
+        queue = multiprocessing.Queue()
+        start = time.time() + 1.0  # Todos os processos começam juntos
+        deadline = start + args.duration
+        processes = [
+            multiprocessing.Process(target=_writer, args=(db_path, profile, match_ids, args.write_batch, start, deadline, queue))
+        ] + [
+            multiprocessing.Process(target=_reader, args=(db_path, profile, match_ids, start, deadline, queue))
+            for _ in range(args.readers)
+        ]
+        for process in processes:
+            process.start()
+
+        results = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        writes = sum(r["writes"] for r in results)
+        reads = sum(len(r["latencies"]) for r in results)
+        latencies = np.array([latency for r in results for latency in r["latencies"]] or [0.0]) * 1000
+
+        return {
+            "profile": profile,
+            "writes_per_s": writes / args.duration,
+            "reads_per_s": reads / args.duration,
+            "read_p50_ms": float(np.percentile(latencies, 50)),
+            "read_p99_ms": float(np.percentile(latencies, 99)),
+            "read_max_ms": float(latencies.max()),
+            "errors": sum(r["errors"] for r in results)
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmark dos perfis do SQLite")
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES), choices=list(SQLITE_PROFILES))
+    parser.add_argument("--duration", type=float, default=5.0, help="Segundos por perfil")
+    parser.add_argument("--readers", type=int, default=4, help="Processos leitores")
+    parser.add_argument("--matches", type=int, default=5000, help="Partidas no banco")
+    parser.add_argument("--write-batch", type=int, default=1,
+                        help="Predições por commit do escritor (1 = um commit por linha, como a maioria dos coletores)")
+    parser.add_argument("--dir", default=None, help="Diretório dos bancos temporários (use o disco real do banco)")
+
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"BENCHMARK SQLITE: 1 escritor + {args.readers} leitores (processos), {args.duration:.0f}s por perfil")
+    print("=" * 78)
+
+    results = []
+    for profile in args.profiles:
+        print(f"\n⏱️  Perfil {profile}...")
+        results.append(run_profile(profile, args))
+
+    print(f"\n{'perfil':<12} {'escritas/s':>11} {'leituras/s':>11} {'p50 ms':>8} {'p99 ms':>8} {'máx ms':>8} {'erros':>6}")
+    for r in results:
+        print(f"{r['profile']:<12} {r['writes_per_s']:>11.0f} {r['reads_per_s']:>11.0f} "
+              f"{r['read_p50_ms']:>8.2f} {r['read_p99_ms']:>8.2f} {r['read_max_ms']:>8.1f} {r['errors']:>6}")
+
+
+if __name__ == "__main__":
+    main()
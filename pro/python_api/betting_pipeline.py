@@ -10,7 +10,8 @@ Este script implementa o fluxo completo:
    - Busca H2H (todos os confrontos dos últimos 2 anos)
    - Busca últimas 10 partidas de cada time (do último ano)
    - Salva TUDO no banco (evitando duplicatas)
-3. Processa com modelos (Poisson + XGBoost + Ensemble)
+3. Processa com modelos (Poisson + XGBoost + Ensemble), todas as partidas
+   num único lote
 4. Gera output final JSON com todas apostas possíveis
 
 IMPORTANTE - FREE TIER:
@@ -35,8 +36,10 @@ from data.api_football_collector import APIFootballCollector
 from data.database_v2 import Database, Match, Prediction
 from features.api_predictions_features import APIPredictionFeatures
 from models.poisson import PoissonModel
-from models.xgboost_model import XGBoostModel
+from models.xgboost_model import find_latest_model
+from models.registry import ModelRegistry, RegisteredModel
 from models.ensemble import EnsembleModel
+from models.prediction_cache import PredictionCache, DEFAULT_CACHE_PATH
 from analysis.value_analysis import ValueAnalyzer
 from dotenv import load_dotenv
 
@@ -60,25 +63,27 @@ class BettingPipeline:
         # Inicializa modelos
         self.poisson = PoissonModel()
 
-        # XGBoost (se disponível)
+        # XGBoost (versão ativa do registro, ou o modelo salvo mais recente)
         self.xgboost = None
         try:
-            import glob
-            model_files = glob.glob("models/saved/xgboost_with_api_*.pkl")
-            if model_files:
-                latest_model = max(model_files, key=os.path.getctime)
-                self.xgboost = XGBoostModel(
-                    model_path=latest_model,
-                    feature_extractor=self.feature_extractor,
-                    use_api_features=True
-                )
+            xgboost = RegisteredModel(
+                ModelRegistry(self.db),
+                feature_extractor=self.feature_extractor,
+                use_api_features=True,
+                fallback_path=find_latest_model()
+            )
+            if xgboost.is_trained:
+                self.xgboost = xgboost
         except:
             pass
 
         # Ensemble
+        # Cache compartilhado com a API: partidas sem mudança entre ciclos não são recalculadas
+        self.prediction_cache = PredictionCache(db_path=DEFAULT_CACHE_PATH)
         self.ensemble = EnsembleModel(
             database=self.db,
-            include_api_predictions=True
+            include_api_predictions=True,
+            cache=self.prediction_cache
         )
         if self.xgboost and self.xgboost.is_trained:
             self.ensemble.add_model("xgboost", self.xgboost, weight=0.3)
@@ -355,10 +360,16 @@ class BettingPipeline:
                         }
                     }
 
-                    self.db.save_prediction(pred_data)
+                    prediction = self.db.save_prediction(pred_data)
                     self.stats["predictions_saved"] += 1
                     print(f"      ✓ Predição da API salva")
 
+                    # Features extraídas uma vez aqui, não a cada leitura
+                    try:
+                        self.feature_extractor.materialize([prediction])
+                    except Exception as e:
+                        print(f"      ⚠️  Features da API não materializadas (backfill_api_features.py refaz): {e}")
+
             return match_id
 
         except Exception as e:
@@ -376,12 +387,14 @@ class BettingPipeline:
         """
         saved_count = 0
 
-        for match in matches:
-            try:
-                self.step5_save_to_database(match)
-                saved_count += 1
-            except:
-                continue
+        # Um commit por lote em vez de um por partida
+        with self.db.batch(verbose=False):
+            for match in matches:
+                try:
+                    self.step5_save_to_database(match)
+                    saved_count += 1
+                except:
+                    continue
 
         if saved_count > 0:
             print(f"      ✓ {saved_count} partidas de {team_name} salvas no banco")
@@ -489,15 +502,93 @@ class BettingPipeline:
             except Exception as e:
                 print(f"      ⚠️  Erro no XGBoost: {e}")
 
-        # Ensemble
+        # Ensemble (reaproveita as predições já calculadas acima)
         try:
-            pred_ensemble = self.ensemble.predict(match_stats, match_id=match_id)
+            pred_ensemble = self.ensemble.predict(
+                match_stats,
+                match_id=match_id,
+                model_predictions=predictions
+            )
             predictions["ensemble"] = pred_ensemble
         except Exception as e:
             print(f"      ⚠️  Erro no Ensemble: {e}")
 
         return predictions
 
+    def step6_process_batch(self, matches_stats: List[Dict], match_ids: List[Optional[int]]) -> List[Dict]:
+        """
+        STEP 6 (em lote): Processa N partidas com uma chamada por modelo
+
+        Args:
+            matches_stats: Estatísticas de cada partida
+            match_ids: IDs das partidas no banco (alinhados)
+
+        Returns:
+            Lista de dicts com predições de todos os modelos (mesmo formato
+            de step6_process_with_models), um por partida
+        """
+        if not matches_stats:
+            return []
+
+        # Só as partidas fora do cache entram no lote
+        keys = self.ensemble.prediction_keys(matches_stats, match_ids, namespace="pipeline.step6")
+        predictions = [self.prediction_cache.get(key) for key in keys]
+        misses = [i for i, pred in enumerate(predictions) if pred is None]
+
+        if len(misses) < len(predictions):
+            print(f"   ♻️  {len(predictions) - len(misses)} predições reaproveitadas do cache")
+
+        if misses:
+            computed = self._predict_batch(
+                [matches_stats[i] for i in misses],
+                [match_ids[i] for i in misses]
+            )
+            for i, pred in zip(misses, computed):
+                predictions[i] = pred
+                # Sem ensemble = algum modelo falhou; não fica no cache
+                if "ensemble" in pred:
+                    self.prediction_cache.put(keys[i], pred)
+
+        return predictions
+
+    def _predict_batch(self, matches_stats: List[Dict], match_ids: List[Optional[int]]) -> List[Dict]:
+        """Predições em lote de todos os modelos (sem cache)"""
+        predictions = [{} for _ in matches_stats]
+        batches = {}
+
+        # Poisson
+        try:
+            batches["poisson"] = self.poisson.predict_many(
+                home_attack=[stats["home"]["goals_scored_avg"] for stats in matches_stats],
+                away_attack=[stats["away"]["goals_scored_avg"] for stats in matches_stats],
+                home_defense=[stats["home"]["goals_conceded_avg"] for stats in matches_stats],
+                away_defense=[stats["away"]["goals_conceded_avg"] for stats in matches_stats]
+            )
+            for pred, pred_poisson in zip(predictions, self.poisson.to_predictions(batches["poisson"])):
+                pred["poisson"] = pred_poisson
+        except Exception as e:
+            print(f"      ⚠️  Erro no Poisson: {e}")
+
+        # XGBoost
+        if self.xgboost and self.xgboost.is_trained:
+            try:
+                batches["xgboost"] = self.xgboost.predict_batch(matches_stats, match_ids)
+                for pred, pred_xgboost in zip(predictions, self.xgboost.to_predictions(batches["xgboost"])):
+                    pred["xgboost"] = pred_xgboost
+            except Exception as e:
+                print(f"      ⚠️  Erro no XGBoost: {e}")
+
+        # Ensemble (reaproveita os lotes já calculados acima)
+        try:
+            batch = self.ensemble.predict_batch(matches_stats, match_ids, model_predictions=batches)
+            for pred, pred_ensemble in zip(predictions, self.ensemble.to_predictions(batch)):
+                if pred_ensemble:
+                    pred["ensemble"] = pred_ensemble
+        except Exception as e:
+            print(f"      ⚠️  Erro no Ensemble: {e}")
+
+        return predictions
+
     def step7_generate_betting_recommendations(self, predictions: Dict, fixture: Dict) -> Dict:
         """
         STEP 7: Gera recomendações de apostas
@@ -592,6 +683,24 @@ class BettingPipeline:
         Returns:
             Dict com análise completa
         """
+        result = self.collect_fixture(fixture)
+
+        # STEP 6: Processar com modelos
+        print(f"\n   🤖 STEP 6: Processando com modelos...")
+        predictions = self.step6_process_with_models(result["statistics"], result["match_id_db"])
+
+        return self.finish_fixture(result, predictions, fixture)
+
+    def collect_fixture(self, fixture: Dict) -> Dict:
+        """
+        Coleta os dados de uma partida (STEPS 2 a 5) e calcula as estatísticas
+
+        Args:
+            fixture: Dados da partida
+
+        Returns:
+            Dict parcial da análise (com "statistics" e "match_id_db")
+        """
         fixture_data = fixture["fixture"]
         teams = fixture["teams"]
         league = fixture["league"]
@@ -673,9 +782,23 @@ class BettingPipeline:
 
         result["statistics"] = match_stats
 
-        # STEP 6: Processar com modelos
-        print(f"\n   🤖 STEP 6: Processando com modelos...")
-        predictions = self.step6_process_with_models(match_stats, match_id)
+        # Rate limiting
+        time.sleep(2)
+
+        return result
+
+    def finish_fixture(self, result: Dict, predictions: Dict, fixture: Dict) -> Dict:
+        """
+        Completa a análise de uma partida com as predições (STEP 7)
+
+        Args:
+            result: Dict parcial de collect_fixture
+            predictions: Predições dos modelos (STEP 6)
+            fixture: Dados da partida
+
+        Returns:
+            Dict com análise completa
+        """
         result["model_predictions"] = predictions
 
         print(f"      ✓ {len(predictions)} modelos processados")
@@ -698,9 +821,6 @@ class BettingPipeline:
 
         self.stats["fixtures_processed"] += 1
 
-        # Rate limiting
-        time.sleep(2)
-
         return result
 
     def run(self, max_fixtures: int = 10):
@@ -730,8 +850,8 @@ class BettingPipeline:
             print(f"\n⚠️  Limitando processamento a {max_fixtures} primeiras partidas")
             fixtures = fixtures[:max_fixtures]
 
-        # Processar cada partida
-        results = []
+        # Coletar dados de cada partida
+        collected = []
 
         for i, fixture in enumerate(fixtures, 1):
             print(f"\n\n{'#'*70}")
@@ -739,8 +859,7 @@ class BettingPipeline:
             print(f"{'#'*70}")
 
             try:
-                result = self.process_fixture(fixture)
-                results.append(result)
+                collected.append((fixture, self.collect_fixture(fixture)))
             except Exception as e:
                 print(f"\n❌ Erro ao processar partida: {e}")
                 import traceback
@@ -748,6 +867,26 @@ class BettingPipeline:
                 self.stats["errors"] += 1
                 continue
 
+        # STEP 6: Todas as partidas num único lote
+        print(f"\n🤖 STEP 6: Processando {len(collected)} partidas com modelos (em lote)...")
+        batch_predictions = self.step6_process_batch(
+            [result["statistics"] for _, result in collected],
+            [result["match_id_db"] for _, result in collected]
+        )
+
+        # STEP 7: Recomendações de cada partida
+        results = []
+
+        for (fixture, result), predictions in zip(collected, batch_predictions):
+            print(f"\n⚽ {result['home_team']} vs {result['away_team']}")
+
+            try:
+                results.append(self.finish_fixture(result, predictions, fixture))
+            except Exception as e:
+                print(f"\n❌ Erro ao processar partida: {e}")
+                self.stats["errors"] += 1
+                continue
+
         # Resumo final
         self.print_section("RESUMO FINAL")
 
@@ -186,49 +186,51 @@ class HistoricalDataCollector:
         """Salva partidas no banco evitando duplicatas"""
         saved_count = 0
 
-        for match in matches:
-            try:
-                match_id = match.get("id")
-
-                # Verifica se já existe
-                existing = self.db.session.query(Match).filter_by(
-                    match_id=match_id
-                ).first()
-
-                if existing:
-                    continue  # Pula duplicatas
-
-                # Extrai dados da partida
-                match_date_str = match.get("utcDate", "")
-                match_date = datetime.fromisoformat(
-                    match_date_str.replace('Z', '+00:00')
-                )
-
-                # Filtra por temporada (dupla verificação)
-                # Temporadas vão de agosto do ano X a julho do ano X+1
-                season_start = datetime(season, 8, 1)
-                season_end = datetime(season + 1, 7, 31, 23, 59, 59)
-
-                if not (season_start <= match_date <= season_end):
-                    continue  # Pula partidas fora da temporada
-
-                match_data = {
-                    "match_id": match_id,
-                    "competition": competition,
-                    "home_team": match.get("homeTeam", {}).get("name", "Unknown"),
-                    "away_team": match.get("awayTeam", {}).get("name", "Unknown"),
-                    "home_score": match.get("score", {}).get("fullTime", {}).get("home"),
-                    "away_score": match.get("score", {}).get("fullTime", {}).get("away"),
-                    "match_date": match_date,
-                    "status": match.get("status", "UNKNOWN")
-                }
-
-                # Salva no banco
-                self.db.save_match(match_data)
-                saved_count += 1
-
-            except Exception as e:
-                print(f"    ⚠️ Erro ao salvar partida {match.get('id')}: {e}")
+        # Um commit por lote em vez de um por partida
+        with self.db.batch(verbose=False):
+            for match in matches:
+                try:
+                    match_id = match.get("id")
+
+                    # Verifica se já existe
+                    existing = self.db.session.query(Match).filter_by(
+                        match_id=match_id
+                    ).first()
+
+                    if existing:
+                        continue  # Pula duplicatas
+
+                    # Extrai dados da partida
+                    match_date_str = match.get("utcDate", "")
+                    match_date = datetime.fromisoformat(
+                        match_date_str.replace('Z', '+00:00')
+                    )
+
+                    # Filtra por temporada (dupla verificação)
+                    # Temporadas vão de agosto do ano X a julho do ano X+1
+                    season_start = datetime(season, 8, 1)
+                    season_end = datetime(season + 1, 7, 31, 23, 59, 59)
+
+                    if not (season_start <= match_date <= season_end):
+                        continue  # Pula partidas fora da temporada
+
+                    match_data = {
+                        "match_id": match_id,
+                        "competition": competition,
+                        "home_team": match.get("homeTeam", {}).get("name", "Unknown"),
+                        "away_team": match.get("awayTeam", {}).get("name", "Unknown"),
+                        "home_score": match.get("score", {}).get("fullTime", {}).get("home"),
+                        "away_score": match.get("score", {}).get("fullTime", {}).get("away"),
+                        "match_date": match_date,
+                        "status": match.get("status", "UNKNOWN")
+                    }
+
+                    # Salva no banco
+                    self.db.save_match(match_data)
+                    saved_count += 1
+
+                except Exception as e:
+                    print(f"    ⚠️ Erro ao salvar partida {match.get('id')}: {e}")
 
         return saved_count
 
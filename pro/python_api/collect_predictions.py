@@ -29,6 +29,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from data.api_football_collector import APIFootballCollector
 from data.database_v2 import Database
+from features.api_predictions_features import APIPredictionFeatures
 
 
 def collect_predictions_for_league(
@@ -265,7 +266,14 @@ def _save_prediction_to_db(db: Database, fixture: dict, prediction_data: dict, l
             }
         }
 
-        db.save_prediction(pred_data)
+        prediction = db.save_prediction(pred_data)
+
+        # Features extraídas uma vez aqui, não a cada leitura
+        try:
+            APIPredictionFeatures(db).materialize([prediction])
+        except Exception as e:
+            print(f"      ⚠️  Features da API não materializadas (backfill_api_features.py refaz): {e}")
+
         return True
 
     except Exception as e:
@@ -1,12 +1,15 @@
 """
 Banco de dados SQLite para armazenar histórico de partidas e predições
 """
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, JSON
+from sqlalchemy import Column, Integer, Float, String, DateTime, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 import os
 
+from data.sqlite_profile import create_sqlite_engine
+from data.unit_of_work import BatchMixin, unit_of_work
+
 Base = declarative_base()
 
 
@@ -59,43 +62,47 @@ class BettingResult(Base):
     created_at = Column(DateTime, default=datetime.now)
 
 
-class Database:
+class Database(BatchMixin):
     """Gerenciador de banco de dados"""
 
-    def __init__(self, db_path: str = "database/betting.db"):
+    def __init__(self, db_path: str = "database/betting.db", profile: str = None):
         """
         Args:
             db_path: Caminho para o arquivo do banco
+            profile: Perfil de PRAGMAs do SQLite (ver data/sqlite_profile.py)
         """
         # Cria diretório se não existir
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
         # Conecta ao banco
-        self.engine = create_engine(f"sqlite:///{db_path}")
+        self.engine = create_sqlite_engine(db_path, profile)
         Base.metadata.create_all(self.engine)
 
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
 
+    @unit_of_work
     def save_match(self, match_data: dict) -> Match:
         """Salva partida no banco"""
         match = Match(**match_data)
         self.session.add(match)
-        self.session.commit()
+        self.commit()
         return match
 
+    @unit_of_work
     def save_prediction(self, pred_data: dict) -> Prediction:
         """Salva predição no banco"""
         prediction = Prediction(**pred_data)
         self.session.add(prediction)
-        self.session.commit()
+        self.commit()
         return prediction
 
+    @unit_of_work
     def save_betting_result(self, result_data: dict) -> BettingResult:
         """Salva resultado de aposta"""
         result = BettingResult(**result_data)
         self.session.add(result)
-        self.session.commit()
+        self.commit()
         return result
 
     def get_matches(self, competition: str = None, limit: int = 100):
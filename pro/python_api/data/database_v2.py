@@ -8,14 +8,25 @@ Dados extras incluem:
 - Escalações (lineups)
 - Odds/Probabilidades
 """
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, JSON, Boolean, ForeignKey, Text
+from sqlalchemy import select, insert, update, func, or_, Column, Integer, Float, String, DateTime, JSON, Boolean, ForeignKey, Text, UniqueConstraint, Index
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
+from typing import Dict, List, Optional
 import os
 
+from data.sqlite_profile import create_sqlite_engine
+from data.unit_of_work import BatchMixin, unit_of_work
+
 Base = declarative_base()
 
+# IDs por consulta em get_latest_predictions (limite de parâmetros do SQLite)
+PREDICTION_CHUNK_SIZE = 500
+
+# Linhas por comando nas gravações em lote (bulk_save_*)
+BULK_CHUNK_SIZE = 500
+
 
 class Match(Base):
     """
@@ -233,6 +244,10 @@ class Team(Base):
 class Prediction(Base):
     """Tabela de predições do modelo"""
     __tablename__ = "predictions"
+    __table_args__ = (
+        # Predição mais recente de um modelo por partida (get_latest_prediction)
+        Index("ix_predictions_match_model_created", "match_id", "model_name", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     match_id = Column(Integer, ForeignKey('matches.id'))
@@ -264,6 +279,64 @@ class Prediction(Base):
     created_at = Column(DateTime, default=datetime.now)
 
 
+class APIPredictionFeature(Base):
+    """
+    Features da API-Football já extraídas de uma predição (uma linha por predição)
+
+    Preenchida quando a predição é salva (APIPredictionFeatures.materialize),
+    para que a inferência leia floats de uma linha indexada em vez de
+    decodificar o JSON de extra_predictions. Linhas com schema_version
+    diferente da atual são ignoradas na leitura e refeitas pelo backfill
+    (backfill_api_features.py).
+    """
+    __tablename__ = "api_prediction_features"
+
+    id = Column(Integer, primary_key=True)
+    prediction_id = Column(Integer, ForeignKey('predictions.id'), unique=True, index=True)
+    match_id = Column(Integer, ForeignKey('matches.id'), index=True)
+    schema_version = Column(Integer)
+
+    # Probabilidades básicas
+    api_home_win_prob = Column(Float, nullable=True)
+    api_draw_prob = Column(Float, nullable=True)
+    api_away_win_prob = Column(Float, nullable=True)
+
+    # Features derivadas
+    api_home_advantage = Column(Float, nullable=True)
+    api_prediction_confidence = Column(Float, nullable=True)
+    api_draw_likelihood = Column(Float, nullable=True)
+
+    # Under/Over
+    api_over_25_prob = Column(Float, nullable=True)
+    api_under_25_prob = Column(Float, nullable=True)
+
+    # Comparações
+    api_form_home = Column(Float, nullable=True)
+    api_form_away = Column(Float, nullable=True)
+    api_att_home = Column(Float, nullable=True)
+    api_att_away = Column(Float, nullable=True)
+    api_def_home = Column(Float, nullable=True)
+    api_def_away = Column(Float, nullable=True)
+    api_poisson_home = Column(Float, nullable=True)
+    api_poisson_away = Column(Float, nullable=True)
+    api_h2h_home = Column(Float, nullable=True)
+    api_h2h_away = Column(Float, nullable=True)
+    api_goals_home = Column(Float, nullable=True)
+    api_goals_away = Column(Float, nullable=True)
+    api_total_home = Column(Float, nullable=True)
+    api_total_away = Column(Float, nullable=True)
+
+    # Features derivadas de comparações
+    api_form_diff = Column(Float, nullable=True)
+    api_attack_vs_defense = Column(Float, nullable=True)
+
+    # Forma recente
+    api_recent_form_home = Column(Float, nullable=True)
+    api_recent_form_away = Column(Float, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.now)
+
+
 class BettingResult(Base):
     """Tabela de resultados de apostas (para backtesting)"""
     __tablename__ = "betting_results"
@@ -280,13 +353,67 @@ class BettingResult(Base):
     created_at = Column(DateTime, default=datetime.now)
 
 
-class Database:
+class TeamStrength(Base):
+    """
+    Forças dos times ajustadas por máxima verossimilhança (Dixon-Coles)
+
+    Uma linha por time e competição, recalculada pelo DixonColesModel
+    a partir das partidas finalizadas da tabela matches.
+    """
+    __tablename__ = "team_strengths"
+    __table_args__ = (
+        UniqueConstraint("competition", "team", name="uq_team_strength_competition_team"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    competition = Column(String, index=True)
+    team = Column(String, index=True)
+
+    # Parâmetros do modelo (escala log)
+    attack = Column(Float)
+    defense = Column(Float)
+    home_advantage = Column(Float)  # Comum à competição
+    rho = Column(Float)  # Correção Dixon-Coles para placares baixos
+
+    # Metadados do ajuste
+    n_matches = Column(Integer)  # Partidas do time usadas no ajuste
+    time_decay = Column(Float, nullable=True)  # ξ do peso exp(-ξ * dias)
+    fitted_at = Column(DateTime, default=datetime.now)
+
+
+class ModelVersion(Base):
+    """
+    Manifesto do registro de modelos (models/registry.py)
+
+    Cada modelo treinado vira uma versão numerada; no máximo uma versão
+    por model_name fica ativa e é a usada pelos processos em execução.
+    """
+    __tablename__ = "model_registry"
+    __table_args__ = (
+        UniqueConstraint("model_name", "version", name="uq_model_registry_name_version"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    model_name = Column(String, index=True)  # 'xgboost_with_api'
+    version = Column(Integer)
+    path = Column(String)  # Artefato do modelo (ex: .ubj + .meta.json)
+
+    metrics = Column(JSON, nullable=True)  # Ex: {"train_accuracy": 0.65, "val_accuracy": 0.58}
+    is_active = Column(Boolean, default=False, index=True)
+
+    created_at = Column(DateTime, default=datetime.now)
+    activated_at = Column(DateTime, nullable=True)
+
+
+class Database(BatchMixin):
     """Gerenciador de banco de dados com suporte DUAL-API"""
 
-    def __init__(self, db_path: str = "database/betting_v2.db"):
+    def __init__(self, db_path: str = "database/betting_v2.db", profile: str = None, read_only: bool = False):
         """
         Args:
             db_path: Caminho para o arquivo do banco
+            profile: Perfil de PRAGMAs do SQLite (ver data/sqlite_profile.py)
+            read_only: Conexões somente leitura (caminhos de serviço, ex: API)
         """
         # Cria diretório se não existir
         db_dir = os.path.dirname(db_path)
@@ -294,12 +421,23 @@ class Database:
             os.makedirs(db_dir, exist_ok=True)
 
         # Conecta ao banco
-        self.engine = create_engine(f"sqlite:///{db_path}")
+        self.engine = create_sqlite_engine(db_path, profile)
         Base.metadata.create_all(self.engine)
 
+        # create_all não cria índices novos em tabelas que já existem
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+
+        # Esquema (e journal_mode) preparados pela conexão de escrita acima
+        if read_only:
+            self.engine.dispose()
+            self.engine = create_sqlite_engine(db_path, profile, read_only=True)
+
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
 
+    @unit_of_work
     def save_match(self, match_data: dict) -> Match:
         """
         Salva ou atualiza partida no banco
@@ -328,9 +466,10 @@ class Database:
             match = Match(**match_data)
             self.session.add(match)
 
-        self.session.commit()
+        self.commit()
         return match
 
+    @unit_of_work
     def save_match_statistics(self, stats_data: dict) -> MatchStatistics:
         """Salva estatísticas detalhadas da partida"""
         # Verifica se já existe
@@ -342,28 +481,31 @@ class Database:
             for key, value in stats_data.items():
                 if value is not None:
                     setattr(existing, key, value)
-            self.session.commit()
+            self.commit()
             return existing
         else:
             stats = MatchStatistics(**stats_data)
             self.session.add(stats)
-            self.session.commit()
+            self.commit()
             return stats
 
+    @unit_of_work
     def save_match_event(self, event_data: dict) -> MatchEvent:
         """Salva evento da partida"""
         event = MatchEvent(**event_data)
         self.session.add(event)
-        self.session.commit()
+        self.commit()
         return event
 
+    @unit_of_work
     def save_match_odds(self, odds_data: dict) -> MatchOdds:
         """Salva odds da partida"""
         odds = MatchOdds(**odds_data)
         self.session.add(odds)
-        self.session.commit()
+        self.commit()
         return odds
 
+    @unit_of_work
     def save_team(self, team_data: dict) -> Team:
         """Salva ou atualiza time no banco"""
         # Verifica se já existe
@@ -387,21 +529,226 @@ class Database:
             team = Team(**team_data)
             self.session.add(team)
 
-        self.session.commit()
+        self.commit()
         return team
 
+    @unit_of_work
+    def bulk_save_matches(self, matches: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict[str, Dict[int, int]]:
+        """
+        Salva ou atualiza várias partidas numa única transação (versão em lote de save_match)
+
+        Mesma regra de save_match: a partida é encontrada por match_id_fd ou
+        match_id_apif, e valores None não sobrescrevem os existentes. Uma
+        consulta, um UPDATE e um INSERT por bloco, e um único commit no fim.
+
+        Args:
+            matches: Lista de dicts com colunas de Match
+            chunk_size: Partidas por bloco
+
+        Returns:
+            {"match_id_fd": {id football-data: id no banco},
+             "match_id_apif": {id API-Football: id no banco}}
+
+        Raises:
+            Exception: Erro de gravação (nada é gravado; a transação é desfeita)
+        """
+        return self._bulk_upsert_by_keys(Match, matches, ("match_id_fd", "match_id_apif"), chunk_size)
+
+    @unit_of_work
+    def bulk_save_teams(self, teams: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict[str, Dict[int, int]]:
+        """
+        Salva ou atualiza vários times numa única transação (versão em lote de save_team)
+
+        Args:
+            teams: Lista de dicts com colunas de Team
+            chunk_size: Times por bloco
+
+        Returns:
+            {"team_id_fd": {id football-data: id no banco},
+             "team_id_apif": {id API-Football: id no banco}}
+
+        Raises:
+            Exception: Erro de gravação (nada é gravado; a transação é desfeita)
+        """
+        return self._bulk_upsert_by_keys(Team, teams, ("team_id_fd", "team_id_apif"), chunk_size)
+
+    @unit_of_work
+    def bulk_save_match_statistics(self, statistics: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict[int, int]:
+        """
+        Salva ou atualiza estatísticas de várias partidas numa única transação
+
+        INSERT ... ON CONFLICT (match_id) DO UPDATE; como em
+        save_match_statistics, valores None não sobrescrevem os existentes.
+
+        Args:
+            statistics: Lista de dicts com colunas de MatchStatistics (match_id obrigatório)
+            chunk_size: Linhas por comando
+
+        Returns:
+            {match_id: id das estatísticas no banco}
+
+        Raises:
+            Exception: Erro de gravação (nada é gravado; a transação é desfeita)
+        """
+        # Uma linha por partida (a última vence, como chamadas sucessivas)
+        merged = {}
+        for row in statistics:
+            merged.setdefault(row["match_id"], {}).update(
+                {key: value for key, value in row.items() if value is not None}
+            )
+
+        ids = {}
+
+        for chunk in self._chunks(list(merged.values()), chunk_size):
+            # executemany exige as mesmas colunas em todas as linhas
+            columns = sorted(set().union(*chunk))
+            rows = [{column: row.get(column) for column in columns} for row in chunk]
+
+            statement = sqlite_insert(MatchStatistics)
+            statement = statement.on_conflict_do_update(
+                index_elements=["match_id"],
+                set_={
+                    column: func.coalesce(statement.excluded[column], MatchStatistics.__table__.c[column])
+                    for column in columns if column not in ("id", "match_id")
+                }
+            )
+            self.session.execute(statement, rows)
+
+            ids.update(self.session.execute(
+                select(MatchStatistics.match_id, MatchStatistics.id).where(
+                    MatchStatistics.match_id.in_([row["match_id"] for row in chunk])
+                )
+            ).all())
+
+        self.commit(rows=len(merged))
+
+        return ids
+
+    @unit_of_work
+    def bulk_save_match_events(self, events: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> List[int]:
+        """
+        Insere vários eventos numa única transação (versão em lote de save_match_event)
+
+        Returns:
+            IDs no banco, alinhados à entrada
+        """
+        return self._bulk_insert(MatchEvent, events, chunk_size)
+
+    @unit_of_work
+    def bulk_save_match_odds(self, odds: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> List[int]:
+        """
+        Insere várias odds numa única transação (versão em lote de save_match_odds)
+
+        Returns:
+            IDs no banco, alinhados à entrada
+        """
+        return self._bulk_insert(MatchOdds, odds, chunk_size)
+
+    def _bulk_insert(self, model, rows: List[Dict], chunk_size: int) -> List[int]:
+        """INSERT em blocos com RETURNING id (commit via self.commit)"""
+        ids = []
+
+        for chunk in self._chunks(rows, chunk_size):
+            result = self.session.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True), chunk
+            )
+            ids.extend(result.scalars().all())
+
+        self.commit(rows=len(rows))
+
+        return ids
+
+    def _bulk_upsert_by_keys(self, model, rows: List[Dict], keys: tuple, chunk_size: int) -> Dict[str, Dict[int, int]]:
+        """
+        Upsert em blocos de tabelas com duas chaves externas alternativas (ex: IDs das duas APIs)
+
+        Um ON CONFLICT só cobre uma chave, e a linha pode ser encontrada por
+        qualquer uma das duas; então cada bloco resolve os IDs existentes
+        numa consulta, atualiza os encontrados (UPDATE por id) e insere o
+        resto (INSERT ... RETURNING id).
+        """
+        ids = {key: {} for key in keys}
+        columns = model.__table__.c
+
+        # Junta linhas da entrada que se referem ao mesmo registro
+        merged = []
+        by_key = {key: {} for key in keys}
+        for row in rows:
+            values = {key: value for key, value in row.items() if value is not None}
+            target = next(
+                (by_key[key][values[key]] for key in keys if values.get(key) in by_key[key]),
+                None
+            )
+            if target is None:
+                target = {}
+                merged.append(target)
+            target.update(values)
+            for key in keys:
+                if key in target:
+                    by_key[key][target[key]] = target
+
+        for chunk in self._chunks(merged, chunk_size):
+            # IDs já existentes (por qualquer uma das chaves), na ordem de prioridade das chaves
+            existing = {key: {} for key in keys}
+            conditions = [
+                columns[key].in_([row[key] for row in chunk if key in row])
+                for key in keys
+            ]
+            for found in self.session.execute(
+                select(columns.id, *[columns[key] for key in keys]).where(or_(*conditions))
+            ):
+                for key in keys:
+                    if getattr(found, key) is not None:
+                        existing[key][getattr(found, key)] = found.id
+
+            updates, inserts = [], []
+            for row in chunk:
+                row_id = next(
+                    (existing[key][row[key]] for key in keys if row.get(key) in existing[key]),
+                    None
+                )
+                if row_id is None:
+                    inserts.append(row)
+                else:
+                    updates.append({**row, "id": row_id, "updated_at": datetime.now()})
+
+            if updates:
+                self.session.execute(update(model), updates)
+
+            inserted = []
+            if inserts:
+                inserted = self.session.execute(
+                    insert(model).returning(model.id, sort_by_parameter_order=True), inserts
+                ).scalars().all()
+
+            for row, row_id in zip(updates + inserts, [row["id"] for row in updates] + list(inserted)):
+                for key in keys:
+                    if key in row:
+                        ids[key][row[key]] = row_id
+
+        self.commit(rows=len(merged))
+
+        return ids
+
+    @staticmethod
+    def _chunks(rows: List, chunk_size: int) -> List[List]:
+        """Divide uma lista em blocos de chunk_size"""
+        return [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+
+    @unit_of_work
     def save_prediction(self, pred_data: dict) -> Prediction:
         """Salva predição no banco"""
         prediction = Prediction(**pred_data)
         self.session.add(prediction)
-        self.session.commit()
+        self.commit()
         return prediction
 
+    @unit_of_work
     def save_betting_result(self, result_data: dict) -> BettingResult:
         """Salva resultado de aposta"""
         result = BettingResult(**result_data)
         self.session.add(result)
-        self.session.commit()
+        self.commit()
         return result
 
     def get_matches(self, competition: str = None, season: int = None, limit: int = 100):
@@ -427,6 +774,267 @@ class Database:
             query = query.filter(Prediction.match_id == match_id)
         return query.all()
 
+    def get_latest_prediction(self, match_id: int, model_name: str = "api-football", session=None) -> Optional[Prediction]:
+        """
+        Predição mais recente de um modelo para uma partida
+
+        Usa o índice (match_id, model_name, created_at); empates em
+        created_at são desfeitos pelo id.
+
+        Args:
+            match_id: ID da partida
+            model_name: Modelo que gerou a predição
+            session: Sessão a usar (padrão: a do Database; threads devem passar a própria)
+
+        Returns:
+            Prediction, ou None se não houver
+        """
+        session = session or self.session
+
+        return session.query(Prediction).filter(
+            Prediction.match_id == match_id,
+            Prediction.model_name == model_name
+        ).order_by(Prediction.created_at.desc(), Prediction.id.desc()).first()
+
+    def get_latest_predictions(
+        self,
+        match_ids: List[int] = None,
+        model_name: str = "api-football",
+        session=None
+    ) -> Dict[int, Prediction]:
+        """
+        Predição mais recente de um modelo para várias partidas (pré-carga)
+
+        Uma consulta por bloco de PREDICTION_CHUNK_SIZE IDs, em vez de uma
+        por partida.
+
+        Args:
+            match_ids: IDs das partidas (None = todas as partidas)
+            model_name: Modelo que gerou a predição
+            session: Sessão a usar (padrão: a do Database; threads devem passar a própria)
+
+        Returns:
+            {match_id: Prediction}; partidas sem predição ficam de fora
+        """
+        session = session or self.session
+
+        latest = {}
+
+        for chunk in self._match_id_chunks(match_ids):
+            ranked = self._ranked_predictions(chunk, model_name)
+
+            predictions = session.query(Prediction).join(
+                ranked, Prediction.id == ranked.c.id
+            ).filter(ranked.c.rank == 1).all()
+
+            latest.update((prediction.match_id, prediction) for prediction in predictions)
+
+        return latest
+
+    def get_latest_prediction_features(
+        self,
+        match_ids: List[int] = None,
+        model_name: str = "api-football",
+        session=None
+    ) -> Dict[int, tuple]:
+        """
+        Features materializadas da predição mais recente de cada partida
+
+        Não carrega as linhas de Prediction (nem o JSON de extra_predictions).
+
+        Args:
+            match_ids: IDs das partidas (None = todas as partidas)
+            model_name: Modelo que gerou a predição
+            session: Sessão a usar (padrão: a do Database; threads devem passar a própria)
+
+        Returns:
+            {match_id: (prediction_id, APIPredictionFeature ou None se ainda
+            não materializada)}; partidas sem predição ficam de fora
+        """
+        session = session or self.session
+        latest = {}
+
+        for chunk in self._match_id_chunks(match_ids):
+            ranked = self._ranked_predictions(chunk, model_name)
+
+            rows = session.query(ranked.c.match_id, ranked.c.id, APIPredictionFeature).outerjoin(
+                APIPredictionFeature, APIPredictionFeature.prediction_id == ranked.c.id
+            ).filter(ranked.c.rank == 1).all()
+
+            latest.update((match_id, (prediction_id, features)) for match_id, prediction_id, features in rows)
+
+        return latest
+
+    @unit_of_work
+    def save_api_prediction_features(self, rows: List[Dict]):
+        """
+        Grava features materializadas (substitui as da mesma predição), num único commit
+
+        Args:
+            rows: Dicts com prediction_id, match_id, schema_version e as
+                colunas de features de APIPredictionFeature
+        """
+        if not rows:
+            return
+
+        columns = set(APIPredictionFeature.__table__.columns.keys()) - {"id", "created_at"}
+
+        existing = {
+            features.prediction_id: features
+            for features in self.session.query(APIPredictionFeature).filter(
+                APIPredictionFeature.prediction_id.in_([row["prediction_id"] for row in rows])
+            )
+        }
+
+        for row in rows:
+            values = {key: value for key, value in row.items() if key in columns}
+            features = existing.get(row["prediction_id"])
+
+            if features:
+                for key, value in values.items():
+                    setattr(features, key, value)
+                features.created_at = datetime.now()
+            else:
+                features = APIPredictionFeature(**values)
+                self.session.add(features)
+                existing[row["prediction_id"]] = features
+
+        self.commit(rows=len(rows))
+
+    @staticmethod
+    def _match_id_chunks(match_ids: Optional[List[int]]) -> List[Optional[List[int]]]:
+        """Divide os IDs em blocos de PREDICTION_CHUNK_SIZE ([None] = sem filtro)"""
+        if match_ids is None:
+            return [None]
+
+        match_ids = sorted({int(match_id) for match_id in match_ids if match_id})
+
+        return [
+            match_ids[i:i + PREDICTION_CHUNK_SIZE]
+            for i in range(0, len(match_ids), PREDICTION_CHUNK_SIZE)
+        ]
+
+    @staticmethod
+    def _ranked_predictions(match_ids: Optional[List[int]], model_name: str):
+        """Subconsulta (id, match_id, rank) das predições; rank 1 = mais recente da partida"""
+        ranked = select(
+            Prediction.id,
+            Prediction.match_id,
+            func.row_number().over(
+                partition_by=Prediction.match_id,
+                order_by=(Prediction.created_at.desc(), Prediction.id.desc())
+            ).label("rank")
+        ).where(Prediction.model_name == model_name)
+
+        if match_ids is not None:
+            ranked = ranked.where(Prediction.match_id.in_(match_ids))
+
+        return ranked.subquery()
+
+    @unit_of_work
+    def save_team_strengths(self, competition: str, strengths: list):
+        """
+        Substitui as forças ajustadas de uma competição (uma única transação)
+
+        Args:
+            competition: Nome/código da competição
+            strengths: Lista de dicts com colunas de TeamStrength
+        """
+        self.session.query(TeamStrength).filter(
+            TeamStrength.competition == competition
+        ).delete()
+
+        self.session.add_all(
+            TeamStrength(competition=competition, **strength) for strength in strengths
+        )
+        self.commit(rows=len(strengths))
+
+    def get_team_strengths(self, competition: str):
+        """Busca as forças ajustadas de todos os times de uma competição"""
+        return self.session.query(TeamStrength).filter(
+            TeamStrength.competition == competition
+        ).all()
+
+    @unit_of_work
+    def register_model_version(self, model_name: str, path: str, metrics: dict = None) -> ModelVersion:
+        """
+        Registra uma nova versão de modelo (número = última versão + 1)
+
+        Args:
+            model_name: Nome do modelo no registro
+            path: Caminho do artefato
+            metrics: Métricas de treino/validação
+
+        Returns:
+            ModelVersion criada (ainda inativa)
+        """
+        last = self.session.query(ModelVersion.version).filter(
+            ModelVersion.model_name == model_name
+        ).order_by(ModelVersion.version.desc()).first()
+
+        model_version = ModelVersion(
+            model_name=model_name,
+            version=(last[0] + 1) if last else 1,
+            path=path,
+            metrics=metrics
+        )
+        self.session.add(model_version)
+        self.commit()
+        return model_version
+
+    @unit_of_work
+    def activate_model_version(self, model_name: str, version: int) -> ModelVersion:
+        """
+        Torna uma versão a ativa do modelo (uma única transação)
+
+        Raises:
+            ValueError: Se a versão não existir
+        """
+        model_version = self.session.query(ModelVersion).filter(
+            ModelVersion.model_name == model_name,
+            ModelVersion.version == version
+        ).first()
+
+        if not model_version:
+            raise ValueError(f"Versão {version} de {model_name} não encontrada no registro")
+
+        deactivated = self.session.query(ModelVersion).filter(
+            ModelVersion.model_name == model_name,
+            ModelVersion.is_active.is_(True)
+        ).update({"is_active": False})
+
+        model_version.is_active = True
+        model_version.activated_at = datetime.now()
+        self.commit(rows=deactivated + 1)
+        return model_version
+
+    def get_model_versions(self, model_name: str):
+        """Lista as versões registradas de um modelo (mais recente primeiro)"""
+        return self.session.query(ModelVersion).filter(
+            ModelVersion.model_name == model_name
+        ).order_by(ModelVersion.version.desc()).all()
+
+    def get_active_model_version(self, model_name: str):
+        """
+        Busca (versão, caminho) da versão ativa de um modelo
+
+        Consulta leve feita numa conexão própria (e não na sessão
+        compartilhada), para poder ser chamada por várias threads a cada
+        poucos segundos.
+
+        Returns:
+            Tupla (version, path) ou None se nenhuma versão estiver ativa
+        """
+        query = select(ModelVersion.version, ModelVersion.path).where(
+            ModelVersion.model_name == model_name,
+            ModelVersion.is_active.is_(True)
+        )
+
+        with self.engine.connect() as connection:
+            row = connection.execute(query).first()
+
+        return (row[0], row[1]) if row else None
+
     def close(self):
         """Fecha conexão"""
         self.session.close()
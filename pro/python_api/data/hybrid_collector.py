@@ -148,7 +148,7 @@ class HybridCollector:
                         # Atualizar match com ID da API-Football
                         match_obj.match_id_apif = apif_fixture_id
                         match_obj.data_source = "both"
-                        self.db.session.commit()
+                        self.db.commit()
 
                         # Buscar estatísticas detalhadas
                         if include_statistics:
@@ -409,24 +409,26 @@ class HybridCollector:
             if not events:
                 return
 
+            # Eventos já buscados: um commit para todos, sem transação aberta durante a requisição
             events_count = 0
-            for event in events:
-                event_data = {
-                    "match_id": match_id,
-                    "time_elapsed": event.get("time", {}).get("elapsed", 0),
-                    "time_extra": event.get("time", {}).get("extra"),
-                    "event_type": event.get("type"),
-                    "event_detail": event.get("detail"),
-                    "team": "home" if event.get("team", {}).get("id") else "away",
-                    "player_name": event.get("player", {}).get("name"),
-                    "player_id": event.get("player", {}).get("id"),
-                    "assist_player_name": event.get("assist", {}).get("name"),
-                    "assist_player_id": event.get("assist", {}).get("id"),
-                    "comments": event.get("comments")
-                }
-
-                self.db.save_match_event(event_data)
-                events_count += 1
+            with self.db.batch(verbose=False):
+                for event in events:
+                    event_data = {
+                        "match_id": match_id,
+                        "time_elapsed": event.get("time", {}).get("elapsed", 0),
+                        "time_extra": event.get("time", {}).get("extra"),
+                        "event_type": event.get("type"),
+                        "event_detail": event.get("detail"),
+                        "team": "home" if event.get("team", {}).get("id") else "away",
+                        "player_name": event.get("player", {}).get("name"),
+                        "player_id": event.get("player", {}).get("id"),
+                        "assist_player_name": event.get("assist", {}).get("name"),
+                        "assist_player_id": event.get("assist", {}).get("id"),
+                        "comments": event.get("comments")
+                    }
+
+                    self.db.save_match_event(event_data)
+                    events_count += 1
 
             self.stats["events_saved"] += events_count
             print(f"    ✓ {events_count} eventos salvos")
@@ -0,0 +1,84 @@
+"""
+Perfis de configuração do SQLite (PRAGMAs aplicados a cada conexão)
+
+Coletores, pipeline e a API usam o mesmo arquivo. No modo padrão do SQLite
+(journal DELETE) um escritor bloqueia todos os leitores enquanto grava, e
+cada commit faz fsync completo. O perfil "performance" usa WAL (leitores
+não bloqueiam o escritor nem são bloqueados por ele), synchronous=NORMAL
+(seguro em WAL; só o último commit pode se perder numa queda de energia),
+mmap e cache maiores, temporários em memória e busy_timeout para esperar
+por locks em vez de falhar.
+
+Escolha do perfil: argumento profile, ou a variável de ambiente
+SQLITE_PROFILE (padrão: "performance").
+
+Uso:
+    engine = create_sqlite_engine("database/betting_v2.db")
+    engine = create_sqlite_engine("database/betting_v2.db", read_only=True)  # API
+"""
+import os
+from urllib.parse import quote
+
+from sqlalchemy import create_engine, event
+
+
+SQLITE_PROFILES = {
+    # Comportamento anterior (sem PRAGMAs): journal DELETE, synchronous FULL
+    "legacy": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,  # bytes
+        "cache_size": -64 * 1024,  # negativo = KiB (64 MiB)
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,  # ms
+    },
+}
+
+DEFAULT_SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+
+# PRAGMAs que só uma conexão de escrita pode aplicar
+_WRITE_ONLY_PRAGMAS = ("journal_mode",)
+
+
+def create_sqlite_engine(db_path: str, profile: str = None, read_only: bool = False):
+    """
+    Cria um engine SQLAlchemy para o arquivo com os PRAGMAs do perfil
+
+    Args:
+        db_path: Caminho do arquivo .db
+        profile: Nome do perfil em SQLITE_PROFILES (padrão: DEFAULT_SQLITE_PROFILE)
+        read_only: Abre as conexões somente leitura (mode=ro); o arquivo e o
+            esquema já devem existir
+
+    Returns:
+        Engine
+
+    Raises:
+        ValueError: Se o perfil não existir
+    """
+    profile = profile or DEFAULT_SQLITE_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Perfil SQLite {profile} desconhecido (disponíveis: {list(SQLITE_PROFILES)})")
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+
+    if read_only:
+        # journal_mode é gravado no arquivo: fica o que a conexão de escrita definiu
+        for pragma in _WRITE_ONLY_PRAGMAS:
+            pragmas.pop(pragma, None)
+        pragmas["query_only"] = "ON"
+
+        engine = create_engine(f"sqlite:///file:{quote(db_path)}?mode=ro&uri=true")
+    else:
+        engine = create_engine(f"sqlite:///{db_path}")
+
+    if pragmas:
+        @event.listens_for(engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return engine
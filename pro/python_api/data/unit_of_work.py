@@ -0,0 +1,161 @@
+"""
+Unidade de trabalho para gravações em lote (db.batch())
+
+Os métodos save_* dos bancos fazem um commit (fsync) por linha. Coletas e
+backfills chamam esses métodos em laço, e o tempo vai quase todo nos
+commits. Dentro de db.batch() os save_* continuam funcionando igual
+(inclusive devolvendo objetos com id), mas o commit só acontece a cada
+chunk_size linhas e no fim do bloco:
+
+    with db.batch(chunk_size=500):
+        for match_data in matches:
+            db.save_match(match_data)
+
+- Cada save_* roda num SAVEPOINT: uma linha com erro (capturado pelo laço
+  do chamador) é desfeita sozinha, sem perder as outras do lote
+- Exceção que sai do bloco: as linhas ainda não gravadas são desfeitas
+  (as de blocos anteriores já foram gravadas)
+- Cada gravação informa linhas e tempo
+"""
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from sqlalchemy import text
+
+
+# Linhas por commit dentro de db.batch()
+BATCH_CHUNK_SIZE = 500
+
+
+def unit_of_work(method):
+    """
+    Torna um save_* compatível com db.batch()
+
+    Fora de um lote: chamada normal (o método faz o próprio commit via
+    self.commit()); em caso de erro a sessão é desfeita e fica utilizável.
+    Dentro de um lote: a chamada roda num SAVEPOINT e o commit é adiado.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._batch is None:
+            try:
+                return method(self, *args, **kwargs)
+            except Exception:
+                self.session.rollback()
+                raise
+
+        pending = self._batch["pending"]
+        try:
+            with self.session.begin_nested():
+                result = method(self, *args, **kwargs)
+        except Exception:
+            # Linhas desfeitas pelo SAVEPOINT não contam
+            self._batch["pending"] = pending
+            raise
+
+        # Só grava fora de SAVEPOINTs (um save_* pode chamar outro)
+        if self._batch["pending"] >= self._batch["chunk_size"] and not self.session.in_nested_transaction():
+            self._flush_batch()
+
+        return result
+
+    return wrapper
+
+
+class BatchMixin:
+    """
+    db.batch() para classes de banco com self.session (SQLAlchemy + SQLite)
+
+    Os save_* devem ser decorados com @unit_of_work e chamar
+    self.commit(rows) no lugar de self.session.commit().
+    """
+
+    _batch = None
+
+    @contextmanager
+    def batch(self, chunk_size: int = BATCH_CHUNK_SIZE, verbose: bool = True):
+        """
+        Adia os commits dos save_* até chunk_size linhas (ou o fim do bloco)
+
+        Lotes aninhados entram no lote de fora.
+
+        Args:
+            chunk_size: Linhas por commit
+            verbose: Se deve mostrar linhas e tempo de cada gravação
+
+        Yields:
+            Dict com "rows" (linhas gravadas) e "flushes" (linhas e segundos
+            de cada gravação)
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+
+        # O que estiver pendente fora do lote não entra nele
+        self.session.commit()
+
+        self._batch = {
+            "chunk_size": chunk_size,
+            "verbose": verbose,
+            "pending": 0,
+            "rows": 0,
+            "flushes": []
+        }
+        batch = self._batch
+
+        try:
+            self._begin_batch_transaction()
+            yield batch
+            self._flush_batch(begin_next=False)
+        except BaseException:
+            self.session.rollback()
+            if verbose and batch["pending"]:
+                print(f"   ↩️  Lote desfeito: {batch['pending']} linhas não gravadas")
+            raise
+        finally:
+            self._batch = None
+
+    def commit(self, rows: int = 1):
+        """
+        Commit de um save_* (dentro de db.batch() só conta as linhas)
+
+        Args:
+            rows: Linhas gravadas pela operação
+        """
+        if self._batch is None:
+            self.session.commit()
+        else:
+            self._batch["pending"] += rows
+
+    def _flush_batch(self, begin_next: bool = True):
+        """Grava as linhas pendentes do lote (um commit)"""
+        batch = self._batch
+        if not batch["pending"]:
+            if not begin_next:
+                # Fecha a transação do lote (vazia)
+                self.session.commit()
+            return
+
+        started = time.perf_counter()
+        self.session.commit()
+        elapsed = time.perf_counter() - started
+
+        batch["rows"] += batch["pending"]
+        batch["flushes"].append({"rows": batch["pending"], "seconds": elapsed})
+        if batch["verbose"]:
+            print(f"   💾 Lote: {batch['pending']} linhas gravadas em {elapsed * 1000:.0f} ms")
+        batch["pending"] = 0
+
+        if begin_next:
+            self._begin_batch_transaction()
+
+    def _begin_batch_transaction(self):
+        """
+        Abre a transação do lote explicitamente
+
+        O driver sqlite3 só abre transação antes de INSERT/UPDATE/DELETE; sem
+        o BEGIN, o SAVEPOINT de cada save_* vira a transação de fora e o
+        RELEASE grava a linha na hora (um commit por linha, sem rollback).
+        """
+        self.session.execute(text("BEGIN"))
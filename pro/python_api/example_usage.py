@@ -11,10 +11,8 @@ Este script demonstra como usar o sistema completo:
 from data.database_v2 import Database, Match
 from features.api_predictions_features import APIPredictionFeatures
 from models.poisson import PoissonModel
-from models.xgboost_model import XGBoostModel
+from models.xgboost_model import XGBoostModel, find_latest_model
 from models.ensemble import EnsembleModel
-import glob
-import os
 
 
 def print_section(title):
@@ -128,9 +126,8 @@ def example_2_individual_models():
 
     # 2. XGBoost (se treinado)
     print("\n🤖 2. MODELO XGBOOST")
-    model_files = glob.glob("models/saved/xgboost_with_api_*.pkl")
-    if model_files:
-        latest_model = max(model_files, key=os.path.getctime)
+    latest_model = find_latest_model()
+    if latest_model:
         xgboost = XGBoostModel(
             model_path=latest_model,
             feature_extractor=feature_extractor,
@@ -187,9 +184,8 @@ def example_3_ensemble():
     )
 
     # Tenta carregar XGBoost
-    model_files = glob.glob("models/saved/xgboost_with_api_*.pkl")
-    if model_files:
-        latest_model = max(model_files, key=os.path.getctime)
+    latest_model = find_latest_model()
+    if latest_model:
         xgboost = XGBoostModel(
             model_path=latest_model,
             feature_extractor=feature_extractor,
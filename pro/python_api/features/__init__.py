@@ -2,5 +2,7 @@
 Features engineering para modelos de predição
 """
 from .api_predictions_features import APIPredictionFeatures
+from .team_history import RollingTeamStats
+from .feature_cache import FeatureCache
 
-__all__ = ["APIPredictionFeatures"]
+__all__ = ["APIPredictionFeatures", "RollingTeamStats", "FeatureCache"]
@@ -8,9 +8,32 @@ Estratégia: Feature Engineering (recomendado no PREDICTIONS_GUIDE.md)
 - XGBoost aprende QUANDO confiar na API
 - XGBoost aprende QUANTO peso dar a cada feature
 """
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional
 import json
 
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+# Versão do cálculo das features materializadas (tabela api_prediction_features).
+# Incrementar sempre que _extract_features mudar; o backfill refaz as linhas antigas
+API_FEATURE_SCHEMA_VERSION = 1
+
+# Predições por commit no backfill
+BACKFILL_BATCH_SIZE = 500
+
+
+@lru_cache(maxsize=4096)
+def _percentage_from_string(value: str) -> Optional[float]:
+    """Converte "45%" em 0.45 (poucos valores distintos: resultado em cache)"""
+    try:
+        # Assume que está entre 0 e 100
+        return float(value.replace("%", "").strip()) / 100
+    except ValueError:
+        return None
+
 
 class APIPredictionFeatures:
     """
@@ -24,6 +47,9 @@ class APIPredictionFeatures:
     5. Features derivadas (vantagem, confiança, etc)
     """
 
+    # Versão do cálculo (registrada pelos modelos treinados com estas features)
+    schema_version = API_FEATURE_SCHEMA_VERSION
+
     def __init__(self, database):
         """
         Args:
@@ -41,24 +67,117 @@ class APIPredictionFeatures:
         Returns:
             Dicionário com features extraídas
         """
-        # Buscar predição da API-Football no banco
-        predictions = self.db.get_predictions(match_id=match_id)
+        # Predição mais recente da API-Football (consulta indexada)
+        api_pred = self.db.get_latest_prediction(match_id, model_name="api-football")
 
-        # Filtrar apenas predições da api-football
-        api_predictions = [p for p in predictions if p.model_name == "api-football"]
-
-        if not api_predictions:
+        if not api_pred:
             # Se não há predição da API, retorna features vazias (None)
             return self._empty_features()
 
-        # Pegar a predição mais recente
-        api_pred = api_predictions[-1]
-
         # Extrair features
         features = self._extract_features(api_pred)
 
         return features
 
+    def get_features_for_matches(self, match_ids: List[Optional[int]]) -> np.ndarray:
+        """
+        Features da API-Football de várias partidas (uma consulta por bloco de IDs)
+
+        Args:
+            match_ids: IDs das partidas no banco de dados
+
+        Returns:
+            Matriz float32 (N, n_features) na ordem de get_feature_names(),
+            alinhada a match_ids; NaN onde não há valor (inclusive partidas
+            sem predição)
+        """
+        from data.database_v2 import Prediction
+
+        names = self.get_feature_names()
+        matrix = np.full((len(match_ids), len(names)), np.nan, dtype=np.float32)
+        rows = {}
+
+        # Sessão própria: o XGBoost pode rodar numa thread do ensemble
+        with Session(self.db.engine) as session:
+            latest = self.db.get_latest_prediction_features(match_ids, model_name="api-football", session=session)
+
+            # Features materializadas na versão atual: leitura direta das colunas
+            pending = {}
+            for match_id, (prediction_id, features) in latest.items():
+                if features is not None and features.schema_version == API_FEATURE_SCHEMA_VERSION:
+                    rows[match_id] = [getattr(features, name) for name in names]
+                else:
+                    pending[prediction_id] = match_id
+
+            # Predições ainda não materializadas: extrai do JSON
+            if pending:
+                for prediction in session.query(Prediction).filter(Prediction.id.in_(list(pending))):
+                    features = self._extract_features(prediction)
+                    rows[pending[prediction.id]] = [features[name] for name in names]
+
+        for n, match_id in enumerate(match_ids):
+            if match_id in rows:
+                matrix[n] = [np.nan if value is None else value for value in rows[match_id]]
+
+        return matrix
+
+    def materialize(self, predictions: List):
+        """
+        Extrai e grava as features de predições da API-Football já salvas
+
+        Chamado na ingestão (pipeline, collect_predictions.py) e no backfill,
+        para que a leitura não precise decodificar o JSON.
+
+        Args:
+            predictions: Objetos Prediction (com id) do banco de dados
+        """
+        rows = []
+        for prediction in predictions:
+            features = self._extract_features(prediction)
+            features.update({
+                "prediction_id": prediction.id,
+                "match_id": prediction.match_id,
+                "schema_version": API_FEATURE_SCHEMA_VERSION
+            })
+            rows.append(features)
+
+        self.db.save_api_prediction_features(rows)
+
+    def backfill(self, batch_size: int = BACKFILL_BATCH_SIZE, force: bool = False) -> int:
+        """
+        Materializa as features das predições que ainda não têm (ou têm de versão antiga)
+
+        Args:
+            batch_size: Predições por commit
+            force: Refaz todas as predições da API-Football
+
+        Returns:
+            Número de predições materializadas
+        """
+        from data.database_v2 import Prediction, APIPredictionFeature
+
+        query = self.db.session.query(Prediction.id).filter(Prediction.model_name == "api-football")
+
+        if not force:
+            current = select(APIPredictionFeature.prediction_id).where(
+                APIPredictionFeature.schema_version == API_FEATURE_SCHEMA_VERSION
+            )
+            query = query.filter(Prediction.id.notin_(current))
+
+        prediction_ids = [prediction_id for prediction_id, in query.order_by(Prediction.id)]
+
+        for i in range(0, len(prediction_ids), batch_size):
+            chunk = prediction_ids[i:i + batch_size]
+            self.materialize(
+                self.db.session.query(Prediction).filter(Prediction.id.in_(chunk)).all()
+            )
+            print(f"   ✓ {min(i + batch_size, len(prediction_ids))}/{len(prediction_ids)} predições")
+
+            # Libera os objetos já gravados da sessão
+            self.db.session.expunge_all()
+
+        return len(prediction_ids)
+
     def _extract_features(self, prediction) -> Dict:
         """
         Extrai features de uma predição da API-Football
@@ -238,13 +357,7 @@ class APIPredictionFeatures:
 
         # Se é string com %
         if isinstance(value, str):
-            try:
-                # Remove % e converte
-                num = float(value.replace("%", "").strip())
-                # Assume que está entre 0 e 100
-                return num / 100
-            except:
-                return None
+            return _percentage_from_string(value)
 
         return None
 
@@ -0,0 +1,263 @@
+"""
+Cache em disco da matriz de features de treino (arquivos .npy memory-mapped)
+
+Treino, avaliação e análises ad-hoc recalculavam as features de todo o
+histórico, com uma consulta de predição da API por partida. O cache guarda
+o resultado em models/cache/features:
+
+    <schema>/<snapshot>/X.npy            float32 (N, n_features)
+    <schema>/<snapshot>/y.npy            int8    (0=away_win, 1=draw, 2=home_win)
+    <schema>/<snapshot>/match_ids.npy    int64
+    <schema>/<snapshot>/seasons.npy      int32
+    <schema>/<snapshot>/match_dates.npy  datetime64[s]
+    <schema>/<snapshot>/has_api.npy      bool (partida tem predição da API-Football)
+    <schema>/<snapshot>/row_hashes.npy   uint64 (hash das linhas de origem de cada partida)
+    <schema>/current.json                snapshot em uso
+
+<schema> é o hash da versão do esquema de features (FEATURE_SCHEMA_VERSION,
+nomes das features, versão das features da API e janela das estatísticas
+móveis); <snapshot> é o hash das
+linhas de origem (partidas finalizadas + predição da API de cada uma).
+
+Os arquivos são abertos com np.load(mmap_mode="r"): dados inalterados
+carregam sem recálculo e sem cópia. Como as estatísticas de uma partida só
+dependem das anteriores, o maior prefixo (em ordem de data) com os mesmos
+hashes é reaproveitado e só as partidas seguintes (normalmente as recém
+adicionadas) são recalculadas.
+
+Uso:
+    cache = FeatureCache(db, feature_extractor)
+    data = cache.load()
+    X, y = data["X"], data["y"]
+"""
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .team_history import RollingTeamStats
+
+
+# Incrementar sempre que create_features / RollingTeamStats mudarem de cálculo
+FEATURE_SCHEMA_VERSION = 1
+
+# Diretório padrão do cache
+DEFAULT_CACHE_DIR = "models/cache/features"
+
+# Arrays de cada snapshot (nome -> dtype)
+CACHE_ARRAYS = {
+    "X": np.float32,
+    "y": np.int8,
+    "match_ids": np.int64,
+    "seasons": np.int32,
+    "match_dates": "datetime64[s]",
+    "has_api": np.bool_,
+    "row_hashes": np.uint64,
+}
+
+# Colunas da partida que entram no hash de cada linha
+_SOURCE_COLUMNS = [
+    "competition", "season", "match_date",
+    "home_team", "away_team", "home_score", "away_score",
+    "api_prediction_id", "api_prediction_created_at",
+]
+
+
+class FeatureCache:
+    """
+    Matriz de features de todas as partidas finalizadas, cacheada em disco
+    """
+
+    def __init__(
+        self,
+        database,
+        feature_extractor=None,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        window: int = 10
+    ):
+        """
+        Args:
+            database: Instância do Database (database_v2.py)
+            feature_extractor: APIPredictionFeatures (features da API-Football)
+            cache_dir: Diretório do cache
+            window: Janela das estatísticas móveis (RollingTeamStats)
+        """
+        from models.xgboost_model import XGBoostModel
+
+        self.db = database
+        self.cache_dir = cache_dir
+        self.builder = RollingTeamStats(database, window=window)
+
+        # Modelo temporário só para gerar as features (mesmo esquema do treino)
+        self.feature_model = XGBoostModel(feature_extractor=feature_extractor, use_api_features=True)
+        self.feature_names = self.feature_model.expected_feature_names()
+
+        self.schema_key = hashlib.sha1(json.dumps({
+            "version": FEATURE_SCHEMA_VERSION,
+            "feature_names": self.feature_names,
+            "api_feature_schema_version": self.feature_model.feature_schema_version(),
+            "window": window,
+        }).encode()).hexdigest()[:16]
+
+    @property
+    def schema_dir(self) -> str:
+        return os.path.join(self.cache_dir, self.schema_key)
+
+    def load(self) -> Dict:
+        """
+        Features de todas as partidas finalizadas (recalcula só o que mudou)
+
+        Returns:
+            Dicionário com os arrays de CACHE_ARRAYS (memory-mapped, somente
+            leitura), além de snapshot e recomputed (partidas recalculadas)
+        """
+        frame = self.builder.build()
+        if frame.empty:
+            return self._empty()
+
+        source = self._source_rows(frame)
+        row_hashes = pd.util.hash_pandas_object(source, index=False).to_numpy(dtype=np.uint64)
+        snapshot = hashlib.sha1(row_hashes.tobytes()).hexdigest()[:16]
+
+        current = self._current_snapshot()
+        cached = None
+        if current is not None:
+            try:
+                cached = self._open(current, recomputed=0)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Cache de features inválido ({current}), recalculando: {e}")
+
+        if cached is not None and current == snapshot:
+            return cached
+
+        # Maior prefixo com as mesmas linhas de origem
+        reused = 0
+        if cached is not None:
+            n = min(len(cached["row_hashes"]), len(row_hashes))
+            mismatch = np.flatnonzero(cached["row_hashes"][:n] != row_hashes[:n])
+            reused = int(mismatch[0]) if len(mismatch) else n
+
+        tail = frame.iloc[reused:]
+        print(f"🗃️  Cache de features: {reused} partidas reaproveitadas, {len(tail)} a calcular")
+
+        if len(tail):
+            X_tail = self.feature_model.create_feature_matrix(
+                self.builder.match_stats(tail), tail.index.tolist()
+            )
+        else:
+            X_tail = np.empty((0, len(self.feature_names)), dtype=np.float32)
+
+        arrays = {
+            "X": X_tail,
+            "y": self.builder.labels(tail),
+            "match_ids": tail.index.to_numpy(),
+            "seasons": tail["season"].fillna(tail["match_date"].dt.year).to_numpy(),
+            "match_dates": tail["match_date"].to_numpy(),
+            "has_api": (source["api_prediction_id"] >= 0).to_numpy()[reused:],
+            "row_hashes": row_hashes[reused:],
+        }
+
+        self._write(snapshot, arrays, cached, reused)
+
+        return self._open(snapshot, recomputed=len(tail))
+
+    def _source_rows(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Linhas de origem de cada partida (partida + predição da API), na ordem de frame"""
+        # Predição da API-Football mais recente de cada partida (uma única consulta)
+        latest = self.db.get_latest_predictions(model_name="api-football")
+
+        api = pd.DataFrame(
+            [(match_id, p.id, p.created_at) for match_id, p in latest.items()],
+            columns=["match_id", "api_prediction_id", "api_prediction_created_at"]
+        ).set_index("match_id")
+
+        source = frame.join(api)[_SOURCE_COLUMNS]
+        source.insert(0, "match_id", frame.index.to_numpy())
+
+        # Tipos fixos: o hash de uma linha não pode mudar por causa das outras (ex: coluna toda NaN)
+        source["season"] = source["season"].fillna(-1).astype(np.int64)
+        source["api_prediction_id"] = source["api_prediction_id"].fillna(-1).astype(np.int64)
+        source["api_prediction_created_at"] = pd.to_datetime(source["api_prediction_created_at"])
+        source["match_date"] = pd.to_datetime(source["match_date"])
+
+        return source
+
+    def _current_snapshot(self):
+        """Snapshot em uso para o esquema atual (None se não houver cache)"""
+        try:
+            with open(os.path.join(self.schema_dir, "current.json")) as f:
+                return json.load(f)["snapshot"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _empty(self) -> Dict:
+        """Resultado sem partidas (banco vazio)"""
+        data = {name: np.empty(0, dtype=dtype) for name, dtype in CACHE_ARRAYS.items()}
+        data["X"] = np.empty((0, len(self.feature_names)), dtype=np.float32)
+        data["snapshot"] = None
+        data["recomputed"] = 0
+
+        return data
+
+    def _open(self, snapshot: str, recomputed: int) -> Dict:
+        """Abre os arrays de um snapshot (memory-mapped, sem cópia)"""
+        directory = os.path.join(self.schema_dir, snapshot)
+
+        data = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in CACHE_ARRAYS
+        }
+        data["snapshot"] = snapshot
+        data["recomputed"] = recomputed
+
+        return data
+
+    def _write(self, snapshot: str, tail: Dict, cached: Dict, reused: int):
+        """
+        Grava o snapshot novo (prefixo reaproveitado + partidas recalculadas)
+
+        Os arquivos são escritos num diretório temporário e o ponteiro
+        current.json só é trocado no fim, então leitores concorrentes
+        continuam vendo o snapshot anterior até a troca.
+        """
+        final_dir = os.path.join(self.schema_dir, snapshot)
+        temp_dir = f"{final_dir}.tmp{os.getpid()}"
+        os.makedirs(temp_dir, exist_ok=True)
+
+        for name, dtype in CACHE_ARRAYS.items():
+            new_rows = np.asarray(tail[name]).astype(dtype, copy=False)
+            shape = (reused + len(new_rows),) + new_rows.shape[1:]
+
+            output = np.lib.format.open_memmap(
+                os.path.join(temp_dir, f"{name}.npy"), mode="w+", dtype=dtype, shape=shape
+            )
+            if reused:
+                output[:reused] = cached[name][:reused]
+            output[reused:] = new_rows
+            output.flush()
+            del output
+
+        previous = self._current_snapshot()
+
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.replace(temp_dir, final_dir)
+
+        pointer = os.path.join(self.schema_dir, "current.json")
+        with open(f"{pointer}.tmp", "w") as f:
+            json.dump({
+                "snapshot": snapshot,
+                "schema_version": FEATURE_SCHEMA_VERSION,
+                "feature_names": self.feature_names,
+                "n_rows": reused + len(tail["match_ids"]),
+                "updated_at": datetime.now().isoformat(),
+            }, f, indent=2)
+        os.replace(f"{pointer}.tmp", pointer)
+
+        # Snapshot anterior (leitores com mmap aberto mantêm os dados até fechar)
+        if previous and previous != snapshot:
+            shutil.rmtree(os.path.join(self.schema_dir, previous), ignore_errors=True)
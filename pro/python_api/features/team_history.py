@@ -0,0 +1,225 @@
+"""
+Estatísticas móveis dos times no momento de cada partida (sem vazamento)
+
+Substitui as estatísticas fixas usadas no treino por números reais: para
+cada partida finalizada, agrega as últimas N partidas de cada time
+ANTERIORES a ela (gols pró/contra, V/E/D, pontos por jogo) e também o
+recorte por mando (últimas N em casa do mandante, últimas N fora do
+visitante).
+
+Tudo é calculado numa única passada: as partidas são lidas uma vez,
+ordenadas por data, e as janelas móveis saem de somas acumuladas por time
+(groupby + cumsum), sem nenhuma consulta por partida.
+"""
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+# Status de partidas finalizadas (com placar)
+FINISHED_STATUSES = ("FINISHED", "FT", "AET", "PEN")
+
+# Valor usado enquanto o time não tem histórico (mesmo padrão do pipeline)
+DEFAULT_GOALS_AVG = 1.5
+
+# Colunas somadas na janela móvel de cada time
+_ROLLING_COLUMNS = ["goals_for", "goals_against", "win", "draw", "loss", "points"]
+
+# Estatísticas de cada lado, na ordem de XGBoostModel.create_features
+TEAM_STAT_NAMES = [
+    "goals_scored_avg",
+    "goals_conceded_avg",
+    "wins",
+    "draws",
+    "losses",
+    "matches_played",
+    "goals_for_total",
+    "goals_against_total",
+]
+
+
+class RollingTeamStats:
+    """
+    Constrói estatísticas point-in-time dos times para todas as partidas
+    """
+
+    def __init__(self, database, window: int = 10):
+        """
+        Args:
+            database: Instância do Database (database_v2.py)
+            window: Número de partidas anteriores na janela (N)
+        """
+        self.db = database
+        self.window = window
+
+    def build(self, competition: str = None, since=None) -> pd.DataFrame:
+        """
+        Estatísticas de casa e fora no momento de cada partida finalizada
+
+        O histórico usa todas as partidas do banco (de qualquer competição);
+        competition e since só filtram as linhas devolvidas.
+
+        Args:
+            competition: Filtra as partidas devolvidas (opcional)
+            since: Só partidas com match_date posterior (opcional)
+
+        Returns:
+            DataFrame indexado por match_id, ordenado por data, com as
+            colunas da partida (season, match_date, home_score...) e
+            home_<estatística> / away_<estatística> (ver TEAM_STAT_NAMES),
+            além de home_ppg, away_ppg e do recorte por mando:
+            home_venue_goals_scored_avg, home_venue_ppg, away_venue_...
+        """
+        matches = self._load_matches()
+        if matches.empty:
+            return matches
+
+        long = self._team_perspective(matches)
+
+        # Janela geral (últimas N de cada time) e por mando (últimas N em casa / fora)
+        overall = self._rolling(long, ["team"])
+        venue = self._rolling(long, ["team", "is_home"])
+
+        long["matches_played"] = overall["n"]
+        for column in _ROLLING_COLUMNS:
+            long[f"{column}_last"] = overall[column]
+        long["venue_matches"] = venue["n"]
+        long["venue_goals_for"] = venue["goals_for"]
+        long["venue_goals_against"] = venue["goals_against"]
+        long["venue_points"] = venue["points"]
+
+        stats = self._team_stats(long)
+
+        home = stats[long["is_home"].values].set_index("match_id").add_prefix("home_")
+        away = stats[~long["is_home"].values].set_index("match_id").add_prefix("away_")
+        frame = matches.set_index("match_id").join(home).join(away)
+
+        if competition is not None:
+            frame = frame[frame["competition"] == competition]
+        if since is not None:
+            frame = frame[frame["match_date"] > since]
+
+        return frame
+
+    def labels(self, frame: pd.DataFrame) -> np.ndarray:
+        """Labels do resultado: 0=away_win, 1=draw, 2=home_win"""
+        return np.sign(frame["home_score"] - frame["away_score"]).to_numpy().astype(np.int64) + 1
+
+    def match_stats(self, frame: pd.DataFrame) -> List[Dict]:
+        """
+        Estatísticas no formato de match_stats ({"home": {...}, "away": {...}})
+
+        Útil para XGBoostModel.create_feature_matrix, que acrescenta as
+        features da API-Football às básicas.
+        """
+        # Uma lista por coluna (sem iterar linha a linha pelo DataFrame)
+        columns = {
+            side: [frame[f"{side}_{name}"].tolist() for name in TEAM_STAT_NAMES]
+            for side in ("home", "away")
+        }
+
+        return [
+            {"home": dict(zip(TEAM_STAT_NAMES, home)), "away": dict(zip(TEAM_STAT_NAMES, away))}
+            for home, away in zip(zip(*columns["home"]), zip(*columns["away"]))
+        ]
+
+    def _load_matches(self) -> pd.DataFrame:
+        """Lê todas as partidas finalizadas numa única consulta, ordenadas por data"""
+        from data.database_v2 import Match
+
+        rows = self.db.session.query(
+            Match.id,
+            Match.competition,
+            Match.season,
+            Match.match_date,
+            Match.home_team,
+            Match.away_team,
+            Match.home_score,
+            Match.away_score
+        ).filter(
+            Match.status.in_(FINISHED_STATUSES),
+            Match.home_score.isnot(None),
+            Match.away_score.isnot(None),
+            Match.match_date.isnot(None)
+        ).order_by(Match.match_date, Match.id).all()
+
+        return pd.DataFrame(rows, columns=[
+            "match_id", "competition", "season", "match_date",
+            "home_team", "away_team", "home_score", "away_score"
+        ])
+
+    def _team_perspective(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """Duas linhas por partida (uma por time), do ponto de vista do time"""
+        home = pd.DataFrame({
+            "match_id": matches["match_id"],
+            "match_date": matches["match_date"],
+            "team": matches["home_team"],
+            "is_home": True,
+            "goals_for": matches["home_score"],
+            "goals_against": matches["away_score"],
+        })
+        away = pd.DataFrame({
+            "match_id": matches["match_id"],
+            "match_date": matches["match_date"],
+            "team": matches["away_team"],
+            "is_home": False,
+            "goals_for": matches["away_score"],
+            "goals_against": matches["home_score"],
+        })
+
+        long = pd.concat([home, away], ignore_index=True)
+        long["win"] = (long["goals_for"] > long["goals_against"]).astype(int)
+        long["draw"] = (long["goals_for"] == long["goals_against"]).astype(int)
+        long["loss"] = (long["goals_for"] < long["goals_against"]).astype(int)
+        long["points"] = long["win"] * 3 + long["draw"]
+
+        return long.sort_values(["match_date", "match_id", "is_home"], ignore_index=True)
+
+    def _rolling(self, long: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+        """
+        Somas das últimas N partidas de cada grupo, excluindo a partida atual
+
+        soma(jogos k-N .. k-1) = acumulada(k-1) - acumulada(k-N-1), com as
+        acumuladas deslocadas dentro de cada grupo (nunca olha o futuro).
+        """
+        groups = long.groupby(keys, sort=False)
+        cumulative = groups[_ROLLING_COLUMNS].cumsum()
+        position = groups.cumcount()
+
+        # Acumulada até a partida anterior e até N+1 partidas atrás
+        before = cumulative.groupby([long[key] for key in keys], sort=False).shift(1, fill_value=0)
+        window_start = cumulative.groupby([long[key] for key in keys], sort=False).shift(self.window + 1, fill_value=0)
+
+        sums = before - window_start
+        sums["n"] = np.minimum(position, self.window)
+
+        return sums
+
+    def _team_stats(self, long: pd.DataFrame) -> pd.DataFrame:
+        """Converte as somas móveis nas estatísticas de cada time"""
+        played = long["matches_played"]
+        venue_played = long["venue_matches"]
+
+        stats = pd.DataFrame({
+            "match_id": long["match_id"],
+            "goals_scored_avg": np.where(played > 0, long["goals_for_last"] / played.clip(lower=1), DEFAULT_GOALS_AVG),
+            "goals_conceded_avg": np.where(played > 0, long["goals_against_last"] / played.clip(lower=1), DEFAULT_GOALS_AVG),
+            "wins": long["win_last"],
+            "draws": long["draw_last"],
+            "losses": long["loss_last"],
+            "matches_played": played,
+            "goals_for_total": long["goals_for_last"],
+            "goals_against_total": long["goals_against_last"],
+            "ppg": long["points_last"] / played.clip(lower=1),
+            "venue_goals_scored_avg": np.where(
+                venue_played > 0, long["venue_goals_for"] / venue_played.clip(lower=1), DEFAULT_GOALS_AVG
+            ),
+            "venue_goals_conceded_avg": np.where(
+                venue_played > 0, long["venue_goals_against"] / venue_played.clip(lower=1), DEFAULT_GOALS_AVG
+            ),
+            "venue_ppg": long["venue_points"] / venue_played.clip(lower=1),
+            "venue_matches": venue_played,
+        })
+
+        return stats
@@ -0,0 +1,94 @@
+"""
+Ajusta as forças dos times (Dixon-Coles) a partir das partidas do banco
+
+Lê as partidas finalizadas de database_v2 (tabela matches), ajusta
+ataque/defesa/vantagem de casa de todos os times de cada competição
+numa única otimização e salva o resultado na tabela team_strengths.
+
+Depois disso, as predições podem usar as forças salvas sem nenhuma
+chamada à API:
+    model = DixonColesModel.load_from_database(db, "Premier League")
+    model.predict_match("Arsenal", "Chelsea")
+
+Uso:
+    python fit_team_strengths.py "Premier League" "La Liga"
+    python fit_team_strengths.py --all --time-decay 0.0019
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data.database_v2 import Database, Match
+from models.dixon_coles import DixonColesModel, FINISHED_STATUSES
+
+
+def fit_competition(db: Database, competition: str, time_decay: float, season: int = None) -> bool:
+    """
+    Ajusta e salva as forças de uma competição
+
+    Returns:
+        True se ajustou com sucesso
+    """
+    print(f"\n🏆 {competition}")
+
+    model = DixonColesModel(time_decay=time_decay)
+
+    try:
+        metrics = model.fit_from_database(db, competition, season=season)
+    except ValueError as e:
+        print(f"   ⚠️  {e}")
+        return False
+
+    model.save_to_database(db, competition)
+
+    status = "✓" if metrics["converged"] else "⚠️"
+    print(f"   {status} {metrics['n_matches']} partidas, {metrics['n_teams']} times "
+          f"({metrics['iterations']} iterações)")
+    print(f"   Vantagem de casa: {metrics['home_advantage']:.3f} | ρ: {metrics['rho']:.3f}")
+
+    top = list(model.get_strengths().items())[:3]
+    for team, strength in top:
+        print(f"   • {team}: ataque {strength['attack']:+.3f}, defesa {strength['defense']:+.3f}")
+
+    return True
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Ajusta forças dos times (Dixon-Coles)")
+    parser.add_argument("competitions", nargs="*", help="Competições (coluna Match.competition)")
+    parser.add_argument("--all", action="store_true", help="Ajusta todas as competições do banco")
+    parser.add_argument("--season", type=int, default=None, help="Filtra por temporada")
+    parser.add_argument("--time-decay", type=float, default=0.0, help="ξ do peso exp(-ξ * dias)")
+    parser.add_argument("--db", default="database/betting_v2.db", help="Caminho do banco")
+
+    args = parser.parse_args()
+
+    db = Database(args.db)
+
+    competitions = args.competitions
+    if args.all:
+        rows = db.session.query(Match.competition).filter(
+            Match.status.in_(FINISHED_STATUSES)
+        ).distinct().all()
+        competitions = [row[0] for row in rows if row[0]]
+
+    if not competitions:
+        print("❌ Informe as competições ou use --all")
+        db.close()
+        return
+
+    print("=" * 70)
+    print("AJUSTE DE FORÇAS DOS TIMES (DIXON-COLES)")
+    print("=" * 70)
+
+    fitted = sum(fit_competition(db, c, args.time_decay, args.season) for c in competitions)
+
+    print(f"\n✅ {fitted}/{len(competitions)} competições ajustadas")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
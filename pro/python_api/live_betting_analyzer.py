@@ -21,8 +21,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from data.api_football_collector import APIFootballCollector
 from data.database_v2 import Database
 from models.poisson import PoissonModel
-from models.xgboost_model import XGBoostModel
+from models.xgboost_model import XGBoostModel, find_latest_model
 from models.ensemble import EnsembleModel
+from models.prediction_cache import PredictionCache, DEFAULT_CACHE_PATH
 from features.api_predictions_features import APIPredictionFeatures
 from analysis.value_analysis import ValueAnalyzer
 from dotenv import load_dotenv
@@ -314,10 +315,8 @@ def main():
     # XGBoost (se disponível)
     xgboost = None
     try:
-        import glob
-        model_files = glob.glob("models/saved/xgboost_with_api_*.pkl")
-        if model_files:
-            latest_model = max(model_files, key=os.path.getctime)
+        latest_model = find_latest_model()
+        if latest_model:
             feature_extractor = APIPredictionFeatures(db)
             xgboost = XGBoostModel(
                 model_path=latest_model,
@@ -331,7 +330,11 @@ def main():
         print(f"   ⚠️  XGBoost não disponível: {e}")
 
     # Ensemble
-    ensemble = EnsembleModel(database=db, include_api_predictions=False)
+    ensemble = EnsembleModel(
+        database=db,
+        include_api_predictions=False,
+        cache=PredictionCache(db_path=DEFAULT_CACHE_PATH)
+    )
     if xgboost:
         ensemble.add_model("xgboost", xgboost, weight=0.3)
     print("   ✓ Ensemble")
@@ -0,0 +1,98 @@
+"""
+Gerencia o registro de modelos (versões, métricas e versão ativa)
+
+A API e o pipeline consultam a versão ativa periodicamente e trocam o
+modelo em memória sem reiniciar, então ativar uma versão aqui basta para
+colocá-la (ou tirá-la) de produção.
+
+Uso:
+    python manage_models.py list
+    python manage_models.py register models/saved/xgboost_with_api_X.ubj --activate
+    python manage_models.py activate 3
+    python manage_models.py export models/saved/xgboost_with_api_X.ubj
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data.database_v2 import Database
+from models.registry import ModelRegistry, DEFAULT_MODEL_NAME
+from models.xgboost_model import XGBoostModel, trees_path
+
+
+def list_versions(registry: ModelRegistry):
+    """Mostra as versões registradas"""
+    versions = registry.versions()
+
+    if not versions:
+        print("ℹ️  Nenhuma versão registrada")
+        return
+
+    print(f"\n📦 {registry.model_name}")
+    for model_version in versions:
+        marker = "⭐" if model_version.is_active else "  "
+        metrics = ", ".join(
+            f"{name}={value:.3f}" if isinstance(value, float) else f"{name}={value}"
+            for name, value in (model_version.metrics or {}).items()
+        )
+        print(f"   {marker} v{model_version.version}  {model_version.created_at:%Y-%m-%d %H:%M}  "
+              f"{model_version.path}  {metrics}")
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Registro de modelos")
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME, help="Nome do modelo no registro")
+    parser.add_argument("--db", default="database/betting_v2.db", help="Caminho do banco")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="Lista as versões")
+
+    register_parser = subparsers.add_parser("register", help="Registra um modelo salvo")
+    register_parser.add_argument("path", help="Artefato do modelo (.ubj/.json/.pkl)")
+    register_parser.add_argument("--activate", action="store_true", help="Torna a nova versão a ativa")
+
+    activate_parser = subparsers.add_parser("activate", help="Ativa uma versão")
+    activate_parser.add_argument("version", type=int)
+
+    export_parser = subparsers.add_parser("export", help="Exporta as árvores para o avaliador NumPy")
+    export_parser.add_argument("path", help="Artefato do modelo (.ubj/.json)")
+
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    registry = ModelRegistry(db, model_name=args.model)
+
+    try:
+        if args.command == "list":
+            list_versions(registry)
+
+        elif args.command == "register":
+            if not os.path.exists(args.path):
+                print(f"❌ Arquivo não encontrado: {args.path}")
+                return
+            version = registry.register(args.path, activate=args.activate)
+            print(f"✅ {args.path} registrado como v{version}" + (" (ativa)" if args.activate else ""))
+
+        elif args.command == "activate":
+            registry.activate(args.version)
+            print(f"✅ v{args.version} ativada (processos em execução trocam no próximo poll)")
+
+        elif args.command == "export":
+            if not os.path.exists(args.path):
+                print(f"❌ Arquivo não encontrado: {args.path}")
+                return
+            XGBoostModel(model_path=args.path).export_trees(args.path)
+            print(f"✅ Árvores exportadas: {trees_path(args.path)}")
+
+    except ValueError as e:
+        print(f"❌ {e}")
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """
 Módulos de modelos de predição
 """
-from .poisson import PoissonModel
+from .poisson import PoissonModel, MarketLadder
+from .dixon_coles import DixonColesModel
 
-__all__ = ['PoissonModel']
+__all__ = ['PoissonModel', 'MarketLadder', 'DixonColesModel']
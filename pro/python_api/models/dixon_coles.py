@@ -0,0 +1,351 @@
+"""
+Ajuste de força dos times por máxima verossimilhança (Dixon-Coles)
+
+Modelo:
+    gols_casa ~ Poisson(λ),  log λ = vantagem_casa + ataque[casa] + defesa[fora]
+    gols_fora ~ Poisson(μ),  log μ = ataque[fora] + defesa[casa]
+
+com a correção τ(ρ) de Dixon & Coles (1997) para placares baixos
+(0-0, 1-0, 0-1, 1-1) e peso exponencial por data opcional: w = exp(-ξ * dias).
+
+Todos os times de uma competição são ajustados de uma vez, com a
+verossimilhança e o gradiente calculados de forma vetorizada (NumPy).
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+
+from .poisson import PoissonModel
+
+
+# Status que indicam partida finalizada (football-data.org e API-Football)
+FINISHED_STATUSES = ("FINISHED", "FT", "AET", "PEN")
+
+
+class DixonColesModel:
+    """
+    Forças de ataque/defesa por time + vantagem de casa, ajustadas por MLE
+
+    Uso típico:
+        model = DixonColesModel(time_decay=0.0019)
+        model.fit_from_database(db, "Premier League")
+        model.save_to_database(db, "Premier League")
+
+        # Depois, em qualquer processo (sem chamadas à API):
+        model = DixonColesModel.load_from_database(db, "Premier League")
+        prediction = model.predict_match("Arsenal", "Chelsea")
+    """
+
+    def __init__(self, time_decay: float = 0.0, use_rho: bool = True):
+        """
+        Args:
+            time_decay: ξ do peso exp(-ξ * dias) (0 = todas as partidas com peso igual).
+                Ex: 0.0019 dá meia-vida de ~1 ano.
+            use_rho: Se deve ajustar a correção ρ para placares baixos
+        """
+        self.time_decay = time_decay
+        self.use_rho = use_rho
+
+        self.teams: List[str] = []
+        self.team_index: Dict[str, int] = {}
+        self.attack = np.zeros(0)
+        self.defense = np.zeros(0)
+        self.home_advantage = 0.0
+        self.rho = 0.0
+        self.n_matches: Dict[str, int] = {}
+        self.is_trained = False
+
+    def fit(
+        self,
+        home_teams: List[str],
+        away_teams: List[str],
+        home_goals,
+        away_goals,
+        match_dates: Optional[List[datetime]] = None,
+        reference_date: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Ajusta os parâmetros de todos os times de uma vez
+
+        Args:
+            home_teams: Time da casa de cada partida
+            away_teams: Time visitante de cada partida
+            home_goals: Gols da casa de cada partida
+            away_goals: Gols do visitante de cada partida
+            match_dates: Datas das partidas (necessário para time_decay)
+            reference_date: Data de referência do decaimento (padrão: partida mais recente)
+
+        Returns:
+            Métricas do ajuste
+        """
+        self.teams = sorted(set(home_teams) | set(away_teams))
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        n_teams = len(self.teams)
+
+        home_idx = np.array([self.team_index[team] for team in home_teams])
+        away_idx = np.array([self.team_index[team] for team in away_teams])
+        x = np.asarray(home_goals, dtype=float)
+        y = np.asarray(away_goals, dtype=float)
+
+        weights = self._time_weights(match_dates, reference_date, len(x))
+
+        counts = np.bincount(home_idx, minlength=n_teams) + np.bincount(away_idx, minlength=n_teams)
+        self.n_matches = {team: int(counts[i]) for i, team in enumerate(self.teams)}
+
+        # Máscaras dos placares baixos corrigidos por τ
+        low_00 = (x == 0) & (y == 0)
+        low_01 = (x == 0) & (y == 1)
+        low_10 = (x == 1) & (y == 0)
+        low_11 = (x == 1) & (y == 1)
+
+        def neg_log_likelihood(params: np.ndarray) -> Tuple[float, np.ndarray]:
+            attack = params[:n_teams]
+            defense = params[n_teams:2 * n_teams]
+            home_adv = params[-2]
+            rho = params[-1]
+
+            lam = np.exp(home_adv + attack[home_idx] + defense[away_idx])
+            mu = np.exp(attack[away_idx] + defense[home_idx])
+
+            # τ e suas derivadas em relação a log λ, log μ e ρ
+            tau = np.ones_like(lam)
+            tau[low_00] = 1 - lam[low_00] * mu[low_00] * rho
+            tau[low_01] = 1 + lam[low_01] * rho
+            tau[low_10] = 1 + mu[low_10] * rho
+            tau[low_11] = 1 - rho
+            tau = np.maximum(tau, 1e-10)
+
+            dtau_lam = np.zeros_like(lam)
+            dtau_mu = np.zeros_like(lam)
+            dtau_rho = np.zeros_like(lam)
+            dtau_lam[low_00] = -lam[low_00] * mu[low_00] * rho
+            dtau_mu[low_00] = -lam[low_00] * mu[low_00] * rho
+            dtau_rho[low_00] = -lam[low_00] * mu[low_00]
+            dtau_lam[low_01] = lam[low_01] * rho
+            dtau_rho[low_01] = lam[low_01]
+            dtau_mu[low_10] = mu[low_10] * rho
+            dtau_rho[low_10] = mu[low_10]
+            dtau_rho[low_11] = -1.0
+
+            # Log-verossimilhança ponderada (sem os termos constantes log k!)
+            log_lik = weights * (np.log(tau) + x * np.log(lam) - lam + y * np.log(mu) - mu)
+
+            g_lam = weights * (x - lam + dtau_lam / tau)
+            g_mu = weights * (y - mu + dtau_mu / tau)
+
+            grad = np.zeros_like(params)
+            grad[:n_teams] = np.bincount(home_idx, g_lam, n_teams) + np.bincount(away_idx, g_mu, n_teams)
+            grad[n_teams:2 * n_teams] = np.bincount(away_idx, g_lam, n_teams) + np.bincount(home_idx, g_mu, n_teams)
+            grad[-2] = g_lam.sum()
+            grad[-1] = (weights * dtau_rho / tau).sum()
+
+            # Identificabilidade: soma dos ataques = 0 (penalidade quadrática)
+            penalty = attack.sum()
+            value = -log_lik.sum() + penalty ** 2
+            grad = -grad
+            grad[:n_teams] += 2 * penalty
+
+            return value, grad
+
+        initial = np.zeros(2 * n_teams + 2)
+        initial[-2] = 0.25
+        bounds = [(None, None)] * (2 * n_teams + 1)
+        bounds.append((-0.2, 0.2) if self.use_rho else (0.0, 0.0))
+
+        result = minimize(neg_log_likelihood, initial, jac=True, method="L-BFGS-B", bounds=bounds)
+
+        self.attack = result.x[:n_teams]
+        self.defense = result.x[n_teams:2 * n_teams]
+        self.home_advantage = float(result.x[-2])
+        self.rho = float(result.x[-1])
+        self.is_trained = True
+
+        return {
+            "n_matches": len(x),
+            "n_teams": n_teams,
+            "neg_log_likelihood": float(result.fun),
+            "converged": bool(result.success),
+            "iterations": int(result.nit),
+            "home_advantage": self.home_advantage,
+            "rho": self.rho
+        }
+
+    def fit_from_database(
+        self,
+        db,
+        competition: str,
+        season: int = None,
+        reference_date: datetime = None
+    ) -> Dict:
+        """
+        Ajusta usando as partidas finalizadas da tabela matches (database_v2)
+
+        Args:
+            db: Instância do Database (database_v2.py)
+            competition: Competição (coluna Match.competition)
+            season: Temporada (opcional, padrão: todas)
+            reference_date: Data de referência do decaimento (padrão: partida mais recente)
+
+        Returns:
+            Métricas do ajuste
+        """
+        from data.database_v2 import Match
+
+        query = db.session.query(
+            Match.home_team, Match.away_team, Match.home_score, Match.away_score, Match.match_date
+        ).filter(
+            Match.competition == competition,
+            Match.status.in_(FINISHED_STATUSES),
+            Match.home_score.isnot(None),
+            Match.away_score.isnot(None)
+        )
+        if season:
+            query = query.filter(Match.season == season)
+
+        rows = query.all()
+        if not rows:
+            raise ValueError(f"Nenhuma partida finalizada para {competition}")
+
+        home_teams, away_teams, home_goals, away_goals, match_dates = zip(*rows)
+
+        return self.fit(
+            home_teams, away_teams, home_goals, away_goals,
+            match_dates=match_dates, reference_date=reference_date
+        )
+
+    def save_to_database(self, db, competition: str):
+        """Persiste os parâmetros ajustados na tabela team_strengths"""
+        if not self.is_trained:
+            raise Exception("Modelo não treinado")
+
+        db.save_team_strengths(competition, [
+            {
+                "team": team,
+                "attack": float(self.attack[i]),
+                "defense": float(self.defense[i]),
+                "home_advantage": self.home_advantage,
+                "rho": self.rho,
+                "n_matches": self.n_matches.get(team, 0),
+                "time_decay": self.time_decay
+            }
+            for i, team in enumerate(self.teams)
+        ])
+
+    @classmethod
+    def load_from_database(cls, db, competition: str) -> "DixonColesModel":
+        """
+        Carrega parâmetros já ajustados (sem reajustar)
+
+        Raises:
+            ValueError: Se não houver forças salvas para a competição
+        """
+        rows = db.get_team_strengths(competition)
+        if not rows:
+            raise ValueError(f"Nenhuma força ajustada para {competition}")
+
+        model = cls(time_decay=rows[0].time_decay or 0.0)
+        model.teams = [row.team for row in rows]
+        model.team_index = {team: i for i, team in enumerate(model.teams)}
+        model.attack = np.array([row.attack for row in rows])
+        model.defense = np.array([row.defense for row in rows])
+        model.home_advantage = rows[0].home_advantage
+        model.rho = rows[0].rho
+        model.n_matches = {row.team: row.n_matches for row in rows}
+        model.is_trained = True
+
+        return model
+
+    def expected_goals(self, home_team: str, away_team: str) -> Tuple[float, float]:
+        """
+        Gols esperados (λ, μ) de uma partida
+
+        Raises:
+            KeyError: Se algum dos times não foi ajustado
+        """
+        home = self.team_index[home_team]
+        away = self.team_index[away_team]
+
+        home_lambda = np.exp(self.home_advantage + self.attack[home] + self.defense[away])
+        away_lambda = np.exp(self.attack[away] + self.defense[home])
+
+        return float(home_lambda), float(away_lambda)
+
+    def predict_match(self, home_team: str, away_team: str, poisson: PoissonModel = None) -> Dict:
+        """
+        Predição de todos os mercados a partir das forças ajustadas
+
+        A matriz de placares recebe a correção τ(λ, μ, ρ) ajustada, então 1X2,
+        over/under, ambos marcam e placar mais provável refletem ρ.
+
+        Args:
+            home_team: Nome do time da casa
+            away_team: Nome do time visitante
+            poisson: PoissonModel a reutilizar (opcional)
+
+        Returns:
+            Mesmo formato de PoissonModel.predict_match
+        """
+        home_lambda, away_lambda = self.expected_goals(home_team, away_team)
+        prediction = (poisson or PoissonModel()).predict_lambdas(home_lambda, away_lambda, rho=self.rho)
+        prediction["model"] = "Dixon-Coles (MLE)"
+
+        return prediction
+
+    def get_strengths(self) -> Dict:
+        """Retorna {time: {"attack": ..., "defense": ...}} ordenado por ataque"""
+        order = np.argsort(-self.attack)
+        return {
+            self.teams[i]: {
+                "attack": round(float(self.attack[i]), 3),
+                "defense": round(float(self.defense[i]), 3)
+            }
+            for i in order
+        }
+
+    def _time_weights(self, match_dates, reference_date, n_matches: int) -> np.ndarray:
+        """Pesos exp(-ξ * dias desde a partida)"""
+        if not self.time_decay or match_dates is None:
+            return np.ones(n_matches)
+
+        dates = np.array(match_dates, dtype="datetime64[s]")
+        reference = np.datetime64(reference_date, "s") if reference_date else dates.max()
+        days = (reference - dates).astype(float) / 86400
+
+        return np.exp(-self.time_decay * np.maximum(days, 0))
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    print("=== Modelo Dixon-Coles - Exemplo ===\n")
+
+    # Liga sintética com forças conhecidas
+    rng = np.random.default_rng(42)
+    teams = [f"Time {i}" for i in range(20)]
+    true_attack = rng.normal(0, 0.3, len(teams))
+    true_attack -= true_attack.mean()
+    true_defense = rng.normal(0, 0.3, len(teams))
+
+    home_teams, away_teams, home_goals, away_goals = [], [], [], []
+    for _ in range(2):
+        for h in range(len(teams)):
+            for a in range(len(teams)):
+                if h == a:
+                    continue
+                home_teams.append(teams[h])
+                away_teams.append(teams[a])
+                home_goals.append(rng.poisson(np.exp(0.25 + true_attack[h] + true_defense[a])))
+                away_goals.append(rng.poisson(np.exp(true_attack[a] + true_defense[h])))
+
+    model = DixonColesModel()
+    metrics = model.fit(home_teams, away_teams, home_goals, away_goals)
+
+    print(f"Partidas: {metrics['n_matches']} | Times: {metrics['n_teams']}")
+    print(f"Convergiu: {metrics['converged']} ({metrics['iterations']} iterações)")
+    print(f"Vantagem de casa: {metrics['home_advantage']:.3f} (real: 0.250)")
+    fitted_attack = model.attack[[model.team_index[team] for team in teams]]
+    print(f"Erro médio do ataque: {np.abs(fitted_attack - true_attack).mean():.3f}")
+
+    prediction = model.predict_match("Time 0", "Time 1")
+    print(f"\nTime 0 vs Time 1: {prediction['result']}")
@@ -1,19 +1,56 @@
 """
 Sistema Ensemble - Combina múltiplos modelos de predição
 NOVO: Suporta predições da API-Football!
+
+Com concurrent=True os membros rodam em paralelo num executor compartilhado,
+cada um com seu prazo: membros lentos ou com erro são descartados (os pesos
+são renormalizados entre os que responderam) e a latência de cada membro
+vem em "members" no resultado. A latência total fica limitada pelo maior
+prazo, e não pela soma dos membros. Membros que não são thread-safe vão em
+serialized (uma chamada por vez; a espera pelo lock não conta no prazo).
 """
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from functools import partial
 from typing import Dict, List, Optional
 import numpy as np
+from sqlalchemy.orm import Session
 from .poisson import PoissonModel
+from .prediction_cache import PredictionCache, cache_key
 from .xgboost_model import XGBoostModel
 
 
+# Prazo padrão (segundos) de cada membro no modo concorrente
+DEFAULT_MEMBER_TIMEOUT = 2.0
+
+# Threads do executor compartilhado entre os ensembles do processo
+EXECUTOR_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """Executor de threads compartilhado (criado no primeiro uso)"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="ensemble")
+
+    return _executor
+
+
 class APIFootballModel:
     """
     Wrapper para predições da API-Football
     Permite usar predições da API como um "modelo" no ensemble
     """
 
+    # Versão da conversão das predições (entra na chave do cache de predições)
+    prediction_version = 1
+
     def __init__(self, database):
         """
         Args:
@@ -32,17 +69,37 @@ class APIFootballModel:
         Returns:
             Predição no formato padrão, ou None se não houver
         """
-        predictions = self.db.get_predictions(match_id=match_id)
-
-        # Filtrar apenas predições da api-football
-        api_predictions = [p for p in predictions if p.model_name == "api-football"]
+        # Sessão própria: no modo concorrente do ensemble esta chamada roda
+        # numa thread do executor, e a sessão do Database não é thread-safe
+        with Session(self.db.engine) as session:
+            api_pred = self.db.get_latest_prediction(match_id, session=session)
 
-        if not api_predictions:
+        if not api_pred:
             return None
 
-        # Pegar a predição mais recente
-        api_pred = api_predictions[-1]
+        return self._to_prediction(api_pred)
+
+    def predict_many(self, match_ids: List[Optional[int]]) -> List[Optional[Dict]]:
+        """
+        Predições da API-Football de várias partidas (uma consulta por bloco)
+
+        Args:
+            match_ids: IDs das partidas no banco de dados
+
+        Returns:
+            Predições no formato padrão, alinhadas a match_ids (None se não houver)
+        """
+        with Session(self.db.engine) as session:
+            latest = self.db.get_latest_predictions(match_ids, session=session)
+
+        return [
+            self._to_prediction(latest[match_id]) if match_id in latest else None
+            for match_id in match_ids
+        ]
 
+    @staticmethod
+    def _to_prediction(api_pred) -> Dict:
+        """Converte uma linha Prediction da API-Football no formato padrão"""
         return {
             "model": "API-Football",
             "result": {
@@ -72,7 +129,14 @@ class EnsembleModel:
         weights: Dict[str, float] = None,
         strategy: str = "weighted_average",
         database = None,
-        include_api_predictions: bool = False
+        include_api_predictions: bool = False,
+        concurrent: bool = False,
+        timeouts: Dict[str, float] = None,
+        default_timeout: float = DEFAULT_MEMBER_TIMEOUT,
+        required: List[str] = None,
+        executor: ThreadPoolExecutor = None,
+        cache: PredictionCache = None,
+        serialized: List[str] = None
     ):
         """
         Inicializa o ensemble
@@ -83,12 +147,29 @@ class EnsembleModel:
             strategy: Estratégia de combinação
             database: Instância do Database (para buscar predições da API)
             include_api_predictions: Se deve incluir predições da API-Football
+            concurrent: Se deve chamar os membros em paralelo, com prazos
+            timeouts: Prazo (segundos) por membro {nome: prazo}
+            default_timeout: Prazo dos membros sem entrada em timeouts
+            required: Membros obrigatórios (sem eles a predição falha)
+            executor: Executor próprio (padrão: shared_executor())
+            cache: Cache de predições (ver prediction_cache.py); None = sem cache
+            serialized: Membros que não são thread-safe (uma chamada por vez no modo concorrente)
         """
         self.models = models or {}
         self.weights = weights or {}
         self.strategy = strategy
         self.database = database
         self.include_api_predictions = include_api_predictions
+        self.concurrent = concurrent
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout
+        self.required = list(required or [])
+        self.executor = executor
+        self.cache = cache
+
+        # Só os membros em serialized têm uma chamada por vez (chamadas
+        # descartadas por prazo continuam rodando e seguram o lock)
+        self._member_locks = {name: threading.Lock() for name in serialized or []}
 
         # Modelos padrão
         if not self.models:
@@ -127,51 +208,68 @@ class EnsembleModel:
         if total > 0:
             self.weights = {k: v / total for k, v in self.weights.items()}
 
-    def predict(self, match_stats: Dict, match_id: int = None) -> Dict:
+    def predict(
+        self,
+        match_stats: Dict,
+        match_id: int = None,
+        model_predictions: Dict[str, Dict] = None
+    ) -> Dict:
         """
         Faz predição combinada de todos os modelos
 
         Args:
             match_stats: Estatísticas da partida
             match_id: ID da partida (necessário para API-Football e features)
+            model_predictions: Predições já calculadas {nome: predição}
+                (ex: de XGBoostModel.predict_batch), usadas no lugar de
+                chamar o modelo de novo
 
         Returns:
-            Predições combinadas
+            Predições combinadas ("cached": True quando vêm do cache, sem
+            o relatório "members" de latência)
         """
+        # Predições já calculadas por fora não passam pelo cache
+        key = None
+        if self.cache is not None and not model_predictions:
+            key = self.prediction_key(match_stats, match_id)
+            cached = self.cache.get(key)
+            if cached is not None:
+                # Sem "members": a latência medida na hora não vale para uma resposta do cache
+                cached["cached"] = True
+                return cached
+
         predictions = {}
+        members_report = None
+
+        if self.concurrent:
+            # Membros em paralelo, cada um com seu prazo
+            calls = {
+                name: partial(self._member_predict, name, model, match_stats, match_id)
+                for name, model in self.models.items()
+                if not (model_predictions and name in model_predictions)
+            }
+            results, members_report = self._fan_out(calls)
 
-        # Coleta predições de cada modelo
-        for name, model in self.models.items():
-            try:
-                if name == "poisson":
-                    pred = model.predict_match(
-                        home_attack=match_stats["home"]["goals_scored_avg"],
-                        away_attack=match_stats["away"]["goals_scored_avg"],
-                        home_defense=match_stats["home"].get("goals_conceded_avg"),
-                        away_defense=match_stats["away"].get("goals_conceded_avg")
-                    )
-                    predictions[name] = pred
+            for name in self.models:
+                if model_predictions and name in model_predictions:
+                    predictions[name] = model_predictions[name]
+                elif results.get(name):
+                    predictions[name] = results[name]
 
-                elif name == "xgboost":
-                    if model.is_trained:
-                        # Passa match_id para XGBoost poder usar features da API
-                        pred = model.predict(match_stats, match_id=match_id)
+        else:
+            # Coleta predições de cada modelo
+            for name, model in self.models.items():
+                if model_predictions and name in model_predictions:
+                    predictions[name] = model_predictions[name]
+                    continue
+
+                try:
+                    pred = self._member_predict(name, model, match_stats, match_id)
+                    if pred:
                         predictions[name] = pred
-                    else:
-                        print(f"Modelo {name} não treinado, pulando...")
 
-                elif name == "api-football":
-                    if match_id:
-                        pred = model.predict(match_id)
-                        if pred:
-                            predictions[name] = pred
-                        else:
-                            print(f"Predição da API-Football não disponível para match_id={match_id}")
-                    else:
-                        print("match_id necessário para buscar predições da API-Football")
-
-            except Exception as e:
-                print(f"Erro ao obter predição de {name}: {e}")
+                except Exception as e:
+                    print(f"Erro ao obter predição de {name}: {e}")
 
         if not predictions:
             raise Exception("Nenhum modelo disponível para predição")
@@ -189,6 +287,526 @@ class EnsembleModel:
         combined["models_used"] = list(predictions.keys())
         combined["strategy"] = self.strategy
 
+        if members_report is not None:
+            combined["members"] = members_report
+
+        # Resultado degradado (membro com prazo estourado ou erro) não vai para o cache
+        degraded = members_report and any(
+            report["status"] in ("timeout", "error") for report in members_report.values()
+        )
+        if key is not None and not degraded:
+            self.cache.put(key, {name: value for name, value in combined.items() if name != "members"})
+
+        return combined
+
+    def prediction_key(self, match_stats: Dict, match_id: int = None, namespace: str = "ensemble.predict") -> str:
+        """
+        Chave de cache de uma partida
+
+        Muda sempre que muda qualquer coisa que determina a predição: as
+        estatísticas, a predição da API-Football da partida, os pesos, a
+        estratégia ou a versão de algum membro.
+
+        Args:
+            match_stats: Estatísticas da partida
+            match_id: ID da partida
+            namespace: Separa chaves de chamadores diferentes (ex: pipeline)
+        """
+        return self._prediction_key(
+            match_stats, match_id, namespace, self._api_prediction_version(match_id), self._member_versions()
+        )
+
+    def prediction_keys(
+        self,
+        matches_stats: List[Dict],
+        match_ids: List[Optional[int]],
+        namespace: str = "ensemble.predict"
+    ) -> List[str]:
+        """
+        Chaves de cache de N partidas (mesmas de prediction_key)
+
+        As versões das predições da API-Football são buscadas numa única
+        pré-carga, em vez de uma consulta por partida.
+        """
+        api_versions = {}
+        if self.database and any(match_ids):
+            with Session(self.database.engine) as session:
+                latest = self.database.get_latest_predictions(
+                    [match_id for match_id in match_ids if match_id], session=session
+                )
+                api_versions = {match_id: prediction.id for match_id, prediction in latest.items()}
+
+        members = self._member_versions()
+
+        return [
+            self._prediction_key(match_stats, match_id, namespace, api_versions.get(match_id), members)
+            for match_stats, match_id in zip(matches_stats, match_ids)
+        ]
+
+    def _prediction_key(
+        self,
+        match_stats: Dict,
+        match_id: Optional[int],
+        namespace: str,
+        api_prediction_version: Optional[int],
+        members: Dict
+    ) -> str:
+        """Chave de cache com as versões já resolvidas (ver prediction_key)"""
+        return cache_key({
+            "namespace": namespace,
+            "match_stats": match_stats,
+            "match_id": match_id,
+            "api_prediction_version": api_prediction_version,
+            "weights": self.weights,
+            "strategy": self.strategy,
+            "members": members
+        })
+
+    def _member_versions(self) -> Dict:
+        """Versão de cada membro {nome: versão}"""
+        return {name: self._member_version(model) for name, model in self.models.items()}
+
+    def _api_prediction_version(self, match_id: int = None) -> Optional[int]:
+        """ID da predição da API-Football mais recente da partida (None se não houver)"""
+        if not (self.database and match_id):
+            return None
+
+        with Session(self.database.engine) as session:
+            latest = self.database.get_latest_prediction(match_id, session=session)
+            return latest.id if latest else None
+
+    def _member_version(self, model) -> Dict:
+        """Identificação da versão de um membro (cálculo, configuração, modelo carregado, treino)"""
+        version = {"class": type(model).__name__}
+
+        # Configuração do Poisson
+        for attr in ("tail_epsilon", "max_goals"):
+            if hasattr(model, attr):
+                version[attr] = getattr(model, attr)
+
+        try:
+            version["is_trained"] = getattr(model, "is_trained", None)
+            version["registry_version"] = getattr(model, "version", None)
+            version["model_path"] = getattr(model, "model_path", None)
+            version["prediction_version"] = getattr(model, "prediction_version", None)
+            if hasattr(model, "feature_schema_version"):
+                version["feature_schema_version"] = model.feature_schema_version()
+
+            metadata = getattr(model, "metadata", None) or {}
+            version["training_data_hash"] = metadata.get("training_data_hash")
+            version["lineage"] = metadata.get("lineage")
+        except Exception:
+            # RegisteredModel sem versão ativa
+            pass
+
+        return version
+
+    def predict_batch(
+        self,
+        matches_stats: List[Dict],
+        match_ids: List[Optional[int]] = None,
+        model_predictions: Dict[str, Dict[str, np.ndarray]] = None
+    ) -> Dict:
+        """
+        Faz predição combinada de N partidas de uma vez (modo em lote)
+
+        Cada membro é chamado uma única vez para o lote inteiro quando tem
+        interface em lote (Poisson.predict_many, XGBoost.predict_batch); os
+        demais caem para uma chamada por partida. As probabilidades formam um
+        tensor (N, M, 3) com máscara (N, M) de predições ausentes, combinado
+        pela estratégia numa única operação NumPy.
+
+        Não passa pelo cache de predições (só predict usa): os membros já
+        rodam uma vez para o lote inteiro e o resultado é colunar.
+
+        Args:
+            matches_stats: Lista de estatísticas das partidas
+            match_ids: IDs das partidas, alinhados com matches_stats (opcional)
+            model_predictions: Predições em lote já calculadas {nome: colunas}
+                (ex: XGBoostModel.predict_batch); NaN = sem predição
+
+        Returns:
+            Dicionário colunar:
+            - "home_win", "draw", "away_win": arrays (N,) combinados (NaN se
+              nenhum membro previu a partida)
+            - "probabilities": tensor (N, M, 3) na ordem home_win, draw, away_win
+            - "mask": (N, M), se o membro previu a partida
+            - "weights": (N, M), peso efetivo de cada membro em cada partida
+            - "models": nomes dos M membros, "strategy" e "member_batches"
+              (saída em lote de cada membro, ex: mercados do Poisson)
+
+        Raises:
+            Exception: Se nenhum modelo previu nenhuma partida
+        """
+        if match_ids is None:
+            match_ids = [None] * len(matches_stats)
+
+        names = list(self.models)
+        probabilities = np.full((len(matches_stats), len(names), 3), np.nan)
+        member_batches = {}
+
+        calls = {
+            name: partial(self._member_batch_or_rows, name, self.models[name], matches_stats, match_ids)
+            for name in names
+            if not (model_predictions and name in model_predictions)
+        }
+
+        members_report = None
+        if self.concurrent:
+            results, members_report = self._fan_out(calls)
+        else:
+            results = {name: call() for name, call in calls.items()}
+
+        # Coleta o lote de cada membro
+        for m, name in enumerate(names):
+            if model_predictions and name in model_predictions:
+                batch = model_predictions[name]
+            else:
+                batch = results.get(name)
+
+            if batch is None:
+                continue
+
+            member_batches[name] = batch
+            probabilities[:, m] = np.column_stack([batch["home_win"], batch["draw"], batch["away_win"]])
+
+        mask = ~np.isnan(probabilities).any(axis=2)
+
+        if len(matches_stats) and not mask.any():
+            raise Exception("Nenhum modelo disponível para predição")
+
+        combined = self._combine_batch(names, probabilities, mask)
+        combined.update({
+            "probabilities": probabilities,
+            "mask": mask,
+            "models": names,
+            "strategy": self.strategy,
+            "member_batches": member_batches
+        })
+
+        if members_report is not None:
+            combined["members"] = members_report
+
+        return combined
+
+    def to_predictions(self, batch: Dict) -> List[Dict]:
+        """
+        Converte o resultado de predict_batch em predições por partida
+
+        Mesmo formato de predict (valores arredondados); partidas sem nenhum
+        membro disponível viram None.
+
+        Args:
+            batch: Resultado de predict_batch
+
+        Returns:
+            Lista de predições, na mesma ordem do lote
+        """
+        names = batch["models"]
+
+        # Mercados completos só existem quando o Poisson rodou em lote (predict_many)
+        poisson_batch = batch["member_batches"].get("poisson", {})
+        poisson_predictions = None
+        if "btts_yes" in poisson_batch:
+            poisson_predictions = self.models["poisson"].to_predictions(poisson_batch)
+
+        predictions = []
+        for n in range(len(batch["home_win"])):
+            row_mask = batch["mask"][n]
+            if not row_mask.any():
+                predictions.append(None)
+                continue
+
+            prediction = {
+                "model": {
+                    "voting": "Ensemble (Voting)",
+                    "confidence": "Ensemble (Confidence-Based)"
+                }.get(self.strategy, "Ensemble (Weighted Average)"),
+                "result": {
+                    "home_win": round(float(batch["home_win"][n]), 3),
+                    "draw": round(float(batch["draw"][n]), 3),
+                    "away_win": round(float(batch["away_win"][n]), 3)
+                }
+            }
+
+            if self.strategy == "voting":
+                prediction["votes"] = dict(zip(("home_win", "draw", "away_win"), batch["votes"][n].tolist()))
+            elif self.strategy == "confidence":
+                prediction["confidences"] = {
+                    name: float(batch["confidences"][n, m]) for m, name in enumerate(names) if row_mask[m]
+                }
+            else:
+                prediction["weights"] = {
+                    name: float(batch["weights"][n, m]) for m, name in enumerate(names) if row_mask[m]
+                }
+
+                # Mercados de gols, BTTS, escanteios e cartões vêm do Poisson
+                poisson_pred = poisson_predictions[n] if poisson_predictions and row_mask[names.index("poisson")] else {}
+                prediction.update({
+                    "goals": poisson_pred.get("goals", {}),
+                    "both_teams_score": poisson_pred.get("both_teams_score", {}),
+                    "corners": poisson_pred.get("corners", {}),
+                    "cards": poisson_pred.get("cards", {}),
+                    "most_likely_score": poisson_pred.get("most_likely_score", {})
+                })
+
+            prediction["models_used"] = [name for m, name in enumerate(names) if row_mask[m]]
+            prediction["strategy"] = self.strategy
+            predictions.append(prediction)
+
+        return predictions
+
+    def _member_predict(self, name: str, model, match_stats: Dict, match_id: int = None, verbose: bool = True) -> Optional[Dict]:
+        """Predição de um membro para uma partida (None se indisponível)"""
+        if name == "poisson":
+            return model.predict_match(
+                home_attack=match_stats["home"]["goals_scored_avg"],
+                away_attack=match_stats["away"]["goals_scored_avg"],
+                home_defense=match_stats["home"].get("goals_conceded_avg"),
+                away_defense=match_stats["away"].get("goals_conceded_avg")
+            )
+
+        if name == "xgboost":
+            if not model.is_trained:
+                if verbose:
+                    print(f"Modelo {name} não treinado, pulando...")
+                return None
+
+            # Passa match_id para XGBoost poder usar features da API
+            return model.predict(match_stats, match_id=match_id)
+
+        if name == "api-football":
+            if not match_id:
+                if verbose:
+                    print("match_id necessário para buscar predições da API-Football")
+                return None
+
+            pred = model.predict(match_id)
+            if not pred and verbose:
+                print(f"Predição da API-Football não disponível para match_id={match_id}")
+            return pred
+
+        return None
+
+    def _member_batch(self, name: str, model, matches_stats: List[Dict], match_ids: List[Optional[int]]) -> Optional[Dict]:
+        """
+        Predições de um membro para o lote (dicionário colunar; NaN = sem predição)
+
+        Returns:
+            Colunas "home_win", "draw", "away_win" (N,), ou None se o membro
+            não estiver disponível
+        """
+        if name == "poisson" and hasattr(model, "predict_many"):
+            return model.predict_many(
+                home_attack=[stats["home"]["goals_scored_avg"] for stats in matches_stats],
+                away_attack=[stats["away"]["goals_scored_avg"] for stats in matches_stats],
+                home_defense=[stats["home"].get("goals_conceded_avg") for stats in matches_stats],
+                away_defense=[stats["away"].get("goals_conceded_avg") for stats in matches_stats]
+            )
+
+        if name == "xgboost":
+            if not model.is_trained:
+                print(f"Modelo {name} não treinado, pulando...")
+                return None
+
+            return model.predict_batch(matches_stats, match_ids)
+
+        if name == "api-football" and hasattr(model, "predict_many"):
+            columns = np.full((len(matches_stats), 3), np.nan)
+            for n, pred in enumerate(model.predict_many(match_ids)):
+                if pred:
+                    result = pred["result"]
+                    columns[n] = [result["home_win"], result["draw"], result["away_win"]]
+
+            return {"home_win": columns[:, 0], "draw": columns[:, 1], "away_win": columns[:, 2]}
+
+        return self._member_rows(name, model, matches_stats, match_ids)
+
+    def _member_batch_or_rows(self, name: str, model, matches_stats: List[Dict], match_ids: List[Optional[int]]) -> Optional[Dict]:
+        """Lote de um membro; se a chamada em lote falhar, isola partida a partida"""
+        try:
+            return self._member_batch(name, model, matches_stats, match_ids)
+        except Exception as e:
+            # Uma partida com erro não derruba o lote
+            print(f"Erro ao obter predições de {name} em lote ({e}), tentando por partida...")
+            return self._member_rows(name, model, matches_stats, match_ids)
+
+    def _member_rows(self, name: str, model, matches_stats: List[Dict], match_ids: List[Optional[int]]) -> Dict:
+        """Predições de um membro sem interface em lote: uma chamada por partida"""
+        columns = np.full((len(matches_stats), 3), np.nan)
+        missing = 0
+
+        for n, (match_stats, match_id) in enumerate(zip(matches_stats, match_ids)):
+            try:
+                pred = self._member_predict(name, model, match_stats, match_id, verbose=False)
+            except Exception as e:
+                print(f"Erro ao obter predição de {name}: {e}")
+                pred = None
+
+            if not pred:
+                missing += 1
+                continue
+
+            result = pred.get("result", {})
+            columns[n] = [result.get("home_win", 0.0), result.get("draw", 0.0), result.get("away_win", 0.0)]
+
+        if missing:
+            print(f"{name}: sem predição para {missing}/{len(matches_stats)} partidas")
+
+        return {"home_win": columns[:, 0], "draw": columns[:, 1], "away_win": columns[:, 2]}
+
+    def _fan_out(self, calls: Dict[str, callable]):
+        """
+        Executa as chamadas dos membros em paralelo, cada uma com seu prazo
+
+        Todas começam juntas, então a espera total é limitada pelo maior
+        prazo. Membros que estouram o prazo ou falham ficam de fora (a
+        thread continua até terminar, mas o resultado é ignorado).
+
+        Args:
+            calls: {nome do membro: função sem argumentos}
+
+        Returns:
+            (resultados {nome: retorno}, relatório {nome: status, latency_ms, error})
+
+        Raises:
+            Exception: Se algum membro obrigatório (required) não responder
+        """
+        executor = self.executor or shared_executor()
+        started = time.perf_counter()
+
+        # Início de cada chamada de membro serializado (depois de obter o lock)
+        began = {name: Future() for name in calls if name in self._member_locks}
+
+        futures = {
+            name: executor.submit(self._timed_call, name, call, began.get(name))
+            for name, call in calls.items()
+        }
+
+        results, report = {}, {}
+
+        # Espera na ordem dos prazos: quando um estoura, os seguintes já tiveram o mesmo tempo
+        for name in sorted(futures, key=self._member_timeout):
+            timeout = self._member_timeout(name)
+            deadline = started + timeout
+
+            # Espera pelo lock não conta no prazo: ele corre a partir do início da chamada
+            if name in began:
+                try:
+                    call_started = began[name].result(timeout=max(deadline - time.perf_counter(), 0) + timeout)
+                except FuturesTimeoutError:
+                    call_started = None
+                if call_started is not None:
+                    deadline = max(deadline, call_started + timeout)
+
+            remaining = deadline - time.perf_counter()
+
+            try:
+                value, latency = futures[name].result(timeout=max(remaining, 0))
+
+            except FuturesTimeoutError:
+                futures[name].cancel()
+                report[name] = {"status": "timeout", "latency_ms": round(timeout * 1000, 1)}
+                print(f"⏱️  {name} excedeu o prazo de {timeout:.2f}s, descartado")
+                continue
+
+            except Exception as e:
+                report[name] = {
+                    "status": "error",
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "error": str(e)
+                }
+                print(f"Erro ao obter predição de {name}: {e}")
+                continue
+
+            report[name] = {"status": "ok" if value is not None else "unavailable", "latency_ms": latency}
+            if value is not None:
+                results[name] = value
+
+        # Relatório na ordem dos membros
+        report = {name: report[name] for name in calls}
+
+        missing = [name for name in self.required if name in calls and name not in results]
+        if missing:
+            raise Exception(f"Modelos obrigatórios indisponíveis: {', '.join(missing)} ({report})")
+
+        return results, report
+
+    def _timed_call(self, name: str, call, began: Future = None):
+        """
+        Roda a chamada de um membro e mede a latência em ms
+
+        Membros serializados esperam o lock (no máximo o próprio prazo) e
+        publicam em began o instante em que a chamada começa (None se o
+        lock não vier).
+        """
+        lock = self._member_locks.get(name)
+        if lock is None:
+            started = time.perf_counter()
+            value = call()
+            return value, round((time.perf_counter() - started) * 1000, 1)
+
+        acquired = lock.acquire(timeout=self._member_timeout(name))
+        started = time.perf_counter()
+        began.set_result(started if acquired else None)
+
+        # Chamada anterior (ex: descartada por prazo) ainda em andamento
+        if not acquired:
+            raise TimeoutError(f"chamada anterior de {name} ainda em andamento")
+
+        try:
+            value = call()
+            return value, round((time.perf_counter() - started) * 1000, 1)
+        finally:
+            lock.release()
+
+    def _member_timeout(self, name: str) -> float:
+        return self.timeouts.get(name, self.default_timeout)
+
+    def _combine_batch(self, names: List[str], probabilities: np.ndarray, mask: np.ndarray) -> Dict:
+        """
+        Combina o tensor (N, M, 3) pela estratégia, respeitando a máscara (N, M)
+
+        Mesmas regras de _weighted_average, _voting e _confidence_based,
+        partida a partida.
+        """
+        probs = np.where(mask[:, :, None], probabilities, 0.0)
+        combined = {}
+
+        if self.strategy == "voting":
+            winners = np.eye(3)[probs.argmax(axis=2)] * mask[:, :, None]
+            votes = winners.sum(axis=1)
+            weights = mask.astype(float)
+            result = votes / np.maximum(votes.sum(axis=1, keepdims=True), 1)
+            combined["votes"] = votes.astype(int)
+
+        else:
+            if self.strategy == "confidence":
+                confidences = probs.max(axis=2) * mask
+                weights = confidences
+                combined["confidences"] = confidences
+            else:
+                weights = np.array([self.weights.get(name, 0.0) for name in names])[None, :] * mask
+
+            # Sem peso nos membros ativos: média simples entre eles
+            weights = np.where(weights.sum(axis=1, keepdims=True) > 0, weights, mask.astype(float))
+            result = np.einsum("nm,nmk->nk", weights, probs)
+
+        total = weights.sum(axis=1, keepdims=True)
+        if self.strategy != "voting":
+            result = result / np.where(total > 0, total, 1.0)
+        weights = weights / np.where(total > 0, total, 1.0)
+
+        # Partidas sem nenhum membro
+        result = np.where(mask.any(axis=1, keepdims=True), result, np.nan)
+
+        combined.update({
+            "home_win": result[:, 0],
+            "draw": result[:, 1],
+            "away_win": result[:, 2],
+            "weights": weights
+        })
+
         return combined
 
     def _weighted_average(self, predictions: Dict) -> Dict:
@@ -1,8 +1,36 @@
 """
 Modelo de predição usando distribuição de Poisson
 """
-import math
-from typing import Dict, List
+import os
+import sys
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Núcleo numérico compartilhado com as edições lite e raiz (poisson_core/ na raiz do repositório)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from poisson_core import (
+    DEFAULT_TAIL_EPSILON,
+    MarketLadder,
+    btts_no_probability,
+    cache_info,
+    low_score_correction,
+    most_likely_score,
+    poisson_over_under,
+    poisson_tables,
+    score_matrix,
+    score_tensor,
+)
+
+
+# Escanteios/cartões esperados por gol esperado (correlação aproximada)
+CORNERS_PER_GOAL = 4.5
+CARDS_PER_GOAL = 1.5
+
+# Linhas padrão dos mercados de escanteios e cartões
+CORNERS_LINES = (7.5, 8.5, 9.5, 10.5)
+CARDS_LINES = (2.5, 3.5, 4.5)
 
 
 class PoissonModel:
@@ -18,11 +46,26 @@ class PoissonModel:
     - λ (lambda) é a média de gols esperados
     - k é o número de gols
     - e é a constante de Euler
+
+    As distribuições são truncadas por partida: o tamanho da grade é escolhido
+    a partir de cada lambda para que a massa ignorada na cauda fique abaixo de
+    tail_epsilon (reportada em "tail_mass" em cada predição).
     """
 
-    def __init__(self):
-        """Inicializa o modelo de Poisson"""
-        self.max_goals = 10  # Máximo de gols a considerar nas probabilidades
+    # Versão do cálculo das predições (entra na chave do cache de predições;
+    # incrementar quando a matemática mudar)
+    prediction_version = 1
+
+    def __init__(self, tail_epsilon: float = DEFAULT_TAIL_EPSILON, max_goals: int = None):
+        """
+        Inicializa o modelo de Poisson
+
+        Args:
+            tail_epsilon: Massa máxima de probabilidade ignorada na cauda
+            max_goals: Grade fixa de gols (None = truncagem adaptativa)
+        """
+        self.tail_epsilon = tail_epsilon
+        self.max_goals = max_goals
 
     def poisson_probability(self, k: int, lambda_param: float) -> float:
         """
@@ -38,7 +81,13 @@ class PoissonModel:
         if lambda_param <= 0:
             return 0.0
 
-        return (lambda_param ** k) * math.exp(-lambda_param) / math.factorial(k)
+        pmf, _ = poisson_tables(lambda_param, size=k + 1)
+        return float(pmf[k])
+
+    @staticmethod
+    def cache_info():
+        """Estatísticas do cache de tabelas PMF/CDF (hits, misses, tamanho)"""
+        return cache_info()
 
     def predict_match(
         self,
@@ -59,32 +108,39 @@ class PoissonModel:
         Returns:
             Dicionário com predições de todos os mercados
         """
-        # Ajusta lambda considerando defesa se disponível
-        if home_defense is not None and away_defense is not None:
-            # Fator casa: time da casa tem vantagem de ~0.3 gols
-            home_lambda = (home_attack + away_defense) / 2 + 0.15
-            away_lambda = (away_attack + home_defense) / 2 - 0.15
-        else:
-            # Sem dados de defesa, usa apenas ataque com fator casa
-            home_lambda = home_attack + 0.15
-            away_lambda = away_attack - 0.15
+        home_lambda, away_lambda = self._calculate_lambdas(
+            home_attack, away_attack, home_defense, away_defense
+        )
 
-        # Garante valores mínimos positivos
-        home_lambda = max(home_lambda, 0.5)
-        away_lambda = max(away_lambda, 0.5)
+        return self.predict_lambdas(home_lambda, away_lambda)
+
+    def predict_lambdas(self, home_lambda: float, away_lambda: float, rho: float = 0.0) -> Dict:
+        """
+        Prediz todos os mercados a partir dos gols esperados já calculados
+
+        Usado quando os lambdas vêm de outra fonte (ex: forças ajustadas
+        pelo DixonColesModel) em vez das médias de gols dos times.
+
+        Args:
+            home_lambda: Gols esperados do time da casa
+            away_lambda: Gols esperados do time visitante
+            rho: Correção de Dixon-Coles dos placares baixos (0 = Poisson independente)
 
-        # Calcula probabilidades de gols
-        home_probs = [self.poisson_probability(i, home_lambda) for i in range(self.max_goals)]
-        away_probs = [self.poisson_probability(i, away_lambda) for i in range(self.max_goals)]
+        Returns:
+            Dicionário com predições de todos os mercados (mesmo formato de predict_match)
+        """
+        # Matriz de placares (casa x fora) e escada de mercados, calculadas uma única vez
+        scores = self._score_matrix(home_lambda, away_lambda, rho)
+        ladder = MarketLadder(scores)
 
         # Predições de resultado (1X2)
-        result_probs = self._calculate_result_probabilities(home_probs, away_probs)
+        result_probs = self._calculate_result_probabilities(ladder)
 
         # Predições de total de gols
-        goals_probs = self._calculate_goals_probabilities(home_probs, away_probs)
+        goals_probs = self._calculate_goals_probabilities(ladder)
 
         # Predições de ambos marcam
-        btts_probs = self._calculate_btts_probabilities(home_probs, away_probs)
+        btts_probs = self._calculate_btts_probabilities(scores)
 
         # Predições de escanteios (estimativa baseada em gols)
         corners_probs = self._calculate_corners_probabilities(home_lambda, away_lambda)
@@ -93,7 +149,13 @@ class PoissonModel:
         cards_probs = self._calculate_cards_probabilities(home_lambda, away_lambda)
 
         # Placar mais provável
-        most_likely_score = self._calculate_most_likely_score(home_probs, away_probs)
+        likely_score = self._calculate_most_likely_score(scores)
+
+        # Diagnóstico: massa de probabilidade fora da grade truncada de placares
+        # (escanteios e cartões usam forma fechada, sem truncagem)
+        tail_mass = {
+            "goals": max(float(1 - scores.sum()), 0.0)
+        }
 
         return {
             "model": "Poisson Distribution",
@@ -106,29 +168,267 @@ class PoissonModel:
             "both_teams_score": btts_probs,
             "corners": corners_probs,
             "cards": cards_probs,
-            "most_likely_score": most_likely_score
+            "most_likely_score": likely_score,
+            "tail_mass": tail_mass
         }
 
-    def _calculate_result_probabilities(
+    def market_ladder(
         self,
-        home_probs: List[float],
-        away_probs: List[float]
-    ) -> Dict:
-        """Calcula probabilidades de resultado (1X2)"""
-        home_win = 0.0
-        draw = 0.0
-        away_win = 0.0
+        home_attack: float,
+        away_attack: float,
+        home_defense: float = None,
+        away_defense: float = None
+    ) -> MarketLadder:
+        """
+        Cria a escada de mercados de uma partida (mesmos argumentos de predict_match)
+
+        Útil para comparar dezenas de linhas de casas de apostas (over/under,
+        handicap asiático, placar exato) sem recalcular a matriz por linha.
 
-        for home_goals in range(self.max_goals):
-            for away_goals in range(self.max_goals):
-                prob = home_probs[home_goals] * away_probs[away_goals]
+        Exemplo:
+            ladder = model.market_ladder(2.1, 1.8, 1.0, 1.2)
+            ladder.total_goals(2.75)["over"]
+            ladder.asian_handicap(-0.25)["home"]
+        """
+        home_lambda, away_lambda = self._calculate_lambdas(
+            home_attack, away_attack, home_defense, away_defense
+        )
+
+        return MarketLadder(self._score_matrix(home_lambda, away_lambda))
+
+    def predict_many(
+        self,
+        home_attack,
+        away_attack,
+        home_defense=None,
+        away_defense=None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Prediz N partidas de uma vez (modo em lote)
+
+        Equivalente a chamar predict_match para cada partida, mas monta um
+        tensor de placares (N, G, G) e deriva todos os mercados com operações
+        vetorizadas. Os valores NÃO são arredondados.
+
+        Args:
+            home_attack: Array com médias de gols marcados (casa)
+            away_attack: Array com médias de gols marcados (fora)
+            home_defense: Array com médias de gols sofridos (casa, opcional)
+            away_defense: Array com médias de gols sofridos (fora, opcional)
 
-                if home_goals > away_goals:
-                    home_win += prob
-                elif home_goals == away_goals:
-                    draw += prob
-                else:
-                    away_win += prob
+        Returns:
+            Dicionário colunar {mercado: array (N,)}, ex: "home_win",
+            "over_2.5", "btts_yes", "corners_over_9.5", "most_likely_home",
+            "goals_tail_mass" (lote vazio: as mesmas colunas, com N = 0)
+
+        Raises:
+            ValueError: Se algum ataque for NaN ou infinito
+        """
+        home_attack = np.asarray(home_attack, dtype=float)
+        away_attack = np.asarray(away_attack, dtype=float)
+
+        if home_attack.size == 0:
+            return self._empty_batch()
+
+        # Sem média de gols não há lambda (a defesa NaN só desliga o ajuste abaixo)
+        invalid = ~(np.isfinite(home_attack) & np.isfinite(away_attack))
+        if invalid.any():
+            raise ValueError(f"Médias de gols inválidas (NaN/infinito) nas partidas {np.flatnonzero(invalid).tolist()}")
+
+        # Mesmo ajuste de lambda do predict_match, partida a partida
+        home_lambda = home_attack + 0.15
+        away_lambda = away_attack - 0.15
+
+        if home_defense is not None and away_defense is not None:
+            home_defense = np.asarray(home_defense, dtype=float)
+            away_defense = np.asarray(away_defense, dtype=float)
+
+            # NaN na defesa = sem dados de defesa para aquela partida
+            has_defense = np.isfinite(home_defense) & np.isfinite(away_defense)
+            home_lambda = np.where(has_defense, (home_attack + away_defense) / 2 + 0.15, home_lambda)
+            away_lambda = np.where(has_defense, (away_attack + home_defense) / 2 - 0.15, away_lambda)
+
+        home_lambda = np.maximum(home_lambda, 0.5)
+        away_lambda = np.maximum(away_lambda, 0.5)
+
+        # Tensor de placares: scores[n, i, j] = P(casa i) * P(fora j)
+        scores = score_tensor(home_lambda, away_lambda, self.tail_epsilon, self.max_goals)
+        goals_size = scores.shape[1]
+
+        # 1X2 (normalizado como no predict_match)
+        home_win = np.tril(scores, -1).sum(axis=(1, 2))
+        draw = np.trace(scores, axis1=1, axis2=2)
+        away_win = np.triu(scores, 1).sum(axis=(1, 2))
+        total = home_win + draw + away_win
+
+        predictions = {
+            "home_lambda": home_lambda,
+            "away_lambda": away_lambda,
+            "home_win": home_win / total,
+            "draw": draw / total,
+            "away_win": away_win / total,
+        }
+
+        # Total de gols: over[n, k] = P(total > k)
+        goals = np.arange(goals_size)
+        total_goals = np.add.outer(goals, goals)
+        for line in range(5):
+            over = (scores * (total_goals > line)).sum(axis=(1, 2))
+            predictions[f"over_{line}.5"] = over
+            predictions[f"under_{line}.5"] = 1 - over
+
+        # Ambos marcam
+        btts_no = btts_no_probability(scores)
+        predictions["btts_yes"] = 1 - btts_no
+        predictions["btts_no"] = btts_no
+
+        # Escanteios e cartões
+        predictions.update(self.predict_corners_cards(home_lambda, away_lambda))
+
+        # Placar mais provável
+        flat_scores = scores.reshape(len(scores), -1)
+        best = flat_scores.argmax(axis=1)
+        predictions["most_likely_home"], predictions["most_likely_away"] = np.divmod(best, goals_size)
+        predictions["most_likely_prob"] = flat_scores[np.arange(len(best)), best]
+
+        # Diagnóstico de truncagem por partida
+        predictions["goals_tail_mass"] = np.maximum(1 - scores.sum(axis=(1, 2)), 0.0)
+
+        return predictions
+
+    def _empty_batch(self) -> Dict[str, np.ndarray]:
+        """Resultado de predict_many para um lote sem partidas (mesmas colunas)"""
+        empty = np.empty(0)
+        predictions = {
+            column: empty
+            for column in ("home_lambda", "away_lambda", "home_win", "draw", "away_win",
+                           "btts_yes", "btts_no", "most_likely_prob", "goals_tail_mass")
+        }
+        for line in range(5):
+            predictions[f"over_{line}.5"] = empty
+            predictions[f"under_{line}.5"] = empty
+        predictions.update(self.predict_corners_cards(empty, empty))
+        predictions["most_likely_home"] = np.empty(0, dtype=int)
+        predictions["most_likely_away"] = np.empty(0, dtype=int)
+
+        return predictions
+
+    def predict_corners_cards(
+        self,
+        home_lambda,
+        away_lambda,
+        corners_lines=CORNERS_LINES,
+        cards_lines=CARDS_LINES
+    ) -> Dict[str, np.ndarray]:
+        """
+        Precifica escanteios e cartões de N partidas de uma vez, para quaisquer linhas
+
+        Args:
+            home_lambda: Array de gols esperados (casa)
+            away_lambda: Array de gols esperados (fora)
+            corners_lines: Linhas de escanteios (ex: (8.5, 9.5, 12.5))
+            cards_lines: Linhas de cartões (ex: (3.5, 5.5))
+
+        Returns:
+            Dicionário colunar, ex: "corners_over_9.5", "cards_under_3.5",
+            "corners_lambda", "cards_lambda"
+        """
+        total_lambda = np.asarray(home_lambda, dtype=float) + np.asarray(away_lambda, dtype=float)
+        predictions = {
+            "corners_lambda": total_lambda * CORNERS_PER_GOAL,
+            "cards_lambda": total_lambda * CARDS_PER_GOAL
+        }
+
+        for market, lines in (("corners", corners_lines), ("cards", cards_lines)):
+            over, under = poisson_over_under(predictions[f"{market}_lambda"], lines)
+            for i, line in enumerate(lines):
+                predictions[f"{market}_over_{line}"] = over[..., i]
+                predictions[f"{market}_under_{line}"] = under[..., i]
+
+        return predictions
+
+    def to_predictions(self, batch: Dict[str, np.ndarray]) -> List[Dict]:
+        """
+        Converte o resultado de predict_many em predições por partida
+
+        Cada item tem o formato de predict_match (valores arredondados); o
+        tail_mass é o da grade comum do lote, então pode ser menor que o de
+        predict_match.
+
+        Args:
+            batch: Resultado de predict_many
+
+        Returns:
+            Lista de predições, na mesma ordem do lote
+        """
+        def markets(prefix: str, lines, row: int) -> Dict:
+            probs = {}
+            for line in lines:
+                probs[f"over_{line}"] = round(float(batch[f"{prefix}over_{line}"][row]), 3)
+                probs[f"under_{line}"] = round(float(batch[f"{prefix}under_{line}"][row]), 3)
+            return probs
+
+        return [
+            {
+                "model": "Poisson Distribution",
+                "lambdas": {
+                    "home": round(float(batch["home_lambda"][row]), 2),
+                    "away": round(float(batch["away_lambda"][row]), 2)
+                },
+                "result": {
+                    "home_win": round(float(batch["home_win"][row]), 3),
+                    "draw": round(float(batch["draw"][row]), 3),
+                    "away_win": round(float(batch["away_win"][row]), 3)
+                },
+                "goals": markets("", (0.5, 1.5, 2.5, 3.5, 4.5), row),
+                "both_teams_score": {
+                    "yes": round(float(batch["btts_yes"][row]), 3),
+                    "no": round(float(batch["btts_no"][row]), 3)
+                },
+                "corners": markets("corners_", CORNERS_LINES, row),
+                "cards": markets("cards_", CARDS_LINES, row),
+                "most_likely_score": {
+                    "score": f"{int(batch['most_likely_home'][row])}-{int(batch['most_likely_away'][row])}",
+                    "probability": round(float(batch["most_likely_prob"][row]), 3)
+                },
+                "tail_mass": {
+                    "goals": float(batch["goals_tail_mass"][row])
+                }
+            }
+            for row in range(len(batch["home_win"]))
+        ]
+
+    def _calculate_lambdas(
+        self,
+        home_attack: float,
+        away_attack: float,
+        home_defense: float = None,
+        away_defense: float = None
+    ) -> Tuple[float, float]:
+        """Calcula os lambdas (gols esperados) de casa e fora"""
+        # Ajusta lambda considerando defesa se disponível
+        if home_defense is not None and away_defense is not None:
+            # Fator casa: time da casa tem vantagem de ~0.3 gols
+            home_lambda = (home_attack + away_defense) / 2 + 0.15
+            away_lambda = (away_attack + home_defense) / 2 - 0.15
+        else:
+            # Sem dados de defesa, usa apenas ataque com fator casa
+            home_lambda = home_attack + 0.15
+            away_lambda = away_attack - 0.15
+
+        # Garante valores mínimos positivos
+        return max(home_lambda, 0.5), max(away_lambda, 0.5)
+
+    def _score_matrix(self, home_lambda: float, away_lambda: float, rho: float = 0.0) -> np.ndarray:
+        """Matriz conjunta de placares (casa x fora), truncada por tail_epsilon"""
+        scores = score_matrix(home_lambda, away_lambda, self.tail_epsilon, self.max_goals)
+
+        return low_score_correction(scores, home_lambda, away_lambda, rho)
+
+    def _calculate_result_probabilities(self, ladder: MarketLadder) -> Dict:
+        """Calcula probabilidades de resultado (1X2)"""
+        result = ladder.result()
+        home_win, draw, away_win = result["home_win"], result["draw"], result["away_win"]
 
         # Normaliza para somar 100%
         total = home_win + draw + away_win
@@ -143,58 +443,20 @@ class PoissonModel:
             "away_win": round(away_win, 3)
         }
 
-    def _calculate_goals_probabilities(
-        self,
-        home_probs: List[float],
-        away_probs: List[float]
-    ) -> Dict:
+    def _calculate_goals_probabilities(self, ladder: MarketLadder) -> Dict:
         """Calcula probabilidades de total de gols"""
-        over_05 = 0.0
-        over_15 = 0.0
-        over_25 = 0.0
-        over_35 = 0.0
-        over_45 = 0.0
-
-        for home_goals in range(self.max_goals):
-            for away_goals in range(self.max_goals):
-                prob = home_probs[home_goals] * away_probs[away_goals]
-                total_goals = home_goals + away_goals
-
-                if total_goals > 0.5:
-                    over_05 += prob
-                if total_goals > 1.5:
-                    over_15 += prob
-                if total_goals > 2.5:
-                    over_25 += prob
-                if total_goals > 3.5:
-                    over_35 += prob
-                if total_goals > 4.5:
-                    over_45 += prob
+        probs = {}
+        for line in (0.5, 1.5, 2.5, 3.5, 4.5):
+            over_prob = ladder.over_probability(line)
+            probs[f"over_{line}"] = round(over_prob, 3)
+            probs[f"under_{line}"] = round(1 - over_prob, 3)
 
-        return {
-            "over_0.5": round(over_05, 3),
-            "under_0.5": round(1 - over_05, 3),
-            "over_1.5": round(over_15, 3),
-            "under_1.5": round(1 - over_15, 3),
-            "over_2.5": round(over_25, 3),
-            "under_2.5": round(1 - over_25, 3),
-            "over_3.5": round(over_35, 3),
-            "under_3.5": round(1 - over_35, 3),
-            "over_4.5": round(over_45, 3),
-            "under_4.5": round(1 - over_45, 3),
-        }
+        return probs
 
-    def _calculate_btts_probabilities(
-        self,
-        home_probs: List[float],
-        away_probs: List[float]
-    ) -> Dict:
+    def _calculate_btts_probabilities(self, scores: np.ndarray) -> Dict:
         """Calcula probabilidades de ambos marcam"""
-        # P(Ambos marcam) = 1 - P(Casa não marca) - P(Fora não marca) + P(Ninguém marca)
-        home_no_goal = home_probs[0]
-        away_no_goal = away_probs[0]
-
-        btts_no = home_no_goal + away_no_goal - (home_no_goal * away_no_goal)
+        # Nenhum marca ou só um marca = linha 0 (casa) + coluna 0 (fora) da matriz
+        btts_no = float(btts_no_probability(scores))
         btts_yes = 1 - btts_no
 
         return {
@@ -205,7 +467,8 @@ class PoissonModel:
     def _calculate_corners_probabilities(
         self,
         home_lambda: float,
-        away_lambda: float
+        away_lambda: float,
+        lines=CORNERS_LINES
     ) -> Dict:
         """
         Estima probabilidades de escanteios baseado em gols
@@ -214,28 +477,15 @@ class PoissonModel:
         Times mais ofensivos geram mais escanteios
         """
         # Estima escanteios baseado em ataque (correlação aproximada)
-        corners_lambda = (home_lambda + away_lambda) * 4.5
+        corners_lambda = (home_lambda + away_lambda) * CORNERS_PER_GOAL
 
-        over_75 = sum(self.poisson_probability(k, corners_lambda) for k in range(8, 20))
-        over_85 = sum(self.poisson_probability(k, corners_lambda) for k in range(9, 20))
-        over_95 = sum(self.poisson_probability(k, corners_lambda) for k in range(10, 20))
-        over_105 = sum(self.poisson_probability(k, corners_lambda) for k in range(11, 20))
-
-        return {
-            "over_7.5": round(over_75, 3),
-            "under_7.5": round(1 - over_75, 3),
-            "over_8.5": round(over_85, 3),
-            "under_8.5": round(1 - over_85, 3),
-            "over_9.5": round(over_95, 3),
-            "under_9.5": round(1 - over_95, 3),
-            "over_10.5": round(over_105, 3),
-            "under_10.5": round(1 - over_105, 3),
-        }
+        return self._over_under_probabilities(corners_lambda, lines)
 
     def _calculate_cards_probabilities(
         self,
         home_lambda: float,
-        away_lambda: float
+        away_lambda: float,
+        lines=CARDS_LINES
     ) -> Dict:
         """
         Estima probabilidades de cartões baseado em gols
@@ -244,40 +494,27 @@ class PoissonModel:
         Jogos mais intensos tendem a ter mais cartões
         """
         # Estima cartões baseado em intensidade do jogo
-        cards_lambda = (home_lambda + away_lambda) * 1.5
+        cards_lambda = (home_lambda + away_lambda) * CARDS_PER_GOAL
 
-        over_25 = sum(self.poisson_probability(k, cards_lambda) for k in range(3, 15))
-        over_35 = sum(self.poisson_probability(k, cards_lambda) for k in range(4, 15))
-        over_45 = sum(self.poisson_probability(k, cards_lambda) for k in range(5, 15))
+        return self._over_under_probabilities(cards_lambda, lines)
 
-        return {
-            "over_2.5": round(over_25, 3),
-            "under_2.5": round(1 - over_25, 3),
-            "over_3.5": round(over_35, 3),
-            "under_3.5": round(1 - over_35, 3),
-            "over_4.5": round(over_45, 3),
-            "under_4.5": round(1 - over_45, 3),
-        }
+    def _over_under_probabilities(self, lambda_param: float, lines) -> Dict:
+        """Over/under de Poisson em forma fechada para cada linha"""
+        over, under = poisson_over_under(lambda_param, lines)
 
-    def _calculate_most_likely_score(
-        self,
-        home_probs: List[float],
-        away_probs: List[float]
-    ) -> Dict:
-        """Calcula o placar mais provável"""
-        max_prob = 0.0
-        most_likely = {"home": 0, "away": 0}
+        probs = {}
+        for i, line in enumerate(lines):
+            probs[f"over_{line}"] = round(float(over[i]), 3)
+            probs[f"under_{line}"] = round(float(under[i]), 3)
 
-        for home_goals in range(self.max_goals):
-            for away_goals in range(self.max_goals):
-                prob = home_probs[home_goals] * away_probs[away_goals]
+        return probs
 
-                if prob > max_prob:
-                    max_prob = prob
-                    most_likely = {"home": home_goals, "away": away_goals}
+    def _calculate_most_likely_score(self, scores: np.ndarray) -> Dict:
+        """Calcula o placar mais provável"""
+        home_goals, away_goals, max_prob = most_likely_score(scores)
 
         return {
-            "score": f"{most_likely['home']}-{most_likely['away']}",
+            "score": f"{home_goals}-{away_goals}",
             "probability": round(max_prob, 3)
         }
 
@@ -0,0 +1,226 @@
+"""
+Cache de predições do ensemble endereçado por conteúdo
+
+A mesma partida é prevista várias vezes (pipeline a cada ciclo do monitor,
+/predict, /predict-detailed, live_betting_analyzer) quase sempre com as
+mesmas entradas. A chave do cache é o hash de tudo que determina a
+predição:
+
+- CACHE_SCHEMA_VERSION (formato das chaves e das predições em cache)
+- match_stats (estatísticas de entrada)
+- match_id e a versão da predição da API-Football dessa partida
+- pesos e estratégia do ensemble
+- versão de cada membro (versão do cálculo, ex: PoissonModel.prediction_version,
+  e versão ativa do XGBoost no registro)
+
+Qualquer mudança num desses componentes gera outra chave, então não há
+invalidação manual: entradas antigas simplesmente deixam de ser usadas (e
+saem pelo LRU / pela poda do SQLite). Além disso, entradas expiram após
+ttl segundos, e o SQLite é esvaziado ao abrir com outro CACHE_SCHEMA_VERSION.
+
+Só EnsembleModel.predict consulta o cache; predict_batch (lote colunar)
+não passa por ele. O relatório "members" de latência não é guardado, e as
+respostas do cache vêm com "cached": True.
+
+Dois níveis:
+- LRU em memória (por processo)
+- SQLite opcional (db_path), compartilhado entre processos (API, pipeline,
+  monitor)
+
+Uso:
+    cache = PredictionCache(db_path=DEFAULT_CACHE_PATH)
+    ensemble = EnsembleModel(database=db, cache=cache)
+"""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+# Versão das chaves e do formato das predições em cache. Incrementar quando
+# o formato mudar; o SQLite de uma versão anterior é esvaziado ao abrir
+CACHE_SCHEMA_VERSION = 1
+
+# Arquivo SQLite padrão (relativo a pro/python_api, como o banco principal)
+DEFAULT_CACHE_PATH = "database/prediction_cache.db"
+
+# Validade de uma entrada (segundos)
+DEFAULT_TTL = 24 * 3600
+
+# Entradas no LRU em memória
+DEFAULT_MAX_ENTRIES = 1024
+
+# Entradas mantidas no SQLite (as mais antigas são podadas)
+DEFAULT_MAX_DB_ENTRIES = 100_000
+
+# A cada quantas gravações no SQLite a poda roda
+PRUNE_EVERY = 500
+
+
+def cache_key(components: Dict) -> str:
+    """Hash sha256 (JSON canônico) dos componentes da chave e de CACHE_SCHEMA_VERSION"""
+    components = {"cache_schema_version": CACHE_SCHEMA_VERSION, **components}
+    payload = json.dumps(components, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PredictionCache:
+    """
+    Cache de predições em dois níveis (LRU em memória + SQLite opcional)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        db_path: str = None,
+        max_db_entries: int = DEFAULT_MAX_DB_ENTRIES,
+        ttl: float = DEFAULT_TTL
+    ):
+        """
+        Args:
+            max_entries: Tamanho do LRU em memória
+            db_path: Arquivo SQLite compartilhado entre processos (None = só memória)
+            max_db_entries: Máximo de entradas mantidas no SQLite
+            ttl: Validade de cada entrada em segundos (None = sem expiração)
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_db_entries = max_db_entries
+        self.ttl = ttl
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {"hits": 0, "db_hits": 0, "misses": 0}
+
+        self._conn = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS prediction_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_prediction_cache_created_at ON prediction_cache (created_at)"
+            )
+            self._check_schema_version()
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Predição em cache (cópia), ou None
+
+        Procura no LRU e depois no SQLite; acertos no SQLite sobem para o LRU.
+        Entradas com mais de ttl segundos não valem.
+        """
+        oldest = time.time() - self.ttl if self.ttl is not None else 0.0
+
+        with self._lock:
+            if key in self._entries:
+                value, created_at = self._entries[key]
+                if created_at >= oldest:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+
+            value = None
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT value, created_at FROM prediction_cache WHERE key = ? AND created_at >= ?",
+                        (key, oldest)
+                    ).fetchone()
+                    if row:
+                        value, created_at = json.loads(row[0]), row[1]
+                except sqlite3.Error as e:
+                    print(f"⚠️  Cache de predições (SQLite) indisponível: {e}")
+
+            if value is None:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["db_hits"] += 1
+            self._remember(key, value, created_at)
+            return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict):
+        """Guarda uma predição (deve ser serializável em JSON)"""
+        # Passa pelo JSON nos dois níveis, para que memória e SQLite devolvam o mesmo formato
+        value = json.loads(json.dumps(value, default=float))
+        created_at = time.time()
+
+        with self._lock:
+            self._remember(key, value, created_at)
+
+            if self._conn is None:
+                return
+
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO prediction_cache (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), created_at)
+                )
+                self._writes += 1
+                if self._writes % PRUNE_EVERY == 0:
+                    self._prune()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️  Erro ao gravar no cache de predições (SQLite): {e}")
+
+    def clear(self):
+        """Esvazia os dois níveis"""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM prediction_cache")
+                self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _remember(self, key: str, value: Dict, created_at: float):
+        """Insere no LRU, descartando a entrada usada há mais tempo"""
+        self._entries[key] = (value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _check_schema_version(self):
+        """Esvazia o SQLite gravado com outro CACHE_SCHEMA_VERSION (ou antes da versão existir)"""
+        self._conn.execute("CREATE TABLE IF NOT EXISTS prediction_cache_meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self._conn.execute(
+            "SELECT value FROM prediction_cache_meta WHERE key = 'schema_version'"
+        ).fetchone()
+
+        if row is None or row[0] != str(CACHE_SCHEMA_VERSION):
+            deleted = self._conn.execute("DELETE FROM prediction_cache").rowcount
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prediction_cache_meta (key, value) VALUES ('schema_version', ?)",
+                (str(CACHE_SCHEMA_VERSION),)
+            )
+            if deleted:
+                print(f"♻️  Cache de predições de outra versão esvaziado ({deleted} entradas)")
+
+    def _prune(self):
+        """Remove do SQLite as entradas expiradas e as mais antigas além de max_db_entries"""
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM prediction_cache WHERE created_at < ?", (time.time() - self.ttl,))
+
+        self._conn.execute("""
+            DELETE FROM prediction_cache WHERE key IN (
+                SELECT key FROM prediction_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_db_entries,))
@@ -0,0 +1,191 @@
+"""
+Registro versionado de modelos com troca a quente (hot-swap)
+
+Os artefatos ficam em models/saved e o manifesto (versões, métricas e qual
+versão está ativa) na tabela model_registry do database_v2.
+
+Processos em execução (app FastAPI, pipeline) usam um RegisteredModel, que
+se comporta como um XGBoostModel mas consulta o ponteiro "ativo" a cada
+poll_interval segundos. Quando outra versão é ativada, o novo booster é
+carregado numa thread em segundo plano e trocado numa única atribuição: requisições
+em andamento terminam com o modelo antigo, as seguintes já usam o novo.
+
+Uso:
+    registry = ModelRegistry(db)
+    version = registry.register("models/saved/xgboost_with_api_X.ubj", metrics, activate=True)
+
+    xgboost = RegisteredModel(registry, feature_extractor=feature_extractor)
+    xgboost.predict(match_stats, match_id=123)
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .xgboost_model import XGBoostModel
+
+
+# Nome padrão do modelo no registro
+DEFAULT_MODEL_NAME = "xgboost_with_api"
+
+# Intervalo (segundos) entre consultas ao ponteiro da versão ativa
+DEFAULT_POLL_INTERVAL = 30.0
+
+
+class ModelRegistry:
+    """
+    Registro de versões de um modelo (manifesto no database_v2)
+    """
+
+    def __init__(self, database, model_name: str = DEFAULT_MODEL_NAME):
+        """
+        Args:
+            database: Instância do Database (database_v2.py)
+            model_name: Nome do modelo no registro
+        """
+        self.db = database
+        self.model_name = model_name
+
+    def register(self, model_path: str, metrics: Dict = None, activate: bool = False) -> int:
+        """
+        Registra um modelo já salvo como nova versão
+
+        Args:
+            model_path: Caminho do artefato (ex: .ubj com sidecar .meta.json)
+            metrics: Métricas de treino/validação
+            activate: Se deve tornar a nova versão a ativa
+
+        Returns:
+            Número da versão registrada
+        """
+        version = self.db.register_model_version(self.model_name, model_path, metrics).version
+
+        if activate:
+            self.activate(version)
+
+        return version
+
+    def activate(self, version: int):
+        """Torna a versão a ativa (processos em execução a carregam no próximo poll)"""
+        self.db.activate_model_version(self.model_name, version)
+
+    def active(self) -> Optional[Tuple[int, str]]:
+        """(versão, caminho) da versão ativa, ou None"""
+        return self.db.get_active_model_version(self.model_name)
+
+    def versions(self):
+        """Versões registradas (mais recente primeiro)"""
+        return self.db.get_model_versions(self.model_name)
+
+
+class RegisteredModel:
+    """
+    XGBoostModel que acompanha a versão ativa do registro
+
+    Atributos e métodos não definidos aqui (predict, predict_batch,
+    to_predictions, feature_names...) são repassados ao modelo atual.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        feature_extractor=None,
+        use_api_features: bool = True,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        fallback_path: str = None
+    ):
+        """
+        Args:
+            registry: Registro de modelos
+            feature_extractor: APIPredictionFeatures repassado a cada versão carregada
+            use_api_features: Se deve usar features da API-Football
+            poll_interval: Segundos entre consultas ao ponteiro da versão ativa
+            fallback_path: Modelo usado enquanto nenhuma versão estiver ativa
+                (ex: find_latest_model(), para instalações sem registro)
+        """
+        self.registry = registry
+        self.feature_extractor = feature_extractor
+        self.use_api_features = use_api_features
+        self.poll_interval = poll_interval
+
+        # (versão, modelo) trocados juntos numa única atribuição
+        self._current = (None, None)
+        self._last_poll = 0.0
+        self._swap_lock = threading.Lock()
+
+        if not self.refresh() and fallback_path:
+            self._current = (None, self._load(fallback_path))
+
+    @property
+    def version(self) -> Optional[int]:
+        """Versão do registro em uso (None = nenhuma ou fallback)"""
+        return self._current[0]
+
+    @property
+    def current(self) -> Optional[XGBoostModel]:
+        """
+        Modelo em uso
+
+        A cada poll_interval, dispara em segundo plano a verificação de nova
+        versão ativa; a chamada atual nunca espera pela consulta nem pela carga.
+        """
+        if time.monotonic() - self._last_poll >= self.poll_interval and not self._swap_lock.locked():
+            self._last_poll = time.monotonic()
+            threading.Thread(target=self.refresh, daemon=True).start()
+
+        return self._current[1]
+
+    @property
+    def is_trained(self) -> bool:
+        model = self.current
+        return bool(model and model.is_trained)
+
+    def refresh(self) -> bool:
+        """
+        Verifica agora o ponteiro da versão ativa e troca o modelo se mudou
+
+        Returns:
+            True se o modelo foi trocado
+        """
+        with self._swap_lock:
+            self._last_poll = time.monotonic()
+
+            try:
+                active = self.registry.active()
+                if active is None or active[0] == self.version:
+                    return False
+
+                version, path = active
+                model = self._load(path)
+
+            except Exception as e:
+                print(f"⚠️  Erro ao trocar modelo ({self.registry.model_name}): {e}")
+                return False
+
+            self._current = (version, model)
+            print(f"🔄 {self.registry.model_name} v{version} ativado ({path})")
+            return True
+
+    def _load(self, path: str) -> XGBoostModel:
+        """Carrega uma versão já com o booster em memória"""
+        model = XGBoostModel(
+            model_path=path,
+            feature_extractor=self.feature_extractor,
+            use_api_features=self.use_api_features
+        )
+
+        # Sem árvores exportadas, lê o booster antes da troca, para a primeira
+        # requisição não pagar a carga
+        if model.trees is None:
+            _ = model.model
+
+        return model
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        model = self.current
+        if model is None:
+            raise Exception("Nenhum modelo ativo no registro. Treine e ative uma versão antes de fazer predições.")
+
+        return getattr(model, name)
@@ -0,0 +1,271 @@
+"""
+Avaliador de árvores do XGBoost em NumPy puro (sem importar xgboost)
+
+Para predições de uma partida (app FastAPI), o custo fixo do XGBoost
+(DMatrix, chamada ao booster) domina a latência, e importar xgboost soma
+segundos ao startup. O exportador converte o booster em arrays planos (um
+elemento por nó de todas as árvores):
+
+    feature       índice da feature do split
+    threshold     limiar do split (vai para a esquerda se x < limiar)
+    left / right  filhos (índices globais; folhas apontam para si mesmas)
+    default_left  direção de valores ausentes (NaN)
+    value         valor da folha (0 nos nós internos)
+
+O avaliador desce todas as árvores ao mesmo tempo, um nível por iteração,
+para todas as linhas de X de uma vez.
+
+Uso:
+    trees = TreeEnsemble.from_booster(xgb_classifier.get_booster())
+    trees.save("models/saved/xgboost_with_api_X.trees.npz")
+
+    trees = TreeEnsemble.load("models/saved/xgboost_with_api_X.trees.npz")
+    probs = trees.predict_proba(X)  # (N, 3), mesmo que XGBClassifier.predict_proba
+"""
+import json
+import re
+
+import numpy as np
+
+
+# Versão do formato do arquivo exportado
+TREES_FORMAT_VERSION = 1
+
+# Objetivos suportados (transformação da margem em probabilidade)
+SUPPORTED_OBJECTIVES = ("multi:softprob", "multi:softmax", "binary:logistic")
+
+
+class TreeEnsemble:
+    """
+    Ensemble de árvores exportado do XGBoost, avaliado com NumPy
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        tree_class: np.ndarray,
+        base_margin: np.ndarray,
+        max_depth: int,
+        objective: str
+    ):
+        """
+        Args:
+            feature, threshold, left, right, default_left, value: Arrays por nó
+            roots: Índice da raiz de cada árvore
+            tree_class: Classe (saída) de cada árvore
+            base_margin: Margem inicial de cada classe (base_score)
+            max_depth: Profundidade máxima entre as árvores
+            objective: Objetivo do XGBoost (ex: multi:softprob)
+        """
+        if objective not in SUPPORTED_OBJECTIVES:
+            raise ValueError(f"Objetivo {objective} não suportado (suportados: {SUPPORTED_OBJECTIVES})")
+
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.tree_class = tree_class
+        self.base_margin = base_margin
+        self.max_depth = int(max_depth)
+        self.objective = objective
+
+        self.n_classes = len(base_margin)
+
+        # Soma das folhas por classe: (N, T) @ (T, n_classes)
+        self._class_matrix = np.zeros((len(roots), self.n_classes), dtype=np.float32)
+        self._class_matrix[np.arange(len(roots)), tree_class] = 1.0
+
+    @classmethod
+    def from_booster(cls, booster) -> "TreeEnsemble":
+        """
+        Exporta um xgboost.Booster (ou XGBClassifier) para arrays NumPy
+
+        Respeita best_iteration (early stopping), como predict_proba.
+        """
+        if hasattr(booster, "get_booster"):
+            booster = booster.get_booster()
+
+        learner = json.loads(booster.save_raw("json"))["learner"]
+        model = learner["gradient_booster"]["model"]
+        objective = learner["objective"]["name"]
+
+        trees = model["trees"]
+        tree_info = model["tree_info"]
+
+        best_iteration = learner.get("attributes", {}).get("best_iteration")
+        if best_iteration is not None:
+            n_trees = model["iteration_indptr"][int(best_iteration) + 1]
+            trees, tree_info = trees[:n_trees], tree_info[:n_trees]
+
+        n_classes = max(int(learner["learner_model_param"].get("num_class", 0)), 1)
+        base_margin = cls._base_margin(learner["learner_model_param"]["base_score"], n_classes, objective)
+
+        feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+
+        for tree in trees:
+            tree_left = np.asarray(tree["left_children"], dtype=np.int32)
+            tree_right = np.asarray(tree["right_children"], dtype=np.int32)
+            is_leaf = tree_left == -1
+            n_nodes = len(tree_left)
+            nodes = np.arange(n_nodes, dtype=np.int32) + offset
+
+            if any(split_type != 0 for split_type in tree.get("split_type", [])):
+                raise ValueError("Splits categóricos não são suportados pelo avaliador NumPy")
+
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+
+            feature.append(np.where(is_leaf, 0, tree["split_indices"]).astype(np.int32))
+            threshold.append(np.where(is_leaf, 0.0, conditions).astype(np.float32))
+            left.append(np.where(is_leaf, nodes, tree_left + offset))
+            right.append(np.where(is_leaf, nodes, tree_right + offset))
+            default_left.append(np.asarray(tree["default_left"], dtype=bool))
+            value.append(np.where(is_leaf, conditions, 0.0).astype(np.float32))
+            roots.append(offset)
+
+            max_depth = max(max_depth, cls._depth(tree_left, tree_right))
+            offset += n_nodes
+
+        return cls(
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            left=np.concatenate(left),
+            right=np.concatenate(right),
+            default_left=np.concatenate(default_left),
+            value=np.concatenate(value),
+            roots=np.asarray(roots, dtype=np.int32),
+            tree_class=np.asarray(tree_info, dtype=np.int32),
+            base_margin=base_margin,
+            max_depth=max_depth,
+            objective=objective
+        )
+
+    @staticmethod
+    def _base_margin(base_score: str, n_classes: int, objective: str) -> np.ndarray:
+        """base_score do JSON (escalar "5E-1" ou vetor "[a,b,c]") convertido em margem"""
+        scores = np.asarray(
+            [float(v) for v in re.findall(r"[-+0-9.eE]+", base_score)], dtype=np.float32
+        )
+        scores = np.broadcast_to(scores, (n_classes,)).astype(np.float32)
+
+        # Na logística o base_score é uma probabilidade; no softmax já é margem
+        if objective == "binary:logistic":
+            scores = np.log(scores / (1 - scores)).astype(np.float32)
+
+        return scores
+
+    @staticmethod
+    def _depth(left: np.ndarray, right: np.ndarray) -> int:
+        """Profundidade de uma árvore (número de splits no caminho mais longo)"""
+        depth = 0
+        level = np.array([0])
+
+        while True:
+            level = level[left[level] != -1]
+            if len(level) == 0:
+                return depth
+            level = np.concatenate([left[level], right[level]])
+            depth += 1
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        """
+        Margem (soma das folhas + base) de cada classe
+
+        Args:
+            X: Matriz (N, n_features)
+
+        Returns:
+            Array (N, n_classes)
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+
+        # Um nível por iteração, todas as árvores e linhas juntas (folhas ficam paradas)
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = np.where(np.isnan(x), self.default_left[node], x < self.threshold[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        return self.value[node] @ self._class_matrix + self.base_margin
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Probabilidades por classe (equivalente a XGBClassifier.predict_proba)
+
+        Args:
+            X: Matriz (N, n_features)
+
+        Returns:
+            Array (N, n_classes)
+        """
+        margin = self.predict_margin(X)
+
+        if self.objective == "binary:logistic":
+            positive = 1.0 / (1.0 + np.exp(-margin[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+
+        margin = margin - margin.max(axis=1, keepdims=True)
+        exp = np.exp(margin)
+
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def save(self, path: str):
+        """Salva os arrays num .npz (sem pickle)"""
+        np.savez(
+            path,
+            format_version=TREES_FORMAT_VERSION,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            default_left=self.default_left,
+            value=self.value,
+            roots=self.roots,
+            tree_class=self.tree_class,
+            base_margin=self.base_margin,
+            max_depth=self.max_depth,
+            objective=self.objective
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TreeEnsemble":
+        """
+        Carrega um ensemble salvo por save
+
+        Raises:
+            ValueError: Se o formato do arquivo for mais novo que o suportado
+        """
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) > TREES_FORMAT_VERSION:
+                raise ValueError(
+                    f"Formato de árvores {int(data['format_version'])} não suportado "
+                    f"(máximo: {TREES_FORMAT_VERSION})"
+                )
+
+            return cls(
+                feature=data["feature"],
+                threshold=data["threshold"],
+                left=data["left"],
+                right=data["right"],
+                default_left=data["default_left"],
+                value=data["value"],
+                roots=data["roots"],
+                tree_class=data["tree_class"],
+                base_margin=data["base_margin"],
+                max_depth=int(data["max_depth"]),
+                objective=str(data["objective"])
+            )
@@ -0,0 +1,246 @@
+"""
+Busca de hiperparâmetros do XGBoost com validação walk-forward
+
+Cada candidato é avaliado em folds ordenados por temporada (treina nas
+temporadas anteriores, valida na seguinte), com early stopping em cada
+fold. A busca roda em rodadas, uma por fold, num pool de processos:
+depois de cada rodada só a melhor fração dos candidatos (pela logloss
+média até ali) segue para o próximo fold (successive halving). Os folds
+mais baratos (menos dados de treino) vêm primeiro, então a maior parte
+dos candidatos é descartada antes dos folds caros.
+"""
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+# Parâmetros fixos de todos os candidatos (classificação 1X2)
+BASE_PARAMS = {
+    "objective": "multi:softprob",
+    "num_class": 3,
+    "eval_metric": "mlogloss",
+    "random_state": 42
+}
+
+# Grade padrão da busca
+DEFAULT_PARAM_GRID = {
+    "max_depth": [3, 4, 6, 8],
+    "learning_rate": [0.03, 0.1],
+    "subsample": [0.7, 0.9],
+    "colsample_bytree": [0.6, 0.8, 1.0],
+    "min_child_weight": [1, 5]
+}
+
+# Estado de cada processo do pool (preenchido uma vez por _init_worker)
+_worker_data = {}
+
+
+def expand_grid(param_grid: Dict[str, list]) -> List[Dict]:
+    """Produto cartesiano da grade: {"a": [1, 2], "b": [3]} -> [{"a": 1, "b": 3}, {"a": 2, "b": 3}]"""
+    names = list(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+
+def walk_forward_folds(groups, n_folds: int = 3) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Folds walk-forward por grupo ordenado (ex: temporada)
+
+    O fold k valida no k-ésimo dos últimos n_folds grupos e treina em todos
+    os grupos anteriores, então nunca há vazamento do futuro para o passado.
+
+    Args:
+        groups: Array (N,) com o grupo de cada partida (ex: temporada)
+        n_folds: Número de folds
+
+    Returns:
+        Lista de (índices de treino, índices de validação), do fold mais
+        antigo (menos dados de treino) para o mais recente
+
+    Raises:
+        ValueError: Se não houver grupos suficientes
+    """
+    groups = np.asarray(groups)
+    ordered = np.unique(groups)
+
+    if len(ordered) < n_folds + 1:
+        raise ValueError(
+            f"São necessários pelo menos {n_folds + 1} grupos (temporadas) para "
+            f"{n_folds} folds walk-forward; encontrados {len(ordered)}"
+        )
+
+    return [
+        (np.flatnonzero(groups < group), np.flatnonzero(groups == group))
+        for group in ordered[-n_folds:]
+    ]
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, folds, threads: int, early_stopping_rounds: int):
+    """Inicializa um processo do pool: dados compartilhados e limite de threads"""
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+
+    _worker_data.update({
+        "X": X,
+        "y": y,
+        "folds": folds,
+        "threads": threads,
+        "early_stopping_rounds": early_stopping_rounds
+    })
+
+
+def _evaluate_fold(candidate_id: int, params: Dict, fold: int) -> Tuple[int, int, float, int]:
+    """
+    Treina um candidato num fold (executado nos processos do pool)
+
+    Returns:
+        (candidate_id, fold, logloss de validação, melhor iteração)
+    """
+    import xgboost as xgb
+
+    X, y = _worker_data["X"], _worker_data["y"]
+    train_idx, val_idx = _worker_data["folds"][fold]
+
+    model = xgb.XGBClassifier(
+        **params,
+        n_jobs=_worker_data["threads"],
+        early_stopping_rounds=_worker_data["early_stopping_rounds"]
+    )
+
+    try:
+        model.fit(
+            X[train_idx], y[train_idx],
+            eval_set=[(X[val_idx], y[val_idx])],
+            verbose=False
+        )
+    except Exception as e:
+        print(f"⚠️  Candidato {candidate_id}, fold {fold}: {e}")
+        return candidate_id, fold, math.inf, 0
+
+    return candidate_id, fold, float(model.best_score), int(model.best_iteration)
+
+
+class WalkForwardSearch:
+    """
+    Busca de hiperparâmetros em paralelo com folds walk-forward e poda
+    """
+
+    def __init__(
+        self,
+        param_grid: Dict[str, list] = None,
+        n_folds: int = 3,
+        n_workers: int = None,
+        threads_per_candidate: int = 1,
+        early_stopping_rounds: int = 30,
+        max_rounds: int = 1000,
+        keep_fraction: float = 0.5,
+        min_survivors: int = 2
+    ):
+        """
+        Args:
+            param_grid: Grade {parâmetro: [valores]} (padrão: DEFAULT_PARAM_GRID)
+            n_folds: Número de folds walk-forward
+            n_workers: Processos no pool (padrão: núcleos / threads_per_candidate)
+            threads_per_candidate: Threads do XGBoost por candidato
+            early_stopping_rounds: Rodadas sem melhora antes de parar cada fold
+            max_rounds: Máximo de árvores por fold (n_estimators)
+            keep_fraction: Fração dos candidatos mantida após cada fold
+            min_survivors: Mínimo de candidatos mantidos após cada fold
+        """
+        self.param_grid = param_grid or DEFAULT_PARAM_GRID
+        self.n_folds = n_folds
+        self.threads_per_candidate = threads_per_candidate
+        self.n_workers = n_workers or max((os.cpu_count() or 1) // threads_per_candidate, 1)
+        self.early_stopping_rounds = early_stopping_rounds
+        self.max_rounds = max_rounds
+        self.keep_fraction = keep_fraction
+        self.min_survivors = min_survivors
+
+        self.leaderboard = []
+
+    def run(self, X: np.ndarray, y: np.ndarray, groups) -> List[Dict]:
+        """
+        Executa a busca
+
+        Args:
+            X: Matriz de features (N, n_features)
+            y: Labels (0=away_win, 1=draw, 2=home_win)
+            groups: Temporada (ou outro grupo ordenado) de cada partida
+
+        Returns:
+            Leaderboard ordenado (melhor primeiro): params, logloss média,
+            logloss por fold, melhor número de árvores e fold de poda
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        y = np.asarray(y)
+        folds = walk_forward_folds(groups, self.n_folds)
+
+        candidates = {
+            candidate_id: {**BASE_PARAMS, **params, "n_estimators": self.max_rounds}
+            for candidate_id, params in enumerate(expand_grid(self.param_grid))
+        }
+        results = {candidate_id: {"losses": [], "best_iterations": []} for candidate_id in candidates}
+        pruned_at = {}
+
+        print(f"🔎 {len(candidates)} candidatos x {len(folds)} folds "
+              f"({self.n_workers} processos x {self.threads_per_candidate} threads)")
+
+        survivors = list(candidates)
+
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(X, y, folds, self.threads_per_candidate, self.early_stopping_rounds)
+        ) as pool:
+            for fold in range(len(folds)):
+                jobs = [pool.submit(_evaluate_fold, cid, candidates[cid], fold) for cid in survivors]
+
+                for job in jobs:
+                    candidate_id, _, loss, best_iteration = job.result()
+                    results[candidate_id]["losses"].append(loss)
+                    results[candidate_id]["best_iterations"].append(best_iteration)
+
+                survivors.sort(key=lambda cid: np.mean(results[cid]["losses"]))
+                best = survivors[0]
+                print(f"   Fold {fold + 1}/{len(folds)}: melhor logloss média "
+                      f"{np.mean(results[best]['losses']):.4f} ({len(survivors)} candidatos)")
+
+                # Poda: só a melhor fração segue para o próximo fold
+                if fold < len(folds) - 1:
+                    n_keep = max(math.ceil(len(survivors) * self.keep_fraction), self.min_survivors)
+                    for candidate_id in survivors[n_keep:]:
+                        pruned_at[candidate_id] = fold + 1
+                    survivors = survivors[:n_keep]
+
+        self.leaderboard = sorted(
+            (
+                {
+                    "candidate_id": candidate_id,
+                    "params": {
+                        k: v for k, v in candidates[candidate_id].items()
+                        if k not in BASE_PARAMS and k != "n_estimators"
+                    },
+                    "mean_logloss": float(np.mean(result["losses"])),
+                    "fold_loglosses": result["losses"],
+                    "folds_completed": len(result["losses"]),
+                    "best_n_estimators": int(np.mean(result["best_iterations"])) + 1,
+                    "pruned_after_fold": pruned_at.get(candidate_id)
+                }
+                for candidate_id, result in results.items()
+            ),
+            # Candidatos que completaram todos os folds primeiro
+            key=lambda entry: (-entry["folds_completed"], entry["mean_logloss"])
+        )
+
+        return self.leaderboard
+
+    @property
+    def best_params(self) -> Dict:
+        """Parâmetros completos do vencedor, com n_estimators da média do early stopping"""
+        if not self.leaderboard:
+            raise Exception("Busca não executada. Chame run antes de best_params.")
+
+        winner = self.leaderboard[0]
+        return {**BASE_PARAMS, **winner["params"], "n_estimators": winner["best_n_estimators"]}
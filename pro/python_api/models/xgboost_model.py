@@ -1,15 +1,94 @@
 """
 Modelo XGBoost para predições de apostas esportivas
 Suporta features enriquecidas com predições da API-Football
+
+xgboost, sklearn e joblib são importados sob demanda: scripts que importam
+este módulo mas nunca treinam nem fazem predições iniciam rápido. Modelos
+salvos no formato nativo levam também as árvores exportadas para NumPy
+(<nome>.trees.npz, ver tree_ensemble.py), e as predições de um processo de
+serviço não importam xgboost.
 """
-import xgboost as xgb
-import numpy as np
-import pandas as pd
-from typing import Dict, List, Tuple, Optional
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, log_loss
-import joblib
+import glob
+import hashlib
+import json
 import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Tuple, Optional
+
+import numpy as np
+
+from .tree_ensemble import TreeEnsemble
+
+
+# Versão do formato do metadado (sidecar) salvo junto do booster
+MODEL_FORMAT_VERSION = 1
+
+# Extensões do formato nativo do XGBoost (binário UBJSON ou JSON)
+NATIVE_EXTENSIONS = (".ubj", ".json")
+
+# Sufixo do arquivo de metadados salvo ao lado do booster
+METADATA_SUFFIX = ".meta.json"
+
+# Sufixo das árvores exportadas para o avaliador NumPy
+TREES_SUFFIX = ".trees.npz"
+
+# Features básicas de create_features, na ordem (as da API-Football vêm depois)
+BASE_FEATURE_NAMES = [
+    f"{side}_{name}"
+    for side in ("home", "away")
+    for name in (
+        "goals_scored_avg", "goals_conceded_avg", "wins", "draws", "losses",
+        "matches_played", "goals_for_total", "goals_against_total"
+    )
+] + [
+    "goals_scored_avg_diff",
+    "goals_conceded_avg_diff",
+    "wins_diff",
+    "home_points_per_game",
+    "away_points_per_game",
+]
+
+
+def metadata_path(model_path: str) -> str:
+    """Caminho do sidecar de metadados (ex: modelo.ubj -> modelo.meta.json)"""
+    return os.path.splitext(model_path)[0] + METADATA_SUFFIX
+
+
+def trees_path(model_path: str) -> str:
+    """Caminho das árvores exportadas (ex: modelo.ubj -> modelo.trees.npz)"""
+    return os.path.splitext(model_path)[0] + TREES_SUFFIX
+
+
+def find_latest_model(directory: str = "models/saved", prefix: str = "xgboost_with_api_") -> Optional[str]:
+    """
+    Encontra o modelo salvo mais recente (nativo .ubj/.json ou legado .pkl)
+
+    Args:
+        directory: Diretório dos modelos salvos
+        prefix: Prefixo dos arquivos de modelo
+
+    Returns:
+        Caminho do modelo mais recente, ou None se não houver
+    """
+    model_files = [
+        path for path in glob.glob(os.path.join(directory, f"{prefix}*"))
+        if path.endswith(NATIVE_EXTENSIONS + (".pkl",)) and not path.endswith((METADATA_SUFFIX, TREES_SUFFIX))
+    ]
+
+    if not model_files:
+        return None
+
+    return max(model_files, key=os.path.getctime)
+
+
+def training_data_hash(X: np.ndarray, y: np.ndarray) -> str:
+    """Hash (sha256 truncado) dos dados de treino, para rastrear a origem do modelo"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X, dtype=np.float32).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.int64).tobytes())
+
+    return digest.hexdigest()[:16]
 
 
 class XGBoostModel:
@@ -25,6 +104,10 @@ class XGBoostModel:
     - XGBoost aprende QUANTO peso dar a cada feature
     """
 
+    # Versão do cálculo das predições (entra na chave do cache de predições;
+    # incrementar quando create_features ou a conversão das saídas mudar)
+    prediction_version = 1
+
     def __init__(
         self,
         model_path: str = None,
@@ -39,16 +122,40 @@ class XGBoostModel:
             feature_extractor: APIPredictionFeatures para extrair features da API
             use_api_features: Se deve usar features da API-Football
         """
-        self.model = None
+        self._model = None
+        self._pending_path = None
+        self.trees = None
+        self._load_lock = threading.Lock()
         self.feature_names = []
         self.is_trained = False
         self.feature_extractor = feature_extractor
         self.use_api_features = use_api_features
+        self.metadata = {}
+        self.model_path = None
 
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
 
-    def create_features(self, match_stats: Dict, match_id: int = None) -> np.array:
+    @property
+    def model(self):
+        """XGBClassifier; no formato nativo, o booster só é lido no primeiro uso"""
+        if self._model is None and self._pending_path:
+            with self._load_lock:
+                if self._model is None and self._pending_path:
+                    self._model = self._load_booster(self._pending_path)
+                    self._pending_path = None
+
+        return self._model
+
+    @model.setter
+    def model(self, value):
+        self._model = value
+        self._pending_path = None
+
+        # Árvores exportadas correspondem ao booster anterior
+        self.trees = None
+
+    def create_features(self, match_stats: Dict, match_id: int = None, api_row: np.ndarray = None) -> np.array:
         """
         Cria features para o modelo
         NOVO: Agora inclui features da API-Football se disponível!
@@ -56,6 +163,7 @@ class XGBoostModel:
         Args:
             match_stats: Estatísticas da partida
             match_id: ID da partida (para buscar predições da API)
+            api_row: Features da API já carregadas (linha de get_features_for_matches)
 
         Returns:
             Array de features
@@ -99,13 +207,11 @@ class XGBoostModel:
 
         # ⭐ NOVO: Features da API-Football (se disponível)
         if self.use_api_features and self.feature_extractor and match_id:
-            api_features = self.feature_extractor.get_features_for_match(match_id)
+            if api_row is None:
+                api_row = self.feature_extractor.get_features_for_matches([match_id])[0]
 
-            # Adiciona features da API (com fallback para 0.5 se None)
-            for feature_name in self.feature_extractor.get_feature_names():
-                value = api_features.get(feature_name)
-                # Se None, usa 0.5 (neutro) para não influenciar
-                features.append(value if value is not None else 0.5)
+            # Adiciona features da API (ausentes = 0.5, neutro, para não influenciar)
+            features.extend(np.where(np.isnan(api_row), 0.5, api_row).tolist())
 
         # Se não está usando features da API mas o modelo foi treinado com elas,
         # adiciona features neutras para manter compatibilidade
@@ -116,13 +222,29 @@ class XGBoostModel:
 
         return np.array(features)
 
+    def expected_feature_names(self) -> List[str]:
+        """Nomes das features geradas por create_features na configuração atual"""
+        names = list(BASE_FEATURE_NAMES)
+        if self.use_api_features and self.feature_extractor:
+            names.extend(self.feature_extractor.get_feature_names())
+
+        return names
+
+    def feature_schema_version(self) -> Optional[int]:
+        """Versão do cálculo das features da API usadas (None = sem features da API)"""
+        if self.use_api_features and self.feature_extractor:
+            return getattr(self.feature_extractor, "schema_version", None)
+
+        return None
+
     def train(
         self,
         X_train: np.array,
         y_train: np.array,
         X_val: np.array = None,
         y_val: np.array = None,
-        params: Dict = None
+        params: Dict = None,
+        watermark: datetime = None
     ) -> Dict:
         """
         Treina o modelo XGBoost
@@ -133,6 +255,8 @@ class XGBoostModel:
             X_val: Features de validação (opcional)
             y_val: Labels de validação (opcional)
             params: Parâmetros do XGBoost
+            watermark: Data da partida mais recente nos dados de treino
+                (ponto de partida do próximo continue_training)
 
         Returns:
             Métricas de treinamento
@@ -150,6 +274,8 @@ class XGBoostModel:
                 "eval_metric": "mlogloss"
             }
 
+        import xgboost as xgb
+
         # Cria modelo
         self.model = xgb.XGBClassifier(**params)
 
@@ -167,6 +293,143 @@ class XGBoostModel:
 
         self.is_trained = True
 
+        # Nomes só quando a matriz veio de create_features na configuração atual
+        feature_names = self.expected_feature_names()
+        self.feature_names = feature_names if len(feature_names) == X_train.shape[1] else []
+
+        data_hash = training_data_hash(X_train, y_train)
+        self.metadata = {
+            "training_data_hash": data_hash,
+            "n_features": int(X_train.shape[1]),
+            "feature_names": self.feature_names,
+            "feature_schema_version": self.feature_schema_version(),
+            "n_samples": int(len(X_train)),
+            "params": params,
+            "watermark": watermark.isoformat() if watermark else None,
+            "lineage": [{
+                "mode": "full",
+                "training_data_hash": data_hash,
+                "n_samples": int(len(X_train)),
+                "rounds": int(params.get("n_estimators", 100)),
+                "watermark": watermark.isoformat() if watermark else None,
+                "trained_at": datetime.now().isoformat()
+            }]
+        }
+
+        return self._training_metrics(X_train, y_train, X_val, y_val)
+
+    def continue_training(
+        self,
+        X_new: np.array,
+        y_new: np.array,
+        n_rounds: int = 20,
+        X_val: np.array = None,
+        y_val: np.array = None,
+        watermark: datetime = None
+    ) -> Dict:
+        """
+        Treina rodadas adicionais a partir do booster atual (warm start)
+
+        Usa só as partidas novas (finalizadas depois do watermark do modelo)
+        e registra a linhagem nos metadados salvos com o modelo.
+
+        Args:
+            X_new: Features das partidas novas
+            y_new: Labels das partidas novas
+            n_rounds: Número de árvores (rodadas de boosting) adicionais
+            X_val: Features de validação (opcional)
+            y_val: Labels de validação (opcional)
+            watermark: Data da partida mais recente em X_new
+
+        Returns:
+            Métricas de treinamento
+
+        Raises:
+            ValueError: Se o esquema de features mudou (quantidade, nomes,
+                ordem ou versão do cálculo das features da API; use train
+                para um treino completo)
+        """
+        if not self.is_trained:
+            raise Exception("Modelo não treinado. Use train antes de continuar o treinamento.")
+
+        self._check_feature_schema(X_new)
+
+        import xgboost as xgb
+
+        # xgb.train aceita lotes sem todas as classes (o XGBClassifier.fit não).
+        # Parâmetros do treino original: o booster lido de .ubj não os expõe
+        # em get_xgb_params (viriam os padrões do xgboost)
+        if self.metadata.get("params"):
+            booster_params = {k: v for k, v in self.metadata["params"].items() if k != "n_estimators"}
+        else:
+            booster_params = {k: v for k, v in self.model.get_xgb_params().items() if v is not None}
+        parent_booster = self.model.get_booster()
+        parent_rounds = parent_booster.num_boosted_rounds()
+
+        booster = xgb.train(
+            booster_params,
+            xgb.DMatrix(X_new, label=y_new),
+            num_boost_round=n_rounds,
+            xgb_model=parent_booster
+        )
+
+        model = xgb.XGBClassifier()
+        model.load_model(bytearray(booster.save_raw("ubj")))
+        self.model = model
+
+        data_hash = training_data_hash(X_new, y_new)
+        self.metadata.update({
+            "training_data_hash": data_hash,
+            "n_features": int(X_new.shape[1]),
+            "n_samples": int(len(X_new)),
+            "parent_training_data_hash": self.metadata.get("training_data_hash"),
+            "watermark": watermark.isoformat() if watermark else self.metadata.get("watermark")
+        })
+        self.metadata.setdefault("lineage", []).append({
+            "mode": "incremental",
+            "training_data_hash": data_hash,
+            "n_samples": int(len(X_new)),
+            "rounds": int(n_rounds),
+            "parent_rounds": int(parent_rounds),
+            "watermark": self.metadata["watermark"],
+            "trained_at": datetime.now().isoformat()
+        })
+
+        return self._training_metrics(X_new, y_new, X_val, y_val)
+
+    def _check_feature_schema(self, X_new: np.ndarray):
+        """
+        Garante que X_new tem o esquema de features do modelo treinado
+
+        Compara o que o modelo registrou no treino (modelos antigos podem
+        não ter nomes nem versão registrados; nesse caso só a quantidade).
+
+        Raises:
+            ValueError: Se quantidade, nomes/ordem ou versão das features mudaram
+        """
+        expected_features = self.metadata.get("n_features") or getattr(self.model, "n_features_in_", None)
+        if expected_features is not None and X_new.shape[1] != expected_features:
+            raise ValueError(
+                f"Esquema de features mudou ({expected_features} -> {X_new.shape[1]}); "
+                "é necessário um treino completo"
+            )
+
+        trained_names = self.metadata.get("feature_names") or self.feature_names
+        if trained_names and list(trained_names) != self.expected_feature_names():
+            raise ValueError("Nomes ou ordem das features mudaram; é necessário um treino completo")
+
+        if "feature_schema_version" in self.metadata:
+            trained_version = self.metadata["feature_schema_version"]
+            if trained_version != self.feature_schema_version():
+                raise ValueError(
+                    f"Versão das features da API mudou ({trained_version} -> {self.feature_schema_version()}); "
+                    "é necessário um treino completo"
+                )
+
+    def _training_metrics(self, X_train, y_train, X_val=None, y_val=None) -> Dict:
+        """Acurácia de treino (e de validação, se houver)"""
+        from sklearn.metrics import accuracy_score
+
         # Calcula métricas
         train_pred = self.model.predict(X_train)
         train_acc = accuracy_score(y_train, train_pred)
@@ -183,6 +446,34 @@ class XGBoostModel:
 
         return metrics
 
+    def create_feature_matrix(
+        self,
+        matches_stats: List[Dict],
+        match_ids: List[Optional[int]] = None
+    ) -> np.ndarray:
+        """
+        Monta a matriz de features de N partidas
+
+        Args:
+            matches_stats: Lista de estatísticas das partidas
+            match_ids: IDs das partidas, alinhados com matches_stats (opcional)
+
+        Returns:
+            Matriz float32 (N, n_features)
+        """
+        if match_ids is None:
+            match_ids = [None] * len(matches_stats)
+
+        # Features da API de todas as partidas de uma vez (em vez de uma consulta por partida)
+        api_rows = [None] * len(matches_stats)
+        if self.use_api_features and self.feature_extractor and any(match_ids):
+            api_rows = self.feature_extractor.get_features_for_matches(match_ids)
+
+        return np.vstack([
+            self.create_features(match_stats, match_id=match_id, api_row=api_row)
+            for match_stats, match_id, api_row in zip(matches_stats, match_ids, api_rows)
+        ]).astype(np.float32)
+
     def predict(self, match_stats: Dict, match_id: int = None) -> Dict:
         """
         Faz predição para uma partida
@@ -194,33 +485,94 @@ class XGBoostModel:
         Returns:
             Probabilidades de resultado
         """
+        batch = self.predict_batch([match_stats], [match_id])
+
+        return self.to_predictions(batch)[0]
+
+    def predict_batch(
+        self,
+        matches_stats: List[Dict],
+        match_ids: List[Optional[int]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Faz predição para N partidas com uma única chamada ao booster
+
+        O custo fixo de cada chamada ao XGBoost é bem maior que a avaliação
+        das árvores, então prever o lote inteiro de uma vez é muito mais
+        rápido que chamar predict partida a partida.
+
+        Args:
+            matches_stats: Lista de estatísticas das partidas
+            match_ids: IDs das partidas, alinhados com matches_stats (opcional)
+
+        Returns:
+            Dicionário colunar com arrays (N,) alinhados à entrada:
+            "home_win", "draw", "away_win" e "api_features_used"
+        """
         if not self.is_trained:
             raise Exception("Modelo não treinado. Treine o modelo antes de fazer predições.")
 
-        # Cria features (agora com API-Football se disponível!)
-        features = self.create_features(match_stats, match_id=match_id)
-        features = features.reshape(1, -1)
-
-        # Predição
-        probs = self.model.predict_proba(features)[0]
-
-        # probs[0] = away_win, probs[1] = draw, probs[2] = home_win
-        result = {
-            "model": "XGBoost" + (" + API Features" if self.use_api_features else ""),
-            "result": {
-                "home_win": float(probs[2]),
-                "draw": float(probs[1]),
-                "away_win": float(probs[0])
+        if match_ids is None:
+            match_ids = [None] * len(matches_stats)
+
+        if not matches_stats:
+            empty = np.empty(0, dtype=np.float32)
+            return {
+                "home_win": empty,
+                "draw": empty,
+                "away_win": empty,
+                "api_features_used": np.empty(0, dtype=bool)
             }
-        }
 
-        # Se usou features da API, indica
-        if self.use_api_features and self.feature_extractor and match_id:
-            result["api_features_used"] = True
+        # Cria features (agora com API-Football se disponível!)
+        features = self.create_feature_matrix(matches_stats, match_ids)
+
+        # Predição (avaliador NumPy quando as árvores exportadas estão carregadas)
+        if self.trees is not None:
+            probs = self.trees.predict_proba(features)
         else:
-            result["api_features_used"] = False
+            probs = self.model.predict_proba(features)
 
-        return result
+        # probs[:, 0] = away_win, probs[:, 1] = draw, probs[:, 2] = home_win
+        return {
+            "home_win": probs[:, 2],
+            "draw": probs[:, 1],
+            "away_win": probs[:, 0],
+            "api_features_used": np.array([
+                bool(self.use_api_features and self.feature_extractor and match_id)
+                for match_id in match_ids
+            ])
+        }
+
+    def to_predictions(self, batch: Dict[str, np.ndarray]) -> List[Dict]:
+        """
+        Converte o resultado de predict_batch em predições por partida
+
+        Cada item tem o mesmo formato de predict e pode ser repassado ao
+        EnsembleModel (model_predictions) sem chamar o modelo de novo.
+
+        Args:
+            batch: Resultado de predict_batch
+
+        Returns:
+            Lista de predições, na mesma ordem do lote
+        """
+        model_name = "XGBoost" + (" + API Features" if self.use_api_features else "")
+
+        return [
+            {
+                "model": model_name,
+                "result": {
+                    "home_win": float(home_win),
+                    "draw": float(draw),
+                    "away_win": float(away_win)
+                },
+                "api_features_used": bool(api_used)
+            }
+            for home_win, draw, away_win, api_used in zip(
+                batch["home_win"], batch["draw"], batch["away_win"], batch["api_features_used"]
+            )
+        ]
 
     def predict_goals(self, match_stats: Dict) -> Dict:
         """
@@ -250,34 +602,123 @@ class XGBoostModel:
         }
 
     def save_model(self, path: str):
-        """Salva modelo treinado"""
+        """
+        Salva modelo treinado
+
+        Extensão .ubj ou .json: booster no formato nativo do XGBoost mais um
+        sidecar <nome>.meta.json (features, versão, hash dos dados de treino,
+        uso de features da API) e as árvores exportadas <nome>.trees.npz.
+        Extensão .pkl: formato legado (joblib).
+
+        Args:
+            path: Caminho do arquivo (ex: models/saved/xgboost_with_api_X.ubj)
+        """
         if not self.is_trained:
             raise Exception("Modelo não treinado")
 
-        joblib.dump({
-            "model": self.model,
-            "feature_names": self.feature_names,
-            "is_trained": self.is_trained,
-            "use_api_features": self.use_api_features
-        }, path)
+        if path.endswith(".pkl"):
+            import joblib
+
+            joblib.dump({
+                "model": self.model,
+                "feature_names": self.feature_names,
+                "is_trained": self.is_trained,
+                "use_api_features": self.use_api_features
+            }, path)
+        else:
+            import xgboost as xgb
+
+            self.model.save_model(path)
+
+            self.metadata.update({
+                "format_version": MODEL_FORMAT_VERSION,
+                "xgboost_version": xgb.__version__,
+                "feature_names": self.feature_names,
+                "use_api_features": self.use_api_features,
+                "saved_at": datetime.now().isoformat()
+            })
+            with open(metadata_path(path), "w") as f:
+                json.dump(self.metadata, f, indent=2, default=str)
+
+            self.export_trees(path)
 
         print(f"Modelo salvo em: {path}")
         if self.use_api_features:
             print("  ⭐ Modelo usa features da API-Football!")
 
     def load_model(self, path: str):
-        """Carrega modelo treinado"""
-        data = joblib.load(path)
-        self.model = data["model"]
-        self.feature_names = data.get("feature_names", [])
-        self.is_trained = data.get("is_trained", True)
-        self.use_api_features = data.get("use_api_features", False)
+        """
+        Carrega modelo treinado
+
+        No formato nativo, só o sidecar de metadados (e as árvores exportadas,
+        se existirem) é lido aqui; o booster é carregado no primeiro acesso a
+        self.model (treino, importância das features ou predição de modelos
+        sem árvores exportadas).
+        """
+        if path.endswith(".pkl"):
+            import joblib
+
+            data = joblib.load(path)
+
+            # Formato legado não tem metadados: nada do modelo anterior (esquema, linhagem) vale aqui
+            self.metadata = {}
+            self.model = data["model"]
+            self.feature_names = data.get("feature_names", [])
+            self.is_trained = data.get("is_trained", True)
+            self.use_api_features = data.get("use_api_features", False)
+        else:
+            with open(metadata_path(path)) as f:
+                self.metadata = json.load(f)
+
+            if self.metadata.get("format_version", 0) > MODEL_FORMAT_VERSION:
+                raise ValueError(
+                    f"Formato de modelo {self.metadata['format_version']} não suportado "
+                    f"(máximo: {MODEL_FORMAT_VERSION})"
+                )
+
+            # Pelo setter: descarta também as árvores exportadas do modelo anterior
+            self.model = None
+            self._pending_path = path
+            self.feature_names = self.metadata.get("feature_names", [])
+            self.is_trained = True
+            self.use_api_features = self.metadata.get("use_api_features", False)
+
+            if os.path.exists(trees_path(path)):
+                self.trees = TreeEnsemble.load(trees_path(path))
+
+        self.model_path = path
 
         print(f"Modelo carregado de: {path}")
         if self.use_api_features:
             print("  ⭐ Modelo usa features da API-Football!")
             print("  ℹ️  Configure o feature_extractor antes de fazer predições")
 
+    def export_trees(self, path: str):
+        """
+        Exporta o booster para o avaliador NumPy (<nome>.trees.npz)
+
+        Usado por save_model; também serve para modelos salvos antes da
+        exportação existir (ver manage_models.py export).
+
+        Args:
+            path: Caminho do modelo (.ubj/.json)
+        """
+        if not self.is_trained:
+            raise Exception("Modelo não treinado")
+
+        trees = TreeEnsemble.from_booster(self.model)
+        trees.save(trees_path(path))
+        self.trees = trees
+
+    def _load_booster(self, path: str):
+        """Lê o booster no formato nativo (.ubj/.json)"""
+        import xgboost as xgb
+
+        model = xgb.XGBClassifier()
+        model.load_model(path)
+
+        return model
+
     def get_feature_importance(self) -> Dict:
         """Retorna importância das features"""
         if not self.is_trained:
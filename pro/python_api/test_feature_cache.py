@@ -0,0 +1,100 @@
+"""
+Testes do cache de features de treino (features/feature_cache.py)
+
+Usa um banco SQLite e um diretório de cache temporários (sem chamadas à API).
+
+Uso:
+    python test_feature_cache.py
+    python -m pytest -q test_feature_cache.py
+"""
+import os
+import sys
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data.database_v2 import Database, Match
+from features.api_predictions_features import APIPredictionFeatures
+from features.feature_cache import FeatureCache
+from models.xgboost_model import BASE_FEATURE_NAMES
+
+
+def _seed(db: Database, n_matches: int = 60):
+    """Partidas finalizadas entre 6 times, uma por dia"""
+    teams = [f"Time {i}" for i in range(6)]
+    db.bulk_save_matches([
+        {
+            "match_id_apif": 500000 + n,
+            "competition": "Teste",
+            "season": 2024,
+            "home_team": teams[n % 6],
+            "away_team": teams[(n + 1 + (n // 6) % 5) % 6],
+            "match_date": datetime(2024, 1, 1) + timedelta(days=n),
+            "status": "FINISHED",
+            "home_score": n % 3,
+            "away_score": n % 2
+        }
+        for n in range(n_matches)
+    ])
+
+
+def _setup():
+    directory = tempfile.mkdtemp(prefix="feature_cache_test_")
+    db = Database(os.path.join(directory, "test.db"))
+    _seed(db)
+
+    return directory, db
+
+
+def test_cache_without_new_rows():
+    """Snapshot sem partidas novas (última partida deixou de ser finalizada)"""
+    directory, db = _setup()
+    try:
+        extractor = APIPredictionFeatures(db)
+        cache_dir = os.path.join(directory, "cache")
+        n_features = len(BASE_FEATURE_NAMES) + extractor.get_feature_count()
+
+        data = FeatureCache(db, extractor, cache_dir=cache_dir).load()
+        assert data["X"].shape == (60, n_features)
+
+        # Última partida remarcada: o prefixo inteiro é reaproveitado, nada a calcular
+        last = db.session.query(Match).order_by(Match.match_date.desc()).first()
+        last.status = "POSTPONED"
+        db.session.commit()
+
+        data = FeatureCache(db, extractor, cache_dir=cache_dir).load()
+        assert data["recomputed"] == 0
+        assert data["X"].shape == (59, n_features)
+    finally:
+        db.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_schema_key_tracks_api_features():
+    """Versão ou nomes das features da API mudam a chave do esquema (cache novo)"""
+    directory, db = _setup()
+    try:
+        extractor = APIPredictionFeatures(db)
+        key = FeatureCache(db, extractor).schema_key
+
+        assert FeatureCache(db, extractor).schema_key == key
+        assert FeatureCache(db, None).schema_key != key
+
+        extractor.schema_version = extractor.schema_version + 1
+        assert FeatureCache(db, extractor).schema_key != key
+    finally:
+        db.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    """Roda os testes sem pytest"""
+    for test in (test_cache_without_new_rows, test_schema_key_tracks_api_features):
+        test()
+        print(f"✅ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()
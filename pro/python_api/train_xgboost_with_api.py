@@ -7,16 +7,65 @@ Este script treina o modelo XGBoost usando:
 
 Uso:
     python train_xgboost_with_api.py
+    python train_xgboost_with_api.py --incremental --rounds 20
+    python train_xgboost_with_api.py --activate
+
+No modo incremental, só as partidas finalizadas depois do watermark do
+modelo ativo são usadas para treinar rodadas adicionais a partir do booster
+existente. Se o esquema de features mudou (ou não há modelo base), cai
+automaticamente para o treino completo.
 """
+import argparse
 import numpy as np
+import pandas as pd
 from data.database_v2 import Database
 from features.api_predictions_features import APIPredictionFeatures
+from features.feature_cache import FeatureCache
 from models.xgboost_model import XGBoostModel
+from models.registry import ModelRegistry, RegisteredModel
 from sklearn.model_selection import train_test_split
 from datetime import datetime
 import os
 
 
+def load_labeled_matches(db: Database, feature_extractor: APIPredictionFeatures, since: datetime = None):
+    """
+    Monta features e labels das partidas finalizadas
+
+    Args:
+        db: Instância do Database
+        feature_extractor: Extrator de features da API
+        since: Só partidas com match_date posterior (watermark do modelo)
+
+    Returns:
+        X, y, watermark (match_date mais recente usada, ou None) e
+        seasons (temporada de cada linha de X, para folds walk-forward)
+    """
+    # Features de todo o histórico (cache em disco; só partidas novas são recalculadas)
+    data = FeatureCache(db, feature_extractor).load()
+
+    rows = slice(None)
+    if since is not None:
+        rows = data["match_dates"] > np.datetime64(since)
+
+    X = data["X"][rows]
+    y = data["y"][rows]
+    seasons = data["seasons"][rows]
+    match_dates = data["match_dates"][rows]
+
+    print(f"\n✓ Encontradas {len(X)} partidas finalizadas" + (f" desde {since}" if since else ""))
+
+    if len(X) == 0:
+        return X, y, None, seasons
+
+    watermark = pd.Timestamp(match_dates.max()).to_pydatetime()
+
+    print(f"\n✓ Partidas processadas: {len(X)} ({data['recomputed']} recalculadas)")
+    print(f"✓ Partidas com predições da API: {int(data['has_api'][rows].sum())}")
+
+    return X, y, watermark, seasons
+
+
 def prepare_training_data(db: Database, feature_extractor: APIPredictionFeatures):
     """
     Prepara dados de treinamento a partir do banco de dados
@@ -26,101 +75,21 @@ def prepare_training_data(db: Database, feature_extractor: APIPredictionFeatures
         feature_extractor: Extrator de features da API
 
     Returns:
-        X_train, X_val, y_train, y_val
+        X_train, X_val, y_train, y_val, watermark
     """
     print("=" * 70)
     print("PREPARANDO DADOS DE TREINAMENTO")
     print("=" * 70)
 
-    # Buscar partidas finalizadas com resultado
-    matches = db.session.query(db.engine.table_names)
-    from data.database_v2 import Match
-
-    matches = db.session.query(Match).filter(
-        Match.status == "FINISHED",
-        Match.home_score.isnot(None),
-        Match.away_score.isnot(None)
-    ).all()
+    X, y, watermark, _ = load_labeled_matches(db, feature_extractor)
 
-    print(f"\n✓ Encontradas {len(matches)} partidas finalizadas")
-
-    if len(matches) < 50:
+    if len(X) < 50:
         print("\n⚠️  AVISO: Poucas partidas para treinamento!")
         print(f"   Recomendado: 500+ partidas")
-        print(f"   Encontradas: {len(matches)}")
+        print(f"   Encontradas: {len(X)}")
         print(f"\n   Execute collect_historical_data.py para coletar mais dados")
-        return None, None, None, None
-
-    # Criar modelo temporário para gerar features
-    temp_model = XGBoostModel(feature_extractor=feature_extractor, use_api_features=True)
-
-    X = []
-    y = []
-    matches_processed = 0
-    matches_with_api = 0
+        return None, None, None, None, None
 
-    print("\nProcessando partidas...")
-
-    for match in matches:
-        try:
-            # Calcular estatísticas do time (simplificado para exemplo)
-            # Em produção, você deve calcular estatísticas reais dos últimos N jogos
-            home_stats = {
-                "goals_scored_avg": 1.5,
-                "goals_conceded_avg": 1.2,
-                "wins": 5,
-                "draws": 3,
-                "losses": 2,
-                "matches_played": 10,
-                "goals_for_total": 15,
-                "goals_against_total": 12
-            }
-
-            away_stats = {
-                "goals_scored_avg": 1.3,
-                "goals_conceded_avg": 1.4,
-                "wins": 4,
-                "draws": 4,
-                "losses": 2,
-                "matches_played": 10,
-                "goals_for_total": 13,
-                "goals_against_total": 14
-            }
-
-            match_stats = {"home": home_stats, "away": away_stats}
-
-            # Criar features (inclui API features se disponível)
-            features = temp_model.create_features(match_stats, match_id=match.id)
-
-            # Verificar se tem predição da API para esta partida
-            api_features = feature_extractor.get_features_for_match(match.id)
-            if api_features.get("api_home_win_prob") is not None:
-                matches_with_api += 1
-
-            # Label: 0=away_win, 1=draw, 2=home_win
-            if match.home_score > match.away_score:
-                label = 2  # home_win
-            elif match.home_score < match.away_score:
-                label = 0  # away_win
-            else:
-                label = 1  # draw
-
-            X.append(features)
-            y.append(label)
-            matches_processed += 1
-
-            if matches_processed % 100 == 0:
-                print(f"  Processadas: {matches_processed}/{len(matches)}")
-
-        except Exception as e:
-            # Pula partidas com erro
-            continue
-
-    X = np.array(X)
-    y = np.array(y)
-
-    print(f"\n✓ Partidas processadas: {matches_processed}")
-    print(f"✓ Partidas com predições da API: {matches_with_api}")
     print(f"✓ Features por partida: {X.shape[1]}")
     print(f"  - Features básicas: 21")
     print(f"  - Features da API: {X.shape[1] - 21}")
@@ -140,19 +109,20 @@ def prepare_training_data(db: Database, feature_extractor: APIPredictionFeatures
     print(f"\n✓ Treino: {len(X_train)} partidas")
     print(f"✓ Validação: {len(X_val)} partidas")
 
-    return X_train, X_val, y_train, y_val
+    return X_train, X_val, y_train, y_val, watermark
 
 
-def train_model(X_train, X_val, y_train, y_val, db: Database):
+def train_model(X_train, X_val, y_train, y_val, db: Database, watermark=None):
     """
     Treina o modelo XGBoost
 
     Args:
         X_train, X_val, y_train, y_val: Dados de treino/validação
         db: Database instance
+        watermark: Data da partida mais recente nos dados de treino
 
     Returns:
-        Modelo treinado
+        Tupla (modelo treinado, métricas)
     """
     print("\n" + "=" * 70)
     print("TREINANDO MODELO XGBOOST")
@@ -185,7 +155,7 @@ def train_model(X_train, X_val, y_train, y_val, db: Database):
         print(f"  {key}: {value}")
 
     print("\nTreinando...")
-    metrics = model.train(X_train, y_train, X_val, y_val, params)
+    metrics = model.train(X_train, y_train, X_val, y_val, params, watermark=watermark)
 
     print("\n✓ Treinamento concluído!")
     print(f"\nMétricas:")
@@ -193,7 +163,51 @@ def train_model(X_train, X_val, y_train, y_val, db: Database):
     if 'val_accuracy' in metrics:
         print(f"  Acurácia (validação): {metrics['val_accuracy']:.2%}")
 
-    return model
+    return model, metrics
+
+
+def continue_training(db: Database, feature_extractor: APIPredictionFeatures, rounds: int):
+    """
+    Treina rodadas adicionais no modelo ativo com as partidas novas
+
+    Args:
+        db: Instância do Database
+        feature_extractor: Extrator de features da API
+        rounds: Número de rodadas de boosting adicionais
+
+    Returns:
+        Tupla (modelo, métricas); (None, None) se não houver partidas novas
+
+    Raises:
+        ValueError: Se não houver modelo base utilizável ou o esquema de
+            features mudou (requer treino completo)
+    """
+    print("=" * 70)
+    print("TREINAMENTO INCREMENTAL (WARM START)")
+    print("=" * 70)
+
+    base = RegisteredModel(ModelRegistry(db), feature_extractor=feature_extractor, use_api_features=True)
+    model = base.current
+    if model is None:
+        raise ValueError("Nenhuma versão ativa no registro para continuar o treinamento")
+
+    watermark = model.metadata.get("watermark")
+    if not watermark:
+        raise ValueError("Modelo ativo não tem watermark (treinado antes do modo incremental)")
+
+    print(f"\n✓ Modelo base: v{base.version} (watermark {watermark})")
+
+    X_new, y_new, new_watermark, _ = load_labeled_matches(db, feature_extractor, since=datetime.fromisoformat(watermark))
+    if len(X_new) == 0:
+        return None, None
+
+    print(f"\nTreinando +{rounds} rodadas com {len(X_new)} partidas novas...")
+    metrics = model.continue_training(X_new, y_new, n_rounds=rounds, watermark=new_watermark)
+    metrics["base_version"] = base.version
+
+    print(f"\n✓ Acurácia (partidas novas): {metrics['train_accuracy']:.2%}")
+
+    return model, metrics
 
 
 def save_model(model: XGBoostModel):
@@ -212,7 +226,7 @@ def save_model(model: XGBoostModel):
 
     # Nome do arquivo com timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"models/saved/xgboost_with_api_{timestamp}.pkl"
+    filename = f"models/saved/xgboost_with_api_{timestamp}.ubj"
 
     model.save_model(filename)
 
@@ -225,6 +239,14 @@ def save_model(model: XGBoostModel):
 
 def main():
     """Função principal"""
+    parser = argparse.ArgumentParser(description="Treina o XGBoost com features da API-Football")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Continua o modelo ativo só com as partidas novas (cai para treino completo se necessário)")
+    parser.add_argument("--rounds", type=int, default=20, help="Rodadas adicionais no modo incremental")
+    parser.add_argument("--activate", action="store_true",
+                        help="Ativa a nova versão no registro (API e pipeline em execução trocam a quente)")
+    args = parser.parse_args()
+
     print("\n" + "=" * 70)
     print("TREINAMENTO DO XGBOOST COM FEATURES DA API-FOOTBALL")
     print("=" * 70)
@@ -245,21 +267,35 @@ def main():
     feature_extractor = APIPredictionFeatures(db)
     print(f"   ✓ {feature_extractor.get_feature_count()} features da API disponíveis")
 
-    # Prepara dados
-    print("\n3. Preparando dados de treinamento...")
-    X_train, X_val, y_train, y_val = prepare_training_data(db, feature_extractor)
-
-    if X_train is None:
-        print("\n❌ Dados insuficientes para treinamento")
-        print("\nExecute primeiro:")
-        print("  1. collect_historical_data.py - coletar partidas históricas")
-        print("  2. collect_predictions.py - coletar predições da API")
-        db.close()
-        return
-
-    # Treina modelo
-    print("\n4. Treinando modelo...")
-    model = train_model(X_train, X_val, y_train, y_val, db)
+    model = None
+    if args.incremental:
+        print("\n3-4. Continuando o modelo ativo com as partidas novas...")
+        try:
+            model, metrics = continue_training(db, feature_extractor, args.rounds)
+            if model is None:
+                print("\nℹ️  Nenhuma partida nova desde o último treino, nada a fazer")
+                db.close()
+                return
+        except ValueError as e:
+            print(f"\n⚠️  {e}")
+            print("   Fazendo treino completo...")
+
+    if model is None:
+        # Prepara dados
+        print("\n3. Preparando dados de treinamento...")
+        X_train, X_val, y_train, y_val, watermark = prepare_training_data(db, feature_extractor)
+
+        if X_train is None:
+            print("\n❌ Dados insuficientes para treinamento")
+            print("\nExecute primeiro:")
+            print("  1. collect_historical_data.py - coletar partidas históricas")
+            print("  2. collect_predictions.py - coletar predições da API")
+            db.close()
+            return
+
+        # Treina modelo
+        print("\n4. Treinando modelo...")
+        model, metrics = train_model(X_train, X_val, y_train, y_val, db, watermark=watermark)
 
     # Mostra importância das features
     print("\n5. Analisando importância das features...")
@@ -274,6 +310,10 @@ def main():
     print("\n6. Salvando modelo...")
     model_path = save_model(model)
 
+    # Registra a nova versão; só com --activate API e pipeline em execução trocam a quente
+    version = ModelRegistry(db).register(model_path, metrics, activate=args.activate)
+    print(f"   ✓ Registrado como versão {version}{' (ativa)' if args.activate else ''}")
+
     db.close()
 
     print("\n" + "=" * 70)
@@ -281,9 +321,11 @@ def main():
     print("=" * 70)
     print(f"\nModelo salvo em: {model_path}")
     print("\nPróximos passos:")
-    print("  1. Use o modelo no ensemble:")
-    print(f'     xgb = XGBoostModel(model_path="{model_path}")')
-    print("     ensemble.add_model('xgboost', xgb)")
+    if args.activate:
+        print("  1. A API e o pipeline já usam a nova versão (registro de modelos)")
+        print("     Para voltar a uma versão anterior: python manage_models.py activate <versão>")
+    else:
+        print("  1. Valide a nova versão e ative: python manage_models.py activate " + str(version))
     print("  2. Compare performance com modelo sem API features")
     print("  3. Execute backtesting para validar melhorias")
     print("=" * 70 + "\n")
@@ -0,0 +1,106 @@
+"""
+Busca de hiperparâmetros do XGBoost (walk-forward por temporada, em paralelo)
+
+Avalia a grade de parâmetros (models/tuning.py) com folds ordenados por
+temporada e early stopping, descartando os piores candidatos a cada fold.
+Depois treina o vencedor com todas as partidas e salva:
+- models/saved/tuning_<timestamp>/leaderboard.json
+- models/saved/xgboost_with_api_<timestamp>.ubj (registrado no registro de modelos)
+
+Uso:
+    python tune_xgboost.py
+    python tune_xgboost.py --folds 3 --workers 8 --threads 1 --activate
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data.database_v2 import Database
+from features.api_predictions_features import APIPredictionFeatures
+from models.xgboost_model import XGBoostModel
+from models.registry import ModelRegistry
+from models.tuning import WalkForwardSearch, expand_grid
+from train_xgboost_with_api import load_labeled_matches
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros do XGBoost (walk-forward)")
+    parser.add_argument("--folds", type=int, default=3, help="Folds walk-forward (temporadas de validação)")
+    parser.add_argument("--workers", type=int, default=None, help="Processos em paralelo (padrão: núcleos)")
+    parser.add_argument("--threads", type=int, default=1, help="Threads do XGBoost por candidato")
+    parser.add_argument("--keep", type=float, default=0.5, help="Fração de candidatos mantida a cada fold")
+    parser.add_argument("--early-stopping", type=int, default=30, help="Rodadas sem melhora antes de parar")
+    parser.add_argument("--activate", action="store_true", help="Ativa o modelo vencedor no registro")
+    parser.add_argument("--db", default="database/betting_v2.db", help="Caminho do banco")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BUSCA DE HIPERPARÂMETROS - XGBOOST (WALK-FORWARD)")
+    print("=" * 70)
+
+    db = Database(args.db)
+    feature_extractor = APIPredictionFeatures(db)
+
+    X, y, watermark, seasons = load_labeled_matches(db, feature_extractor)
+    if len(X) == 0:
+        print("\n❌ Nenhuma partida finalizada para a busca")
+        db.close()
+        return
+
+    search = WalkForwardSearch(
+        n_folds=args.folds,
+        n_workers=args.workers,
+        threads_per_candidate=args.threads,
+        early_stopping_rounds=args.early_stopping,
+        keep_fraction=args.keep
+    )
+    print(f"\n✓ {len(X)} partidas, temporadas {sorted(set(seasons.tolist()))}")
+    print(f"✓ Grade: {len(expand_grid(search.param_grid))} candidatos\n")
+
+    try:
+        started = datetime.now()
+        leaderboard = search.run(X, y, seasons)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        db.close()
+        return
+
+    elapsed = (datetime.now() - started).total_seconds()
+
+    # Leaderboard
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = f"models/saved/tuning_{timestamp}"
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "leaderboard.json"), "w") as f:
+        json.dump({"elapsed_seconds": elapsed, "leaderboard": leaderboard}, f, indent=2)
+
+    print(f"\n🏆 Top 5 ({elapsed:.0f}s):")
+    for entry in leaderboard[:5]:
+        print(f"   logloss {entry['mean_logloss']:.4f}  árvores {entry['best_n_estimators']:4d}  {entry['params']}")
+
+    # Treina o vencedor com todas as partidas
+    print("\nTreinando o vencedor com todas as partidas...")
+    model = XGBoostModel(feature_extractor=feature_extractor, use_api_features=True)
+    metrics = model.train(X, y, params=search.best_params, watermark=watermark)
+    metrics["walk_forward_logloss"] = leaderboard[0]["mean_logloss"]
+    model.metadata["tuning_leaderboard"] = os.path.join(output_dir, "leaderboard.json")
+
+    model_path = f"models/saved/xgboost_with_api_{timestamp}.ubj"
+    model.save_model(model_path)
+
+    version = ModelRegistry(db).register(model_path, metrics, activate=args.activate)
+    print(f"\n✅ Vencedor salvo: {model_path} (v{version}{', ativa' if args.activate else ''})")
+    print(f"   Leaderboard: {output_dir}/leaderboard.json")
+    if not args.activate:
+        print(f"   Para ativar: python manage_models.py activate {version}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
 """
 Modelo de Distribuição de Poisson para previsão de gols em partidas de futebol
 """
-import numpy as np
-from scipy.stats import poisson
+import os
+import sys
 from typing import Dict, Tuple
 
+# Núcleo numérico compartilhado com as edições lite e pro (poisson_core/ na raiz do repositório)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from poisson_core import MarketLadder, btts_no_probability, most_likely_score, score_matrix
+
 
 class PoissonModel:
     """
@@ -94,89 +99,39 @@ class PoissonModel:
         Returns:
             Dicionário com probabilidades de diferentes mercados
         """
-        # Matriz de probabilidades de placares
-        score_matrix = np.zeros((max_goals + 1, max_goals + 1))
-        
-        for home_goals in range(max_goals + 1):
-            for away_goals in range(max_goals + 1):
-                score_matrix[home_goals, away_goals] = (
-                    poisson.pmf(home_goals, home_goals_exp) *
-                    poisson.pmf(away_goals, away_goals_exp)
-                )
-        
+        # Matriz de probabilidades de placares (0..max_goals para cada time)
+        scores = score_matrix(home_goals_exp, away_goals_exp, max_goals=max_goals + 1)
+        ladder = MarketLadder(scores)
+
         # Probabilidades de resultado (1x2)
-        home_win = np.sum(np.tril(score_matrix, -1))
-        draw = np.sum(np.diag(score_matrix))
-        away_win = np.sum(np.triu(score_matrix, 1))
-        
-        # Over/Under 2.5 gols
-        over_2_5 = 0
-        under_2_5 = 0
-        for home_goals in range(max_goals + 1):
-            for away_goals in range(max_goals + 1):
-                total_goals = home_goals + away_goals
-                if total_goals > 2.5:
-                    over_2_5 += score_matrix[home_goals, away_goals]
-                else:
-                    under_2_5 += score_matrix[home_goals, away_goals]
-        
-        # Over/Under 1.5 gols
-        over_1_5 = 0
-        under_1_5 = 0
-        for home_goals in range(max_goals + 1):
-            for away_goals in range(max_goals + 1):
-                total_goals = home_goals + away_goals
-                if total_goals > 1.5:
-                    over_1_5 += score_matrix[home_goals, away_goals]
-                else:
-                    under_1_5 += score_matrix[home_goals, away_goals]
-        
-        # Over/Under 3.5 gols
-        over_3_5 = 0
-        under_3_5 = 0
-        for home_goals in range(max_goals + 1):
-            for away_goals in range(max_goals + 1):
-                total_goals = home_goals + away_goals
-                if total_goals > 3.5:
-                    over_3_5 += score_matrix[home_goals, away_goals]
-                else:
-                    under_3_5 += score_matrix[home_goals, away_goals]
-        
+        result = ladder.result()
+
+        # Over/Under 1.5, 2.5 e 3.5 gols
+        goals = {}
+        for line in (1.5, 2.5, 3.5):
+            settlement = ladder.total_goals(line)
+            suffix = str(line).replace(".", "_")
+            goals[f"over_{suffix}"] = settlement["over"]["win"]
+            goals[f"under_{suffix}"] = settlement["under"]["win"]
+
         # Ambos marcam (BTTS)
-        btts_yes = 0
-        btts_no = 0
-        for home_goals in range(max_goals + 1):
-            for away_goals in range(max_goals + 1):
-                if home_goals > 0 and away_goals > 0:
-                    btts_yes += score_matrix[home_goals, away_goals]
-                else:
-                    btts_no += score_matrix[home_goals, away_goals]
-        
+        btts_no = float(btts_no_probability(scores))
+        btts_yes = float(scores[1:, 1:].sum())
+
         # Placar mais provável
-        most_likely_score = np.unravel_index(
-            score_matrix.argmax(), score_matrix.shape
-        )
-        
+        home_goals, away_goals, score_prob = most_likely_score(scores)
+
         return {
-            "result": {
-                "home_win": float(home_win),
-                "draw": float(draw),
-                "away_win": float(away_win)
-            },
+            "result": result,
             "goals": {
-                "over_1_5": float(over_1_5),
-                "under_1_5": float(under_1_5),
-                "over_2_5": float(over_2_5),
-                "under_2_5": float(under_2_5),
-                "over_3_5": float(over_3_5),
-                "under_3_5": float(under_3_5),
-                "btts_yes": float(btts_yes),
-                "btts_no": float(btts_no)
+                **goals,
+                "btts_yes": btts_yes,
+                "btts_no": btts_no
             },
             "most_likely_score": {
-                "home": int(most_likely_score[0]),
-                "away": int(most_likely_score[1]),
-                "probability": float(score_matrix[most_likely_score])
+                "home": home_goals,
+                "away": away_goals,
+                "probability": score_prob
             },
             "expected_goals": {
                 "home": float(home_goals_exp),
@@ -0,0 +1,80 @@
+"""
+Testes do PoissonModel da edição raiz contra o cálculo original (scipy, placar a placar)
+
+Uso:
+    python test_poisson.py
+    python -m pytest -q test_poisson.py
+"""
+import os
+import sys
+
+import numpy as np
+from scipy.stats import poisson
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.poisson import PoissonModel
+
+
+# Lambdas na grade de quantização do núcleo (0.01), incluindo times que não marcam
+CASES = [(0.0, 2.0), (1.35, 0.0), (0.0, 0.0), (1.5, 1.1)]
+
+
+def _baseline(home_goals_exp: float, away_goals_exp: float, max_goals: int = 10) -> dict:
+    """Mercados como eram calculados antes do poisson_core (scipy.stats.poisson)"""
+    goals = np.arange(max_goals + 1)
+    scores = np.outer(poisson.pmf(goals, home_goals_exp), poisson.pmf(goals, away_goals_exp))
+    totals = np.add.outer(goals, goals)
+
+    markets = {
+        "home_win": np.tril(scores, -1).sum(),
+        "draw": np.trace(scores),
+        "away_win": np.triu(scores, 1).sum(),
+        "btts_yes": scores[1:, 1:].sum(),
+        "btts_no": scores.sum() - scores[1:, 1:].sum(),
+    }
+    for line in (1.5, 2.5, 3.5):
+        suffix = str(line).replace(".", "_")
+        markets[f"over_{suffix}"] = scores[totals > line].sum()
+        markets[f"under_{suffix}"] = scores[totals < line].sum()
+
+    home, away = np.unravel_index(scores.argmax(), scores.shape)
+    markets["most_likely"] = (int(home), int(away))
+
+    return markets
+
+
+def test_matches_baseline():
+    """Mesmos mercados do cálculo original, inclusive com λ = 0 (massa pontual em zero gols)"""
+    model = PoissonModel()
+
+    for home_exp, away_exp in CASES:
+        expected = _baseline(home_exp, away_exp)
+        result = model.calculate_match_probabilities(home_exp, away_exp)
+        markets = {**result["result"], **result["goals"]}
+
+        for market, value in expected.items():
+            if market == "most_likely":
+                score = result["most_likely_score"]
+                assert (score["home"], score["away"]) == value, (home_exp, away_exp, market)
+            else:
+                assert abs(markets[market] - value) < 1e-9, (home_exp, away_exp, market)
+
+
+def test_zero_lambda_never_scores():
+    """Time com λ = 0 não vence nem participa de ambos marcam"""
+    result = PoissonModel().calculate_match_probabilities(0.0, 2.0)
+
+    assert result["result"]["home_win"] == 0.0
+    assert result["goals"]["btts_yes"] == 0.0
+
+
+def main():
+    """Roda os testes sem pytest"""
+    for test in (test_matches_baseline, test_zero_lambda_never_scores):
+        test()
+        print(f"✅ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()